@@ -1,23 +1,62 @@
 # backend/app/api/routes/coming_soon.py
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Optional, Literal, Tuple
+import asyncio
+import hashlib
+import json
 import logging
+import time
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel, EmailStr, Field
+from fastapi import APIRouter, HTTPException, Header, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
-from app.db.supabase_client import supabase
+from app.db.insert_batcher import InsertBatcher
+from app.db.redis_client import redis
+from app.db.supabase_client import supabase, run_query
 from app.services.email_service import EmailService
+from app.services.feedback_queue import queue_team_notification
+from app.utils.ttl_cache import TTLCache
 
-router = APIRouter()
+# orjson renders straight to bytes, noticeably cheaper than stdlib json for feedback lists
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# Launch date rarely changes, so keep it in-process and refetch at most once per TTL.
+# Cached as (fetched_at, launch_date, launch_epoch) so the countdown is integer math.
+_LAUNCH_TTL = 300  # seconds
+_LAUNCH_CACHE: Optional[Tuple[float, datetime, int]] = None
+_launch_cache_lock = asyncio.Lock()
+
+# Retried POST /feedback calls with the same Idempotency-Key replay the first response instead of inserting again
+_IDEMPOTENCY_TTL = 86400  # seconds
+_idempotency_fallback = TTLCache(ttl=_IDEMPOTENCY_TTL, maxsize=2048)
+
+# Bursts of submissions share one INSERT round-trip instead of one each
+_feedback_inserts = InsertBatcher("feedback", window=0.02, max_batch=100)
+
+# List view only needs these; the full message is served by /feedback/{feedback_id}
+_FEEDBACK_LIST_COLUMNS = "id, feedback_type, subject, status, priority, created_at"
+
+_BANNER = "=" * 80
+
+# Emails known to be on the waitlist; lets repeat signups skip Supabase entirely
+_WAITLIST_SET_KEY = "waitlist:emails"
+
+# Clients compute the countdown from launch_date, so a minute of staleness is fine
+_LAUNCH_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=30"
+
 
 # Pydantic Models
 class WaitlistRequest(BaseModel):
     email: EmailStr
     user_id: Optional[str] = None
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def _lowercase_email(cls, v: str) -> str:
+        return v.lower()
+
 
 class FeedbackRequest(BaseModel):
     email: Optional[EmailStr] = None
@@ -27,6 +66,16 @@ class FeedbackRequest(BaseModel):
     message: str = Field(..., min_length=10, max_length=2000)
     user_id: Optional[str] = None
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def _lowercase_email(cls, v: Optional[str]) -> Optional[str]:
+        return v.lower() if v else v
+
+    @field_validator("subject", "message", mode="before")
+    @classmethod
+    def _strip_text(cls, v):
+        return v.strip() if isinstance(v, str) else v
+
 
 class LaunchConfigResponse(BaseModel):
     launch_date: datetime
@@ -36,33 +85,76 @@ class LaunchConfigResponse(BaseModel):
     seconds_remaining: int
 
 
-@router.get("/launch-config", response_model=LaunchConfigResponse)
-async def get_launch_config():
-    """Get the launch date and countdown information"""
-    logger.info("📊 GET /launch-config - Fetching launch configuration")
+async def _get_cached_launch() -> Tuple[datetime, int]:
+    """Return (launch_date, launch_epoch), hitting Supabase only when the cache has expired"""
+    global _LAUNCH_CACHE
 
-    try:
-        result = supabase.table("launch_config").select("*").limit(1).execute()
+    cached = _LAUNCH_CACHE
+    if cached and time.monotonic() - cached[0] < _LAUNCH_TTL:
+        return cached[1], cached[2]
+
+    # Single refill per expiry: concurrent requests wait for the first fetch
+    async with _launch_cache_lock:
+        cached = _LAUNCH_CACHE
+        if cached and time.monotonic() - cached[0] < _LAUNCH_TTL:
+            return cached[1], cached[2]
+
+        result = await run_query(
+            supabase.table("launch_config").select("*").limit(1)
+        )
 
         if not result.data:
-            logger.error("❌ Launch config not found in database!")
+            logger.error("Launch config not found in database")
             raise HTTPException(status_code=404, detail="Launch config not found")
 
-        launch_date = datetime.fromisoformat(result.data[0]["launch_date"].replace('Z', '+00:00'))
-        now = datetime.now(launch_date.tzinfo)
+        # C-implemented on 3.11+ (required by numpy 2.3) and accepts a trailing "Z" directly
+        launch_date = datetime.fromisoformat(result.data[0]["launch_date"])
+        launch_epoch = int(launch_date.timestamp())
+        _LAUNCH_CACHE = (time.monotonic(), launch_date, launch_epoch)
+        return launch_date, launch_epoch
+
 
-        time_diff = launch_date - now
-        total_seconds = int(time_diff.total_seconds())
+async def prime_launch_cache() -> None:
+    """Load the launch date at startup so the first request skips the Supabase fetch"""
+    try:
+        await _get_cached_launch()
+    except Exception as e:
+        logger.warning("Could not preload launch config: %s", e)
 
-        if total_seconds < 0:
-            total_seconds = 0
 
-        days = total_seconds // (24 * 3600)
-        hours = (total_seconds % (24 * 3600)) // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
+def _launch_etag(launch_date: datetime) -> str:
+    return '"' + hashlib.md5(launch_date.isoformat().encode()).hexdigest() + '"'
 
-        logger.info(f"✅ Launch config fetched: {days}d {hours}h {minutes}m {seconds}s remaining")
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/launch-config", response_model=LaunchConfigResponse)
+async def get_launch_config(response: Response, if_none_match: Optional[str] = Header(None)):
+    """Get the launch date and countdown information"""
+    logger.debug("GET /launch-config")
+
+    try:
+        launch_date, launch_epoch = await _get_cached_launch()
+
+        # ETag only tracks launch_date; browsers/CDNs revalidate instead of refetching
+        etag = _launch_etag(launch_date)
+        cache_headers = {"ETag": etag, "Cache-Control": _LAUNCH_CACHE_CONTROL}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers)
+        response.headers.update(cache_headers)
+
+        total_seconds = max(0, launch_epoch - int(time.time()))
+
+        days, remainder = divmod(total_seconds, 24 * 3600)
+        hours, remainder = divmod(remainder, 3600)
+        minutes, seconds = divmod(remainder, 60)
+
+        logger.debug("Launch config: %sd %sh %sm %ss remaining", days, hours, minutes, seconds)
 
         return LaunchConfigResponse(
             launch_date=launch_date,
@@ -72,36 +164,71 @@ async def get_launch_config():
             seconds_remaining=seconds
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"❌ Error fetching launch config: {str(e)}")
+        logger.error("Error fetching launch config: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching launch config: {str(e)}")
 
 
+async def _is_known_waitlist_email(email: str) -> bool:
+    if redis is None:
+        return False
+    try:
+        return bool(await redis.sismember(_WAITLIST_SET_KEY, email))
+    except Exception as e:
+        logger.warning("Waitlist cache lookup failed: %s", e)
+        return False
+
+
+async def _remember_waitlist_email(email: str) -> None:
+    if redis is None:
+        return
+    try:
+        await redis.sadd(_WAITLIST_SET_KEY, email)
+    except Exception as e:
+        logger.warning("Waitlist cache update failed: %s", e)
+
+
 @router.post("/waitlist")
-async def join_waitlist(request: WaitlistRequest, background_tasks: BackgroundTasks):
+async def join_waitlist(request: WaitlistRequest):
     """Add email to waitlist for launch notifications"""
-    logger.info(f"📝 POST /waitlist - New signup: {request.email}")
+    logger.debug("POST /waitlist - signup: %s", request.email)
 
-    try:
-        # Check if email already exists
-        existing = supabase.table("waitlist").select("email").eq("email", request.email).execute()
+    already_subscribed = {"message": "You're already on the waitlist!", "already_subscribed": True}
 
-        if existing.data:
-            logger.info(f"ℹ️ Email already on waitlist: {request.email}")
-            return {"message": "You're already on the waitlist!", "already_subscribed": True}
+    try:
+        if await _is_known_waitlist_email(request.email):
+            logger.info("Email already on waitlist (cached): %s", request.email)
+            return already_subscribed
 
-        # Insert new waitlist entry
         data = {
             "email": request.email,
             "user_id": request.user_id if request.user_id else None
         }
 
-        result = supabase.table("waitlist").insert(data).execute()
-        logger.info(f"✅ Email added to database: {request.email}")
+        # Single round-trip: existing emails are ignored by ON CONFLICT and return no rows
+        result = await run_query(
+            supabase.table("waitlist").upsert(
+                data,
+                on_conflict="email",
+                ignore_duplicates=True,
+                returning="representation"
+            )
+        )
+
+        # Either way the email is now on the waitlist
+        await _remember_waitlist_email(request.email)
+
+        if not result.data:
+            logger.info("Email already on waitlist: %s", request.email)
+            return already_subscribed
+
+        logger.info("Email added to waitlist: %s", request.email)
 
         # Send confirmation email in background
-        logger.info(f"📧 Queueing confirmation email to: {request.email}")
-        background_tasks.add_task(
+        logger.debug("Queueing confirmation email to: %s", request.email)
+        EmailService.enqueue(
             EmailService.send_waitlist_confirmation,
             request.email
         )
@@ -109,28 +236,69 @@ async def join_waitlist(request: WaitlistRequest, background_tasks: BackgroundTa
         return {"message": "Successfully joined the waitlist!", "already_subscribed": False}
 
     except Exception as e:
-        logger.error(f"❌ Error joining waitlist: {str(e)}")
+        logger.error("Error joining waitlist: %s", e)
         raise HTTPException(status_code=500, detail=f"Error joining waitlist: {str(e)}")
 
 
+def _feedback_idempotency_key(request: FeedbackRequest, header_key: Optional[str]) -> Optional[str]:
+    """Cache key for the client's Idempotency-Key, scoped to the sender; None without the header.
+
+    Identical feedback sent twice on purpose is two submissions, so content alone never dedupes.
+    """
+    if not header_key:
+        return None
+    sender = request.email or request.user_id or "anonymous"
+    return f"idem:feedback:{sender}:{header_key}"
+
+
+async def _get_idempotent_response(key: str) -> Optional[dict]:
+    if redis is not None:
+        try:
+            cached = await redis.get(key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            logger.warning("Idempotency lookup failed, using local cache: %s", e)
+    return _idempotency_fallback.get(key)
+
+
+async def _store_idempotent_response(key: str, response: dict) -> None:
+    if redis is not None:
+        try:
+            await redis.setex(key, _IDEMPOTENCY_TTL, json.dumps(response))
+            return
+        except Exception as e:
+            logger.warning("Idempotency store failed, using local cache: %s", e)
+    _idempotency_fallback.set(key, response)
+
+
 @router.post("/feedback")
-async def submit_feedback(request: FeedbackRequest, background_tasks: BackgroundTasks):
+async def submit_feedback(
+    request: FeedbackRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """Submit feedback, suggestions, or bug reports"""
-    logger.info("=" * 80)
-    logger.info(f"💬 POST /feedback - New feedback submission")
-    logger.info(f"Type: {request.feedback_type}")
-    logger.info(f"From: {request.name or 'Anonymous'} ({request.email or 'No email'})")
-    logger.info(f"Subject: {request.subject}")
-    logger.info("=" * 80)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(_BANNER)
+        logger.debug("POST /feedback - New feedback submission")
+        logger.debug("Type: %s", request.feedback_type)
+        logger.debug("From: %s (%s)", request.name or "Anonymous", request.email or "No email")
+        logger.debug("Subject: %s", request.subject)
+        logger.debug(_BANNER)
 
     try:
+        idem_key = _feedback_idempotency_key(request, idempotency_key)
+        cached_response = await _get_idempotent_response(idem_key) if idem_key else None
+        if cached_response is not None:
+            logger.info("Duplicate feedback submission, returning original response")
+            return cached_response
+
         # Validate and sanitize input
         data = {
             "email": request.email,
             "name": request.name,
             "feedback_type": request.feedback_type,
-            "subject": request.subject.strip(),
-            "message": request.message.strip(),
+            "subject": request.subject,
+            "message": request.message,
             "user_id": request.user_id if request.user_id else None,
             "status": "open",
             "priority": "medium"
@@ -139,65 +307,115 @@ async def submit_feedback(request: FeedbackRequest, background_tasks: Background
         # Auto-prioritize bugs as high priority
         if request.feedback_type == "bug":
             data["priority"] = "high"
-            logger.info("🐛 Bug report - Set priority to HIGH")
+            logger.debug("Bug report - priority set to high")
 
-        result = supabase.table("feedback").insert(data).execute()
-        logger.info(f"✅ Feedback saved to database with ID: {result.data[0]['id']}")
+        saved = await _feedback_inserts.insert(data)
+        logger.info("Feedback saved with ID: %s", saved["id"])
 
         # Send confirmation to user (if email provided)
         if request.email:
-            logger.info(f"📧 Queueing user confirmation email to: {request.email}")
-            background_tasks.add_task(
+            logger.debug("Queueing user confirmation email to: %s", request.email)
+            EmailService.enqueue(
                 EmailService.send_feedback_confirmation,
                 request.email,
                 request.feedback_type,
                 request.subject
             )
         else:
-            logger.info("ℹ️ No email provided - skipping user confirmation")
-
-        # IMPORTANT: Always notify team about feedback
-        logger.info(f"📧 Queueing admin notification to: modelmind.team@gmail.com")
-        background_tasks.add_task(
-            EmailService.send_feedback_notification_to_team,
-            request.feedback_type,
-            request.subject,
-            request.message,
-            request.name,
-            request.email
+            logger.debug("No email provided - skipping user confirmation")
+
+        # IMPORTANT: Always notify team about feedback (batched into a digest when Redis is set up)
+        logger.debug("Queueing admin notification")
+        await queue_team_notification(
+            {
+                "feedback_type": request.feedback_type,
+                "subject": request.subject,
+                "message": request.message,
+                "name": request.name,
+                "email": request.email
+            }
         )
 
-        return {
+        response = {
             "message": "Feedback submitted successfully!",
-            "feedback_id": result.data[0]["id"]
+            "feedback_id": saved["id"]
         }
+        if idem_key:
+            await _store_idempotent_response(idem_key, response)
+
+        return response
 
     except Exception as e:
-        logger.error(f"❌ Error submitting feedback: {str(e)}")
+        logger.error("Error submitting feedback: %s", e)
         raise HTTPException(status_code=500, detail=f"Error submitting feedback: {str(e)}")
 
 
 @router.get("/feedback")
-async def get_feedback(user_id: Optional[str] = None, email: Optional[str] = None):
-    """Get feedback submissions (filtered by user_id or email)"""
-    logger.info(f"📊 GET /feedback - Fetching feedback (user_id={user_id}, email={email})")
+async def get_feedback(
+    user_id: Optional[str] = None,
+    email: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    before: Optional[datetime] = Query(None, description="Cursor: only return entries created before this timestamp")
+):
+    """Get feedback submissions (filtered by user_id or email), newest first, one page at a time"""
+    logger.debug("GET /feedback (user_id=%s, email=%s, limit=%s, offset=%s)", user_id, email, limit, offset)
 
     try:
-        query = supabase.table("feedback").select("*")
+        query = supabase.table("feedback").select(_FEEDBACK_LIST_COLUMNS)
 
         if user_id:
             query = query.eq("user_id", user_id)
         elif email:
-            query = query.eq("email", email)
+            query = query.eq("email", email.lower())
         else:
-            logger.error("❌ No filter provided (user_id or email required)")
+            logger.warning("No filter provided (user_id or email required)")
             raise HTTPException(status_code=400, detail="user_id or email required")
 
-        result = query.order("created_at", desc=True).execute()
-        logger.info(f"✅ Found {len(result.data)} feedback entries")
+        # Cursor pagination stays cheap on deep pages; offset is kept for simple clients
+        if before:
+            query = query.lt("created_at", before.isoformat())
+
+        result = await run_query(
+            query.order("created_at", desc=True).range(offset, offset + limit - 1)
+        )
+        logger.debug("Found %s feedback entries", len(result.data))
+
+        next_before = result.data[-1]["created_at"] if len(result.data) == limit else None
+        return {"feedback": result.data, "limit": limit, "offset": offset, "next_before": next_before}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error fetching feedback: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error fetching feedback: {str(e)}")
+
+
+@router.get("/feedback/{feedback_id}")
+async def get_feedback_detail(feedback_id: str, user_id: Optional[str] = None, email: Optional[str] = None):
+    """Get a single feedback submission including its message (scoped to its owner)"""
+    logger.debug("GET /feedback/%s", feedback_id)
+
+    try:
+        query = supabase.table("feedback").select("*").eq("id", feedback_id)
+
+        if user_id:
+            query = query.eq("user_id", user_id)
+        elif email:
+            query = query.eq("email", email.lower())
+        else:
+            logger.warning("No filter provided (user_id or email required)")
+            raise HTTPException(status_code=400, detail="user_id or email required")
+
+        result = await run_query(query.limit(1))
+
+        if not result.data:
+            raise HTTPException(status_code=404, detail="Feedback not found")
 
-        return {"feedback": result.data}
+        return {"feedback": result.data[0]}
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"❌ Error fetching feedback: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching feedback: {str(e)}")
\ No newline at end of file
+        logger.error("Error fetching feedback detail: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error fetching feedback: {str(e)}")
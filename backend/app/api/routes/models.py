@@ -1,23 +1,37 @@
 # app/api/routes/models.py
 from fastapi import APIRouter, HTTPException, Query, Response
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
-from datetime import datetime
-import joblib
-import os
-import tempfile
+from datetime import datetime, timezone
+import asyncio
+import base64
+from collections import Counter
+import csv
 import json
+import orjson
 import pandas as pd
 import io
-from app.db.supabase_client import supabase
+import logging
+from app.db.supabase_client import supabase, run_query, download_prefix, open_object_stream, is_missing_column
+from app.services.model_cache import analytics_cache, summary_cache, invalidate_user_models
+from app.services.analytics_service import (
+    analytics_sidecar_path,
+    build_classification_analytics,
+    build_regression_analytics,
+)
+from app.services.predict_service import model_store
 import numpy as np
-from scipy import stats
-from sklearn.metrics import precision_recall_fscore_support
 import traceback
-from sklearn.metrics import confusion_matrix, classification_report
+from urllib.parse import quote
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# orjson handles numpy scalars/arrays natively and is much faster on number-heavy analytics payloads
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Bytes fetched from the start of a dataset CSV for the preview; plenty for a few dozen rows
+PREVIEW_PREFIX_BYTES = 64 * 1024
 
 
 class ModelUpdateRequest(BaseModel):
@@ -34,23 +48,83 @@ class ModelSummary(BaseModel):
     regression_count: int
     classification_count: int
 
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (np.bool_, np.bool8)):
-            return bool(obj)
-        elif isinstance(obj, (np.integer, np.int8, np.int16, np.int32, np.int64,
-                            np.uint8, np.uint16, np.uint32, np.uint64)):
-            return int(obj)
-        elif isinstance(obj, (np.floating, np.float16, np.float32, np.float64)):
-            return float(obj)
-        elif isinstance(obj, (np.ndarray,)):
-            return obj.tolist()
-        elif hasattr(obj, '__dict__'):
-            try:
-                return vars(obj)
-            except TypeError:
-                return str(obj)
-        return super().default(obj)
+
+def _load_predictions_json(predictions_bytes: bytes) -> Dict[str, Any]:
+    """Parse a stored predictions file; older files may contain NaN, which only stdlib json accepts"""
+    try:
+        return orjson.loads(predictions_bytes)
+    except orjson.JSONDecodeError:
+        return json.loads(predictions_bytes)
+
+
+async def _fetch_analytics_model(model_id: str, user_id: str):
+    """Model row for the analytics endpoints. prediction_samples comes from migration
+    20261014000009; on databases without it the row is read without that column."""
+    def query(columns: str):
+        return supabase.table("models").select(columns).eq("id", model_id).eq("user_id", user_id).single()
+
+    columns = "problem_type, metrics, predictions_url, target_column"
+    try:
+        return await run_query(query(f"{columns}, prediction_samples"))
+    except Exception as e:
+        if not is_missing_column(e):
+            raise
+    return await run_query(query(columns))
+
+
+def _encode_models_cursor(created_at: str, model_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}:{model_id}".encode()).decode()
+
+
+def _decode_models_cursor(cursor: str) -> tuple:
+    try:
+        created_at, model_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit(":", 1)
+        return created_at, model_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _load_regression_sidecar(file_path: str) -> Optional[np.ndarray]:
+    """The (3, n) float32 actual/predicted/residuals array stored next to a predictions JSON, if any."""
+    if not file_path.endswith(".json"):
+        return None
+    try:
+        return np.load(io.BytesIO(supabase.storage.from_("models").download(file_path[:-len(".json")] + ".npy")))
+    except Exception:
+        return None
+
+
+def _load_regression_arrays(file_path: str) -> np.ndarray:
+    """Return the (3, n) float32 actual / predicted / residuals block for a predictions file.
+
+    Newer models store it as a .npy next to the JSON, which loads far faster than
+    parsing the JSON; older models fall back to the JSON file.
+    """
+    arrays = _load_regression_sidecar(file_path)
+    if arrays is not None:
+        return arrays
+
+    predictions_data = _load_predictions_json(supabase.storage.from_("models").download(file_path))
+    # float32 matches the sidecar and halves memory for large files
+    arrays = np.empty((3, len(predictions_data["actual"])), dtype=np.float32)
+    arrays[0] = predictions_data["actual"]
+    arrays[1] = predictions_data["predicted"]
+    stored_residuals = predictions_data.get("residuals")
+    if stored_residuals is not None:
+        arrays[2] = stored_residuals
+    else:
+        np.subtract(arrays[0], arrays[1], out=arrays[2])
+    return arrays
+
+
+def _load_analytics_sidecar(file_path: str) -> Optional[Dict[str, Any]]:
+    """Analytics payload stored by training next to the predictions file, or None if there isn't one."""
+    if not file_path.endswith(".json"):
+        return None
+    try:
+        return orjson.loads(supabase.storage.from_("models").download(analytics_sidecar_path(file_path)))
+    except Exception:
+        return None
 
 
 @router.get("/models")
@@ -69,12 +143,23 @@ async def list_models(
         sort_order: str = "desc",
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor; replaces page when sorting by created_at"),
 ):
-    """List all models for a user with filtering, searching, and pagination."""
+    """List all models for a user with filtering, searching, and pagination.
+
+    Prefer `cursor` (keyset on created_at, id) over `page` for deep pages; `page` is kept for compatibility.
+    """
     try:
-        query = supabase.table("models").select("*, datasets(name)", count="exact").eq("user_id", user_id)
+        if cursor and sort_by != "created_at":
+            raise HTTPException(status_code=400, detail="cursor pagination requires sort_by=created_at")
+
+        # Cursor clients page with next_cursor and don't need the exact total, which costs a full count
+        query = supabase.table("models").select(
+            "*, datasets(name)", count=None if cursor else "exact"
+        ).eq("user_id", user_id)
 
         if search:
+            # Substring match served by the pg_trgm indexes on model_name / description
             query = query.or_(f"model_name.ilike.%{search}%,description.ilike.%{search}%")
 
         if dataset_id:
@@ -104,36 +189,57 @@ async def list_models(
         desc = sort_order == "desc"
         if sort_by.startswith("metrics."):
             metric_key = sort_by.split(".")[1]
+            # jsonb ordering matches the models_user_metric_*_idx expression indexes
             query = query.order(f"metrics->{metric_key}", desc=desc)
         else:
             query = query.order(sort_by, desc=desc)
+            if sort_by == "created_at":
+                # Tie-breaker so the keyset is unique
+                query = query.order("id", desc=desc)
+
+        if cursor:
+            cursor_ts, cursor_id = _decode_models_cursor(cursor)
+            op = "lt" if desc else "gt"
+            query = query.or_(
+                f'created_at.{op}."{cursor_ts}",and(created_at.eq."{cursor_ts}",id.{op}.{cursor_id})'
+            ).limit(page_size)
+        else:
+            start = (page - 1) * page_size
+            end = start + page_size - 1
+            query = query.range(start, end)
 
-        start = (page - 1) * page_size
-        end = start + page_size - 1
-        query = query.range(start, end)
-
-        result = query.execute()
+        # The summary is per-user, not per-page: only the first page carries it
+        if cursor or page > 1:
+            result, summary = await run_query(query), None
+        else:
+            result, summary = await asyncio.gather(run_query(query), calculate_model_summary(user_id))
         models = result.data
-        total = result.count or 0
+        total = None if cursor else (result.count or 0)
 
         for model in models:
             if model.get("datasets"):
                 model["dataset_name"] = model["datasets"].get("name", "Unknown")
                 del model["datasets"]
 
-        summary = await calculate_model_summary(user_id)
+        next_cursor = None
+        if sort_by == "created_at" and len(models) == page_size:
+            next_cursor = _encode_models_cursor(models[-1]["created_at"], models[-1]["id"])
 
-        return {
+        # Rows are already JSON-native; returning the response directly skips jsonable_encoder
+        return ORJSONResponse({
             "status": "success",
             "data": {
                 "models": models,
                 "total": total,
                 "page": page,
                 "page_size": page_size,
+                "next_cursor": next_cursor,
                 "summary": summary,
             }
-        }
+        })
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch models: {str(e)}")
 
@@ -143,7 +249,7 @@ async def get_model_summary(user_id: str = Query(...)):
     """Get summary statistics for user's models."""
     try:
         summary = await calculate_model_summary(user_id)
-        return {"status": "success", "data": summary}
+        return ORJSONResponse({"status": "success", "data": summary})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get summary: {str(e)}")
 
@@ -152,46 +258,41 @@ async def get_model_summary(user_id: str = Query(...)):
 async def get_model_details(model_id: str, user_id: str = Query(...)):
     """Get detailed information about a specific model."""
     try:
-        result = supabase.table("models").select(
-            "*, datasets(name, rows, columns)"
-        ).eq("id", model_id).eq("user_id", user_id).single().execute()
+        # Dataset details ride along as an embedded select; the prediction count runs in parallel
+        result, pred_result = await asyncio.gather(
+            run_query(
+                supabase.table("models").select(
+                    "*, datasets(name, rows, columns, file_size, file_url, uploaded_at, has_missing, metadata)"
+                ).eq("id", model_id).eq("user_id", user_id).single()
+            ),
+            # Count only: limit(0) skips the row payload (postgrest-py here has no head=True)
+            run_query(supabase.table("predictions").select("id", count="exact").eq("model_id", model_id).limit(0))
+        )
 
         if not result.data:
             raise HTTPException(status_code=404, detail="Model not found")
 
         model = result.data
-        dataset_id = model.get("dataset_id")
 
         dataset_info = {}
-        if dataset_id:
-            try:
-                dataset_result = supabase.table("datasets").select(
-                    "name, rows, columns, file_size, file_url, uploaded_at, has_missing, metadata"
-                ).eq("id", dataset_id).single().execute()
-
-                if dataset_result.data:
-                    dataset_data = dataset_result.data
-                    dataset_info = {
-                        "name": dataset_data.get("name", "Unknown"),
-                        "rows": dataset_data.get("rows", 0),
-                        "columns": dataset_data.get("columns", 0),
-                        "file_size": dataset_data.get("file_size", 0),
-                        "file_url": dataset_data.get("file_url", ""),
-                        "uploaded_at": dataset_data.get("uploaded_at", ""),
-                        "has_missing": dataset_data.get("has_missing", False),
-                        "metadata": dataset_data.get("metadata", {})
-                    }
-            except Exception as dataset_error:
-                print(f"Error fetching dataset: {dataset_error}")
+        dataset_data = model.get("datasets")
+        if dataset_data:
+            dataset_info = {
+                "name": dataset_data.get("name", "Unknown"),
+                "rows": dataset_data.get("rows", 0),
+                "columns": dataset_data.get("columns", 0),
+                "file_size": dataset_data.get("file_size", 0),
+                "file_url": dataset_data.get("file_url", ""),
+                "uploaded_at": dataset_data.get("uploaded_at", ""),
+                "has_missing": dataset_data.get("has_missing", False),
+                "metadata": dataset_data.get("metadata", {})
+            }
+            model["datasets"] = {key: dataset_data.get(key) for key in ("name", "rows", "columns")}
 
         model["dataset_info"] = dataset_info
-
-        pred_result = supabase.table("predictions").select(
-            "id", count="exact"
-        ).eq("model_id", model_id).execute()
         model["prediction_count"] = pred_result.count or 0
 
-        return {"status": "success", "data": model}
+        return ORJSONResponse({"status": "success", "data": model})
 
     except HTTPException:
         raise
@@ -231,11 +332,12 @@ async def update_model(
         if not update_data:
             raise HTTPException(status_code=400, detail="No updates provided")
 
-        update_data["updated_at"] = datetime.utcnow().isoformat()
+        update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
         result = supabase.table("models").update(update_data).eq(
             "id", model_id
         ).execute()
+        invalidate_user_models(user_id)
 
         return {"status": "success", "data": result.data[0]}
 
@@ -249,31 +351,49 @@ async def update_model(
 async def delete_model(model_id: str, user_id: str = Query(...)):
     """Delete a model and its associated files."""
     try:
-        result = supabase.table("models").select("*").eq(
-            "id", model_id
-        ).eq("user_id", user_id).single().execute()
+        result = await run_query(
+            supabase.table("models").select("id, model_url, predictions_url").eq(
+                "id", model_id
+            ).eq("user_id", user_id).single()
+        )
 
         if not result.data:
             raise HTTPException(status_code=404, detail="Model not found")
 
         model = result.data
 
-        if model.get("model_url"):
+        # Every file goes out in one storage request
+        paths = []
+        for url_key in ("model_url", "predictions_url"):
+            if model.get(url_key):
+                path = model[url_key].split("/models/")[-1]
+                paths.append(path)
+                if path.endswith(".json"):
+                    # Float32 arrays and precomputed analytics written next to the predictions JSON
+                    paths.append(path[:-len(".json")] + ".npy")
+                    paths.append(analytics_sidecar_path(path))
+
+        async def remove_files() -> None:
+            if not paths:
+                return
             try:
-                file_path = model["model_url"].split("/models/")[-1]
-                supabase.storage.from_("models").remove([file_path])
+                await asyncio.to_thread(supabase.storage.from_("models").remove, paths)
             except Exception as e:
-                print(f"Warning: Failed to delete model file: {e}")
+                logger.warning("Failed to delete model files: %s", e)
 
-        if model.get("predictions_url"):
+        async def delete_rows() -> None:
+            # delete_model_rows() drops the predictions and the model in one transaction
             try:
-                pred_path = model["predictions_url"].split("/models/")[-1]
-                supabase.storage.from_("models").remove([pred_path])
+                await run_query(supabase.rpc("delete_model_rows", {"mid": model_id, "uid": user_id}))
+                return
             except Exception as e:
-                print(f"Warning: Failed to delete predictions file: {e}")
+                logger.warning("delete_model_rows RPC unavailable, deleting rows separately: %s", e)
+            await run_query(supabase.table("predictions").delete().eq("model_id", model_id))
+            await run_query(supabase.table("models").delete().eq("id", model_id))
 
-        supabase.table("predictions").delete().eq("model_id", model_id).execute()
-        supabase.table("models").delete().eq("id", model_id).execute()
+        await asyncio.gather(remove_files(), delete_rows())
+        invalidate_user_models(user_id)
+        model_store.remove_from_cache(model_id)
 
         return {"status": "success", "message": "Model deleted successfully"}
 
@@ -283,60 +403,6 @@ async def delete_model(model_id: str, user_id: str = Query(...)):
         raise HTTPException(status_code=500, detail=f"Failed to delete model: {str(e)}")
 
 
-@router.get("/models/{model_id}/export")
-# async def export_model(model_id: str, user_id: str = Query(...)):
-#     """Export model as JSON with all metadata."""
-#     try:
-#         result = supabase.table("models").select("*").eq(
-#             "id", model_id
-#         ).eq("user_id", user_id).single().execute()
-#
-#         if not result.data:
-#             raise HTTPException(status_code=404, detail="Model not found")
-#
-#         model_data = result.data
-#         model_name = model_data["model_name"]
-#
-#         # Create comprehensive JSON export
-#         export_data = {
-#             "model_info": {
-#                 "id": model_data["id"],
-#                 "name": model_data["model_name"],
-#                 "type": model_data["model_type"],
-#                 "problem_type": model_data["problem_type"],
-#                 "target_column": model_data["target_column"],
-#                 "feature_columns": model_data.get("feature_columns", []),
-#                 "created_at": model_data["created_at"],
-#                 "description": model_data.get("description", ""),
-#             },
-#             "performance": {
-#                 "metrics": model_data["metrics"],
-#                 "training_time": model_data["training_time"],
-#             },
-#             "configuration": {
-#                 "parameters": model_data.get("parameters", {}),
-#             },
-#             "metadata": {
-#                 "status": model_data.get("status", "completed"),
-#                 "dataset_id": model_data.get("dataset_id"),
-#             }
-#         }
-#
-#         # Save to temp file
-#         temp_path = os.path.join(tempfile.gettempdir(), f"{model_name}_export.json")
-#         with open(temp_path, "w") as f:
-#             json.dump(export_data, f, indent=2)
-#
-#         return FileResponse(
-#             temp_path,
-#             media_type="application/json",
-#             filename=f"{model_name}_export.json"
-#         )
-#
-#     except HTTPException:
-#         raise
-#     except Exception as e:
-#         raise HTTPException(status_code=500, detail=f"Failed to export model: {str(e)}")
 @router.get("/models/{model_id}/export")
 async def export_model(
         model_id: str,
@@ -350,9 +416,11 @@ async def export_model(
     - **json**: Metadata and metrics only (for documentation)
     """
     try:
-        result = supabase.table("models").select("*").eq(
-            "id", model_id
-        ).eq("user_id", user_id).single().execute()
+        result = await run_query(
+            supabase.table("models").select("*").eq(
+                "id", model_id
+            ).eq("user_id", user_id).single()
+        )
 
         if not result.data:
             raise HTTPException(status_code=404, detail="Model not found")
@@ -401,10 +469,10 @@ async def export_model(
                 }
             }
 
-            json_str = json.dumps(export_data, indent=2)
+            json_bytes = orjson.dumps(export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
 
-            return StreamingResponse(
-                io.BytesIO(json_str.encode()),
+            return Response(
+                content=json_bytes,
                 media_type="application/json",
                 headers={
                     "Content-Disposition": f"attachment; filename={model_name}_metadata.json"
@@ -433,8 +501,8 @@ async def export_model(
             print(f"Attempting to download from path: {file_path}")
 
             try:
-                # Download model from storage
-                model_bytes = supabase.storage.from_("models").download(file_path)
+                # Stream straight from storage so large bundles are never held in memory
+                model_chunks, content_length = await open_object_stream("models", file_path)
             except Exception as storage_error:
                 print(f"Storage error: {storage_error}")
                 raise HTTPException(
@@ -442,18 +510,22 @@ async def export_model(
                     detail=f"Model file not found in storage. Path attempted: {file_path}"
                 )
 
-            # Save to temp file
-            temp_path = os.path.join(tempfile.gettempdir(), f"{model_name}.pkl")
-            with open(temp_path, "wb") as f:
-                f.write(model_bytes)
-
-            return FileResponse(
-                temp_path,
+            filename = f"{model_name}.pkl"
+            quoted = quote(filename)
+            headers = {
+                # Same encoding FileResponse used, so non-ASCII model names still work
+                "Content-Disposition": (
+                    f"attachment; filename*=utf-8''{quoted}" if quoted != filename
+                    else f'attachment; filename="{filename}"'
+                ),
+                "Content-Description": "ML Model Bundle (Requires joblib to load)"
+            }
+            if content_length:
+                headers["Content-Length"] = content_length
+            return StreamingResponse(
+                model_chunks,
                 media_type="application/octet-stream",
-                filename=f"{model_name}.pkl",
-                headers={
-                    "Content-Description": "ML Model Bundle (Requires joblib to load)"
-                }
+                headers=headers
             )
 
         else:
@@ -470,45 +542,53 @@ async def export_model(
         raise HTTPException(status_code=500, detail=f"Failed to export model: {str(e)}")
 
 
+def _iter_predictions_csv(records: List[Dict[str, Any]], include_confidence: bool):
+    """Yield the predictions CSV one stored prediction batch at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    header = ["prediction_id", "predicted_at", "prediction"]
+    if include_confidence:
+        header.append("confidence")
+    writer.writerow(header)
+
+    for pred in records:
+        probs = pred.get("probabilities") or []
+        for i, p in enumerate(pred.get("predictions") or []):
+            row = [pred["id"], pred["predicted_at"], p]
+            if include_confidence:
+                if i < len(probs):
+                    row.append(max(probs[i]) if isinstance(probs[i], list) else probs[i])
+                else:
+                    row.append("")
+            writer.writerow(row)
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
 @router.get("/models/{model_id}/download-predictions")
 async def download_predictions(model_id: str, user_id: str = Query(...)):
     """Download prediction history as CSV"""
     try:
         # Fetch recent predictions
-        predictions = supabase.table("predictions").select(
-            "*"
-        ).eq("model_id", model_id).eq(
-            "user_id", user_id
-        ).order("predicted_at", desc=True).limit(1000).execute()
+        predictions = await run_query(
+            supabase.table("predictions").select(
+                "id, predicted_at, predictions, probabilities"
+            ).eq("model_id", model_id).eq(
+                "user_id", user_id
+            ).order("predicted_at", desc=True).limit(1000)
+        )
 
         if not predictions.data or len(predictions.data) == 0:
             raise HTTPException(status_code=404, detail="No predictions found")
 
-        # Create CSV
-        import pandas as pd
-
-        rows = []
-        for pred in predictions.data:
-            pred_data = pred.get("predictions", [])
-            probs = pred.get("probabilities", [])
-
-            for i, p in enumerate(pred_data):
-                row = {
-                    "prediction_id": pred["id"],
-                    "predicted_at": pred["predicted_at"],
-                    "prediction": p
-                }
-                if probs and i < len(probs):
-                    row["confidence"] = max(probs[i]) if isinstance(probs[i], list) else probs[i]
-                rows.append(row)
-
-        df = pd.DataFrame(rows)
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-        csv_buffer.seek(0)
+        # Same columns as before: confidence only appears when some prediction has probabilities
+        include_confidence = any(pred.get("probabilities") for pred in predictions.data)
 
         return StreamingResponse(
-            io.BytesIO(csv_buffer.getvalue().encode()),
+            _iter_predictions_csv(predictions.data, include_confidence),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=predictions_{model_id}.csv"
@@ -524,9 +604,11 @@ async def download_predictions(model_id: str, user_id: str = Query(...)):
 async def get_predictions_data(model_id: str, user_id: str = Query(...)):
     """Get actual vs predicted data for visualizations."""
     try:
-        result = supabase.table("models").select(
-            "predictions_url"
-        ).eq("id", model_id).eq("user_id", user_id).single().execute()
+        result = await run_query(
+            supabase.table("models").select(
+                "problem_type, predictions_url"
+            ).eq("id", model_id).eq("user_id", user_id).single()
+        )
 
         if not result.data:
             raise HTTPException(status_code=404, detail="Model not found")
@@ -536,17 +618,30 @@ async def get_predictions_data(model_id: str, user_id: str = Query(...)):
         if not predictions_url:
             return {"status": "success", "data": {"actual": [], "predicted": [], "residuals": []}}
 
-        # Download predictions file
         file_path = predictions_url.split("/models/")[-1]
-        predictions_bytes = supabase.storage.from_("models").download(file_path)
-        predictions_data = json.loads(predictions_bytes.decode())
 
-        return {"status": "success", "data": predictions_data}
+        # Regression models have a binary float32 copy: no JSON parse, and orjson writes the arrays directly.
+        # Classification models never get one, so they skip the probe
+        arrays = None
+        if result.data.get("problem_type") == "regression":
+            arrays = await asyncio.to_thread(_load_regression_sidecar, file_path)
+        if arrays is not None:
+            return ORJSONResponse({
+                "status": "success",
+                "data": {"actual": arrays[0], "predicted": arrays[1], "residuals": arrays[2]}
+            })
+
+        # Download predictions file
+        predictions_bytes = await asyncio.to_thread(supabase.storage.from_("models").download, file_path)
+        predictions_data = _load_predictions_json(predictions_bytes)
+
+        # Large float lists: let orjson encode them in C rather than walking them in jsonable_encoder
+        return ORJSONResponse({"status": "success", "data": predictions_data})
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error loading predictions: {e}")
+        logger.warning("Error loading predictions: %s", e)
         return {"status": "success", "data": {"actual": [], "predicted": [], "residuals": []}}
 
 
@@ -558,44 +653,56 @@ async def get_dataset_preview(
 ):
     """Get original dataset preview (before preprocessing)."""
     try:
-        # Get model to find dataset
-        model_result = supabase.table("models").select(
-            "dataset_id"
-        ).eq("id", model_id).eq("user_id", user_id).single().execute()
+        # Dataset file and its stored shape come back with the model lookup
+        model_result = await run_query(
+            supabase.table("models").select(
+                "dataset_id, datasets(file_url, name, rows, columns)"
+            ).eq("id", model_id).eq("user_id", user_id).single()
+        )
 
         if not model_result.data:
             raise HTTPException(status_code=404, detail="Model not found")
 
-        dataset_id = model_result.data.get("dataset_id")
-        if not dataset_id:
+        if not model_result.data.get("dataset_id"):
             raise HTTPException(status_code=404, detail="Dataset not found for this model")
 
-        # Get dataset file URL
-        dataset_result = supabase.table("datasets").select(
-            "file_url, name"
-        ).eq("id", dataset_id).execute()
-
-        if not dataset_result.data:
+        dataset = model_result.data.get("datasets")
+        if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
-        file_url = dataset_result.data[0]["file_url"]
-        file_path = file_url.split("/datasets/")[-1]
+        file_path = dataset["file_url"].split("/datasets/")[-1]
+        total_rows, total_columns = dataset.get("rows"), dataset.get("columns")
 
-        # Download and read original CSV
-        file_bytes = supabase.storage.from_("datasets").download(file_path)
-        df = pd.read_csv(io.BytesIO(file_bytes))
+        preview_df = None
+        if total_rows is not None and total_columns is not None:
+            # Only the first rows are shown, so read just the start of the file
+            try:
+                head_bytes, complete = await download_prefix("datasets", file_path, PREVIEW_PREFIX_BYTES)
+                if complete:
+                    preview_df = pd.read_csv(io.BytesIO(head_bytes), nrows=rows)
+                else:
+                    # Drop the cut-off last line and require one spare row, so a partial row never shows
+                    head_bytes = head_bytes[:head_bytes.rfind(b"\n") + 1]
+                    candidate = pd.read_csv(io.BytesIO(head_bytes), nrows=rows + 1)
+                    if len(candidate) > rows:
+                        preview_df = candidate.head(rows)
+            except Exception as e:
+                logger.warning("Ranged preview read failed, downloading full dataset: %s", e)
 
-        # Get preview
-        preview_df = df.head(rows)
+        if preview_df is None:
+            file_bytes = await asyncio.to_thread(supabase.storage.from_("datasets").download, file_path)
+            df = pd.read_csv(io.BytesIO(file_bytes))
+            preview_df = df.head(rows)
+            total_rows, total_columns = len(df), len(df.columns)
 
         return {
             "status": "success",
             "data": {
                 "headers": preview_df.columns.tolist(),
                 "rows": preview_df.values.tolist(),
-                "total_rows": len(df),
-                "total_columns": len(df.columns),
-                "name": dataset_result.data[0]["name"]
+                "total_rows": total_rows,
+                "total_columns": total_columns,
+                "name": dataset["name"]
             }
         }
 
@@ -609,9 +716,11 @@ async def get_dataset_preview(
 async def get_feature_importance(model_id: str, user_id: str = Query(...)):
     """Get feature importance for the model."""
     try:
-        result = supabase.table("models").select(
-            "model_url, feature_columns"
-        ).eq("id", model_id).eq("user_id", user_id).single().execute()
+        result = await run_query(
+            supabase.table("models").select(
+                "model_url, feature_columns, feature_importance"
+            ).eq("id", model_id).eq("user_id", user_id).single()
+        )
 
         if not result.data:
             raise HTTPException(status_code=404, detail="Model not found")
@@ -619,15 +728,18 @@ async def get_feature_importance(model_id: str, user_id: str = Query(...)):
         model_url = result.data["model_url"]
         feature_columns = result.data.get("feature_columns", [])
 
-        file_path = model_url.split("/models/")[-1]
-        model_bytes = supabase.storage.from_("models").download(file_path)
-
-        temp_path = os.path.join(tempfile.gettempdir(), f"temp_{model_id}.pkl")
-        with open(temp_path, "wb") as f:
-            f.write(model_bytes)
+        # Saved at training time; only models trained before that need the pickle
+        if result.data.get("feature_importance") is not None:
+            return ORJSONResponse({
+                "status": "success",
+                "data": {
+                    "features": feature_columns,
+                    "importance": result.data["feature_importance"]
+                }
+            })
 
-        bundle = joblib.load(temp_path)
-        os.remove(temp_path)
+        # Shared in-process LRU with the predict endpoints, so repeat views skip download + unpickle
+        bundle = await asyncio.to_thread(model_store.load_model, model_url, model_id)
 
         model = bundle.get("model")
 
@@ -639,29 +751,27 @@ async def get_feature_importance(model_id: str, user_id: str = Query(...)):
             actual_model = model
 
         if hasattr(actual_model, "feature_importances_"):
-            importance = actual_model.feature_importances_.tolist()
+            importance = np.asarray(actual_model.feature_importances_)
         elif hasattr(actual_model, "coef_"):
-            coef = actual_model.coef_
-            if len(coef.shape) > 1:
-                importance = [abs(c) for c in coef[0]]
-            else:
-                importance = [abs(c) for c in coef]
+            coef = np.asarray(actual_model.coef_)
+            importance = np.abs(coef[0] if coef.ndim > 1 else coef)
 
-        return {
+        # Returned directly so orjson serializes the ndarray natively (jsonable_encoder can't)
+        return ORJSONResponse({
             "status": "success",
             "data": {
                 "features": feature_columns,
                 "importance": importance
             }
-        }
+        })
 
     except HTTPException:
         raise
     except Exception as e:
-        return {
+        return ORJSONResponse({
             "status": "success",
             "data": {"features": [], "importance": []}
-        }
+        })
 
 
 @router.get("/models/{model_id}/predictions")
@@ -674,7 +784,7 @@ async def get_prediction_history(
     try:
         model_check = supabase.table("models").select("id").eq(
             "id", model_id
-        ).eq("user_id", user_id).execute()
+        ).eq("user_id", user_id).limit(1).execute()
 
         if not model_check.data:
             raise HTTPException(status_code=404, detail="Model not found")
@@ -704,9 +814,33 @@ async def get_prediction_history(
 
 
 async def calculate_model_summary(user_id: str) -> Dict[str, Any]:
-    """Calculate summary statistics for user's models."""
+    """Calculate summary statistics for user's models.
+
+    Uses the model_summary() SQL function; falls back to aggregating in Python if it isn't deployed.
+    Results are cached per user for a few seconds (see app.services.model_cache).
+    """
+    cache_key = f"summary:{user_id}"
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    summary = None
+    try:
+        result = await run_query(supabase.rpc("model_summary", {"uid": user_id}))
+        summary = result.data or None
+    except Exception as e:
+        logger.warning("model_summary RPC unavailable, aggregating in Python: %s", e)
+
+    if summary is None:
+        summary = await _calculate_model_summary_in_python(user_id)
+
+    summary_cache.set(cache_key, summary)
+    return summary
+
+
+async def _calculate_model_summary_in_python(user_id: str) -> Dict[str, Any]:
     try:
-        result = supabase.table("models").select("*").eq("user_id", user_id).execute()
+        result = await run_query(supabase.table("models").select("*, datasets(name)").eq("user_id", user_id))
         models = result.data
 
         if not models:
@@ -720,38 +854,52 @@ async def calculate_model_summary(user_id: str) -> Dict[str, Any]:
                 "classification_count": 0,
             }
 
+        # Single pass; dataset names come back embedded, so the most-used lookup needs no extra query
         total = len(models)
-        regression_models = [m for m in models if m["problem_type"] == "regression"]
-        classification_models = [m for m in models if m["problem_type"] == "classification"]
-
-        avg_r2 = None
-        if regression_models:
-            r2_scores = [m["metrics"].get("r2_score", 0) for m in regression_models if m["metrics"].get("r2_score")]
-            avg_r2 = sum(r2_scores) / len(r2_scores) if r2_scores else None
+        dataset_names = {}
+        dataset_counts = Counter()
+        regression_count = classification_count = 0
+        r2_sum = r2_n = accuracy_sum = accuracy_n = 0
+        best_regression = best_classification = None
+        best_r2 = best_accuracy = None
 
-        avg_accuracy = None
-        if classification_models:
-            accuracies = [m["metrics"].get("accuracy", 0) for m in classification_models if
-                          m["metrics"].get("accuracy")]
-            avg_accuracy = sum(accuracies) / len(accuracies) if accuracies else None
-
-        dataset_counts = {}
         for model in models:
+            dataset = model.pop("datasets", None)
             dataset_id = model.get("dataset_id")
             if dataset_id:
-                dataset_counts[dataset_id] = dataset_counts.get(dataset_id, 0) + 1
+                dataset_counts[dataset_id] += 1
+                if dataset:
+                    dataset_names[dataset_id] = dataset.get("name")
+
+            metrics = model["metrics"]
+            if model["problem_type"] == "regression":
+                regression_count += 1
+                r2 = metrics.get("r2_score")
+                if r2:
+                    r2_sum += r2
+                    r2_n += 1
+                score = metrics.get("r2_score", -999)
+                if best_regression is None or score > best_r2:
+                    best_regression, best_r2 = model, score
+            elif model["problem_type"] == "classification":
+                classification_count += 1
+                accuracy = metrics.get("accuracy")
+                if accuracy:
+                    accuracy_sum += accuracy
+                    accuracy_n += 1
+                score = metrics.get("accuracy", -999)
+                if best_classification is None or score > best_accuracy:
+                    best_classification, best_accuracy = model, score
+
+        avg_r2 = r2_sum / r2_n if r2_n else None
+        avg_accuracy = accuracy_sum / accuracy_n if accuracy_n else None
 
         most_used_dataset = None
         if dataset_counts:
-            most_used_id = max(dataset_counts, key=dataset_counts.get)
-            dataset_result = supabase.table("datasets").select("name").eq("id", most_used_id).single().execute()
-            most_used_dataset = dataset_result.data.get("name") if dataset_result.data else None
+            most_used_id = dataset_counts.most_common(1)[0][0]
+            most_used_dataset = dataset_names.get(most_used_id)
 
-        best_model = None
-        if regression_models:
-            best_model = max(regression_models, key=lambda m: m["metrics"].get("r2_score", -999))
-        elif classification_models:
-            best_model = max(classification_models, key=lambda m: m["metrics"].get("accuracy", -999))
+        best_model = best_regression if best_regression is not None else best_classification
 
         return {
             "total_models": total,
@@ -759,8 +907,8 @@ async def calculate_model_summary(user_id: str) -> Dict[str, Any]:
             "avg_accuracy": avg_accuracy,
             "most_used_dataset": most_used_dataset,
             "best_performing_model": best_model,
-            "regression_count": len(regression_models),
-            "classification_count": len(classification_models),
+            "regression_count": regression_count,
+            "classification_count": classification_count,
         }
 
     except Exception as e:
@@ -780,7 +928,8 @@ async def calculate_model_summary(user_id: str) -> Dict[str, Any]:
 async def get_model_analytics(
         model_id: str,
         user_id: str = Query(...),
-        sample_size: Optional[int] = Query(None, description="Sample size for large datasets (default: auto)")
+        sample_size: Optional[int] = Query(None, description="Sample size for large datasets (default: auto)"),
+        summary: bool = Query(False, description="Only report whether analytics exist, without loading predictions")
 ):
     """
     Get comprehensive analytics data for model visualization.
@@ -793,9 +942,7 @@ async def get_model_analytics(
     """
     try:
         # Fetch model metadata
-        model_result = supabase.table("models").select(
-            "problem_type, metrics, predictions_url, target_column"
-        ).eq("id", model_id).eq("user_id", user_id).single().execute()
+        model_result = await _fetch_analytics_model(model_id, user_id)
 
         if not model_result.data:
             raise HTTPException(status_code=404, detail="Model not found")
@@ -820,127 +967,31 @@ async def get_model_analytics(
                 }
             }
 
-        # Load predictions data
-        file_path = predictions_url.split("/models/")[-1]
-        predictions_bytes = supabase.storage.from_("models").download(file_path)
-        predictions_data = json.loads(predictions_bytes.decode())
+        if summary:
+            # Availability probe: answered from the model row alone
+            return {
+                "status": "success",
+                "data": {"has_data": True, "total_samples": model_data.get("prediction_samples")}
+            }
 
-        actual = np.array(predictions_data["actual"])
-        predicted = np.array(predictions_data["predicted"])
-        residuals = np.array(predictions_data.get("residuals", actual - predicted))
+        cache_key = ("regression", model_id, predictions_url, sample_size)
+        cached = analytics_cache.get(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
 
-        n_samples = len(actual)
+        file_path = predictions_url.split("/models/")[-1]
 
-        # Smart sampling for large datasets
+        # Default view is precomputed at training time; custom sample sizes (and older models) are built here
+        data = None
         if sample_size is None:
-            # Auto-determine sample size based on data size
-            if n_samples > 1000:
-                sample_size = min(500, n_samples)
-            else:
-                sample_size = n_samples
-
-        # Stratified sampling to preserve distribution
-        if n_samples > sample_size:
-            # Sample indices evenly across the range
-            indices = np.linspace(0, n_samples - 1, sample_size, dtype=int)
-            actual_sample = actual[indices]
-            predicted_sample = predicted[indices]
-            residuals_sample = residuals[indices]
-        else:
-            actual_sample = actual
-            predicted_sample = predicted
-            residuals_sample = residuals
-
-        # Calculate comprehensive statistics
-
-        # Basic metrics
-        mae = float(np.mean(np.abs(residuals)))
-        rmse = float(np.sqrt(np.mean(residuals ** 2)))
-        r2 = float(model_data["metrics"].get("r2_score", 0))
-
-        # Residual statistics
-        residual_mean = float(np.mean(residuals))
-        residual_std = float(np.std(residuals))
-        residual_skewness = float(stats.skew(residuals))
-        residual_kurtosis = float(stats.kurtosis(residuals))
-
-        # Normality test (Shapiro-Wilk for small samples, Anderson-Darling for larger)
-        normality_p_value = 0.0
-        try:
-            if len(residuals) < 5000:
-                _, normality_p_value = stats.shapiro(residuals[:5000])
-                normality_p_value = float(normality_p_value)
-            else:
-                result = stats.anderson(residuals)
-                normality_p_value = 1.0 if result.statistic < result.critical_values[2] else 0.0
-        except:
-            normality_p_value = 0.0
-
-        # Calculate prediction intervals (95% confidence)
-        prediction_std = np.std(residuals)
-        margin = float(1.96 * prediction_std)
-
-        # Domain range for perfect prediction line
-        min_val = float(min(actual.min(), predicted.min()))
-        max_val = float(max(actual.max(), predicted.max()))
-        padding = (max_val - min_val) * 0.05
-
-        # Identify outliers (beyond 3 standard deviations)
-        outlier_threshold = 3 * residual_std
-        outlier_indices = np.where(np.abs(residuals) > outlier_threshold)[0]
-
-        # Prepare chart data - ensure all values are native Python types
-        scatter_data = [
-            {
-                "actual": float(a),
-                "predicted": float(p),
-                "residual": float(r),
-                "is_outlier": bool(i in outlier_indices)
-            }
-            for i, (a, p, r) in enumerate(zip(actual_sample, predicted_sample, residuals_sample))
-        ]
-
-        # Residual distribution bins (for histogram overlay)
-        hist, bin_edges = np.histogram(residuals, bins=30, density=True)
-        residual_distribution = [
-            {"bin_center": float((bin_edges[i] + bin_edges[i + 1]) / 2), "density": float(hist[i])}
-            for i in range(len(hist))
-        ]
-
-        # Performance interpretation
-        interpretation = _interpret_regression_performance(r2, mae, rmse, residual_mean, normality_p_value)
+            data = await asyncio.to_thread(_load_analytics_sidecar, file_path)
+        if data is None:
+            arrays = await asyncio.to_thread(_load_regression_arrays, file_path)
+            data = build_regression_analytics(arrays, model_data["metrics"].get("r2_score", 0), sample_size)
 
-        return {
-            "status": "success",
-            "data": {
-                "has_data": True,
-                "sample_info": {
-                    "total_samples": int(n_samples),
-                    "displayed_samples": int(len(scatter_data)),
-                    "is_sampled": n_samples > len(scatter_data)
-                },
-                "scatter_data": scatter_data,
-                "residual_distribution": residual_distribution,
-                "domain": {
-                    "min": float(min_val - padding),
-                    "max": float(max_val + padding)
-                },
-                "statistics": {
-                    "r2_score": r2,
-                    "mae": mae,
-                    "rmse": rmse,
-                    "residual_mean": residual_mean,
-                    "residual_std": residual_std,
-                    "residual_skewness": residual_skewness,
-                    "residual_kurtosis": residual_kurtosis,
-                    "normality_p_value": normality_p_value,
-                    "prediction_margin": margin,
-                    "outlier_count": int(len(outlier_indices)),
-                    "outlier_percentage": float(len(outlier_indices) / n_samples * 100)
-                },
-                "interpretation": interpretation
-            }
-        }
+        payload = {"status": "success", "data": data}
+        analytics_cache.set(cache_key, payload)
+        return ORJSONResponse(payload)
 
     except HTTPException:
         raise
@@ -949,85 +1000,11 @@ async def get_model_analytics(
         raise HTTPException(status_code=500, detail=f"Failed to load analytics: {str(e)}")
 
 
-def _interpret_regression_performance(
-        r2: float,
-        mae: float,
-        rmse: float,
-        residual_mean: float,
-        normality_p: float
-) -> Dict[str, Any]:
-    """Generate human-readable interpretation of model performance."""
-
-    # R² interpretation
-    if r2 > 0.9:
-        r2_quality = "excellent"
-        r2_message = "explains over 90% of variance"
-    elif r2 > 0.7:
-        r2_quality = "strong"
-        r2_message = "captures most patterns effectively"
-    elif r2 > 0.5:
-        r2_quality = "moderate"
-        r2_message = "identifies significant patterns"
-    elif r2 > 0.3:
-        r2_quality = "weak"
-        r2_message = "provides limited predictive value"
-    else:
-        r2_quality = "poor"
-        r2_message = "struggles to capture patterns"
-
-    # Bias check
-    bias_threshold = rmse * 0.1
-    has_bias = abs(residual_mean) > bias_threshold
-    bias_direction = "overestimates" if residual_mean > 0 else "underestimates"
-
-    # Residual normality
-    is_normal = normality_p > 0.05
-
-    # Overall assessment
-    issues = []
-    if r2 < 0.5:
-        issues.append("Low R² indicates room for improvement")
-    if has_bias:
-        issues.append(f"Model systematically {bias_direction} (bias detected)")
-    if not is_normal:
-        issues.append("Residuals not normally distributed (check for patterns)")
-    if mae > rmse * 0.8:
-        issues.append("Large errors present (check for outliers)")
-
-    return {
-        "r2_quality": r2_quality,
-        "r2_message": r2_message,
-        "has_bias": bool(has_bias),
-        "bias_direction": bias_direction if has_bias else None,
-        "residuals_normal": bool(is_normal),
-        "issues": issues,
-        "recommendations": _generate_recommendations(r2, has_bias, is_normal)
-    }
-
-
-def _generate_recommendations(r2: float, has_bias: bool, is_normal: bool) -> List[str]:
-    """Generate actionable recommendations based on performance."""
-    recommendations = []
-
-    if r2 < 0.7:
-        recommendations.append("Consider feature engineering or trying different algorithms")
-
-    if has_bias:
-        recommendations.append("Investigate systematic prediction bias - check for missing features")
-
-    if not is_normal:
-        recommendations.append("Non-normal residuals suggest non-linear patterns - try polynomial features")
-
-    if r2 > 0.8:
-        recommendations.append("Model performs well - ready for production use")
-
-    return recommendations
-
-
 @router.get("/models/{model_id}/classification-analytics")
 async def get_classification_analytics(
         model_id: str,
-        user_id: str = Query(..., description="User ID")
+        user_id: str = Query(..., description="User ID"),
+        summary: bool = Query(False, description="Only report whether analytics exist, without loading predictions")
 ):
     """
     Get comprehensive classification analytics including confusion matrix.
@@ -1040,9 +1017,7 @@ async def get_classification_analytics(
     """
     try:
         # Fetch model metadata
-        model_result = supabase.table("models").select(
-            "problem_type, metrics, predictions_url, target_column"
-        ).eq("id", model_id).eq("user_id", user_id).single().execute()
+        model_result = await _fetch_analytics_model(model_id, user_id)
 
         if not model_result.data:
             raise HTTPException(status_code=404, detail="Model not found")
@@ -1067,194 +1042,35 @@ async def get_classification_analytics(
                 }
             }
 
-        # Load predictions data
-        file_path = predictions_url.split("/models/")[-1]
-        predictions_bytes = supabase.storage.from_("models").download(file_path)
-        predictions_data = json.loads(predictions_bytes.decode())
-
-        y_true = np.array(predictions_data["actual"])
-        y_pred = np.array(predictions_data["predicted"])
-
-        # Get unique classes
-        classes = np.unique(np.concatenate([y_true, y_pred]))
-        n_classes = len(classes)
-
-        # Calculate confusion matrix
-        cm = confusion_matrix(y_true, y_pred, labels=classes)
-
-        # Build confusion matrix data for frontend
-        confusion_matrix_data = []
-        for i, actual_class in enumerate(classes):
-            for j, predicted_class in enumerate(classes):
-                confusion_matrix_data.append({
-                    "actual": str(actual_class),
-                    "predicted": str(predicted_class),
-                    "count": int(cm[i][j]),
-                    "is_correct": bool(i == j)
-                })
-
-        # Calculate per-class metrics
-        precision, recall, f1, support = precision_recall_fscore_support(
-            y_true, y_pred, labels=classes, zero_division=0
-        )
+        if summary:
+            # Availability probe: answered from the model row alone
+            return {
+                "status": "success",
+                "data": {"has_data": True, "total_samples": model_data.get("prediction_samples")}
+            }
 
-        class_metrics = []
-        for i, class_label in enumerate(classes):
-            class_metrics.append({
-                "class": str(class_label),
-                "precision": float(precision[i]),
-                "recall": float(recall[i]),
-                "f1_score": float(f1[i]),
-                "support": int(support[i])
-            })
+        cache_key = ("classification", model_id, predictions_url)
+        cached = analytics_cache.get(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
 
-        # Overall metrics
-        overall_metrics = model_data["metrics"]
-
-        # Calculate additional insights
-        total_predictions = len(y_true)
-        correct_predictions = int(np.sum(y_true == y_pred))
-        accuracy = float(correct_predictions / total_predictions)
-
-        # Find most confused pairs
-        confusion_pairs = []
-        for i, actual_class in enumerate(classes):
-            for j, predicted_class in enumerate(classes):
-                if i != j and cm[i][j] > 0:
-                    confusion_pairs.append({
-                        "actual": str(actual_class),
-                        "predicted": str(predicted_class),
-                        "count": int(cm[i][j]),
-                        "percentage": float(cm[i][j] / np.sum(cm[i]) * 100)
-                    })
-
-        # Sort by count and get top 5
-        confusion_pairs.sort(key=lambda x: x["count"], reverse=True)
-        top_confusions = confusion_pairs[:5]
-
-        # Class distribution
-        class_distribution = []
-        for i, class_label in enumerate(classes):
-            class_count = int(support[i])
-            class_distribution.append({
-                "class": str(class_label),
-                "count": class_count,
-                "percentage": float(class_count / total_predictions * 100)
-            })
+        file_path = predictions_url.split("/models/")[-1]
 
-        # Performance interpretation
-        interpretation = _interpret_classification_performance(
-            overall_metrics.get("accuracy", 0),
-            overall_metrics.get("f1_score", 0),
-            n_classes,
-            class_metrics
-        )
+        # Precomputed at training time; older models are built from the predictions file
+        data = await asyncio.to_thread(_load_analytics_sidecar, file_path)
+        if data is None:
+            predictions_bytes = await asyncio.to_thread(supabase.storage.from_("models").download, file_path)
+            predictions_data = _load_predictions_json(predictions_bytes)
+            data = build_classification_analytics(
+                np.array(predictions_data["actual"]), np.array(predictions_data["predicted"]), model_data["metrics"]
+            )
 
-        return {
-            "status": "success",
-            "data": {
-                "has_data": True,
-                "confusion_matrix": confusion_matrix_data,
-                "class_metrics": class_metrics,
-                "overall_metrics": {
-                    "accuracy": accuracy,
-                    "precision": float(overall_metrics.get("precision", 0)),
-                    "recall": float(overall_metrics.get("recall", 0)),
-                    "f1_score": float(overall_metrics.get("f1_score", 0)),
-                    "total_predictions": total_predictions,
-                    "correct_predictions": correct_predictions,
-                    "n_classes": n_classes
-                },
-                "class_distribution": class_distribution,
-                "top_confusions": top_confusions,
-                "interpretation": interpretation
-            }
-        }
+        payload = {"status": "success", "data": data}
+        analytics_cache.set(cache_key, payload)
+        return ORJSONResponse(payload)
 
     except HTTPException:
         raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to load analytics: {str(e)}")
-
-
-def _interpret_classification_performance(
-        accuracy: float,
-        f1_score: float,
-        n_classes: int,
-        class_metrics: List[Dict]
-) -> Dict[str, Any]:
-    """Generate human-readable interpretation of classification performance."""
-
-    # Overall quality assessment
-    if accuracy > 0.95 and f1_score > 0.95:
-        quality = "excellent"
-        quality_message = "achieves exceptional performance across all classes"
-    elif accuracy > 0.85 and f1_score > 0.85:
-        quality = "strong"
-        quality_message = "performs very well with good balance"
-    elif accuracy > 0.75:
-        quality = "good"
-        quality_message = "shows solid performance"
-    elif accuracy > 0.6:
-        quality = "moderate"
-        quality_message = "provides reasonable classification"
-    else:
-        quality = "weak"
-        quality_message = "struggles with classification accuracy"
-
-    # Check for class imbalance issues
-    precisions = [m["precision"] for m in class_metrics]
-    recalls = [m["recall"] for m in class_metrics]
-    f1_scores = [m["f1_score"] for m in class_metrics]
-
-    precision_std = float(np.std(precisions))
-    recall_std = float(np.std(recalls))
-    f1_std = float(np.std(f1_scores))
-
-    has_imbalance = precision_std > 0.2 or recall_std > 0.2
-
-    # Find worst performing class
-    worst_class = min(class_metrics, key=lambda x: x["f1_score"])
-    best_class = max(class_metrics, key=lambda x: x["f1_score"])
-
-    # Generate issues
-    issues = []
-    if accuracy < 0.8:
-        issues.append(f"Overall accuracy of {accuracy * 100:.1f}% suggests room for improvement")
-
-    if has_imbalance:
-        issues.append(f"Significant performance variance across classes (std: {f1_std:.2f})")
-        issues.append(
-            f"Class '{worst_class['class']}' has notably lower performance (F1: {worst_class['f1_score']:.2f})")
-
-    if f1_score < 0.7:
-        issues.append("F1-score indicates imbalance between precision and recall")
-
-    # Generate recommendations
-    recommendations = []
-
-    if has_imbalance:
-        recommendations.append(
-            f"Focus on improving '{worst_class['class']}' class - consider oversampling or class weights")
-
-    if accuracy < 0.8:
-        recommendations.append("Try ensemble methods or feature engineering to boost performance")
-
-    if recall_std > 0.2:
-        recommendations.append(
-            "High recall variance suggests some classes are harder to detect - review training data balance")
-
-    if not recommendations:
-        recommendations.append("Model performs well - monitor performance on new data")
-
-    return {
-        "quality": quality,
-        "quality_message": quality_message,
-        "has_imbalance": bool(has_imbalance),
-        "worst_class": worst_class["class"],
-        "best_class": best_class["class"],
-        "issues": issues,
-        "recommendations": recommendations,
-        "balance_score": float(1 - f1_std)  # Higher is better (0-1)
-    }
\ No newline at end of file
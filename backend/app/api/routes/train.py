@@ -1,7 +1,14 @@
 # app/api/routes/train.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from app.api.deps import get_current_user_id
-from app.services.training_service import train_model, ModelTrainingError, analyze_target_column, check_model_name_exists
+from app.services.training_service import (
+    train_model,
+    ModelTrainingError,
+    analyze_target_column,
+    check_model_name_exists,
+    validate_train_request,
+)
 from app.services.data_preprocessing import DataPreprocessingError
 from app.services.dataset_service import list_user_datasets
 from app.db.supabase_client import supabase
@@ -96,29 +103,23 @@ async def train_user_dataset(
         auto_generate_name (bool): Auto-generate unique model name
     """
     try:
-        # Verify dataset exists and belongs to user
-        dataset_check = (
-            supabase.table("datasets")
-            .select("id")
-            .eq("id", dataset_id)
-            .eq("user_id", user_id)
-            .execute()
+        # Dataset ownership and duplicate-name check (only if custom name provided and not
+        # auto-generating) in one round-trip
+        dataset_owned, name_exists = await validate_train_request(
+            dataset_id, user_id, model_name if model_name and not auto_generate_name else None
         )
 
-        if not dataset_check.data:
+        if not dataset_owned:
             raise HTTPException(
                 status_code=404,
                 detail="Dataset not found or does not belong to user"
             )
 
-        # Check for duplicate model name (only if custom name provided and not auto-generating)
-        if model_name and not auto_generate_name:
-            name_exists = await check_model_name_exists(user_id, model_name)
-            if name_exists:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"A model with the name '{model_name}' already exists. Please choose a different name or enable auto-generation."
-                )
+        if name_exists:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A model with the name '{model_name}' already exists. Please choose a different name or enable auto-generation."
+            )
 
         # Trigger model training pipeline
         result = await train_model(
@@ -135,11 +136,12 @@ async def train_user_dataset(
             auto_generate_name=auto_generate_name
         )
 
-        return {
+        # ORJSONResponse serializes the prediction arrays directly (no jsonable_encoder walk)
+        return ORJSONResponse({
             "status": "success",
             "message": "Model trained successfully",
             "data": result,
-        }
+        })
 
     except DataPreprocessingError as e:
         raise HTTPException(
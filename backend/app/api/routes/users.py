@@ -2,12 +2,14 @@
 User management endpoints
 File: app/api/routes/users.py
 """
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
-from supabase import create_client, Client
+from supabase import Client
 from app.core.security import verify_supabase_token
 from app.core.config import get_settings
+from app.db.supabase_client import supabase as supabase_client, run_query
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -18,15 +20,18 @@ def get_supabase_admin() -> Client:
     """
     Get Supabase client with service role (admin) privileges
     Required for deleting users from auth
+
+    Returns the shared pooled client instead of building (and handshaking)
+    a new one on every request. Injected with Depends so tests can override it.
     """
-    return create_client(
-        settings.supabase_url,
-        settings.supabase_service_role_key or settings.supabase_anon_key
-    )
+    return supabase_client
 
 
 @router.delete("/users/delete-account", status_code=status.HTTP_200_OK)
-async def delete_user_account(token_data: dict = Depends(verify_supabase_token)):
+async def delete_user_account(
+    token_data: dict = Depends(verify_supabase_token),
+    supabase: Client = Depends(get_supabase_admin),
+):
     """
     Delete the authenticated user's account and all associated data.
 
@@ -50,40 +55,33 @@ async def delete_user_account(token_data: dict = Depends(verify_supabase_token))
             detail="Invalid token: user ID not found"
         )
 
-    supabase = get_supabase_admin()
-
     try:
         logger.info(f"Starting account deletion for user: {user_id}")
 
-        # Step 1: Verify user exists in database
-        user_check = supabase.table("users").select("id").eq("id", user_id).execute()
-
-        if not user_check.data:
-            logger.warning(f"User {user_id} not found in database")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        # Step 2: Delete from users table
+        # Step 1: Delete from users table; the deleted row comes back, so an empty
+        # result doubles as the "user exists" check without a separate SELECT.
+        # That only holds if the DELETE runs once: a retry after a lost response would
+        # find nothing and report 404, so only requests that never reached the server are retried.
         # This will cascade delete all related records:
         # - datasets (on delete cascade)
         # - models (on delete cascade)
         # - training_history (via models cascade)
         logger.info(f"Deleting user data from database for user: {user_id}")
 
-        delete_result = supabase.table("users").delete().eq("id", user_id).execute()
+        delete_result = await run_query(
+            supabase.table("users").delete().eq("id", user_id), idempotent=False
+        )
 
-        if not delete_result:
-            logger.error(f"Failed to delete user {user_id} from database")
+        if not delete_result.data:
+            logger.warning(f"User {user_id} not found in database")
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete user data from database"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
             )
 
         logger.info(f"Successfully deleted database records for user: {user_id}")
 
-        # Step 3: Delete from Supabase Auth
+        # Step 2: Delete from Supabase Auth
         # Note: This requires service_role_key with admin privileges
         if settings.supabase_service_role_key:
             logger.info(f"Deleting user from Supabase Auth: {user_id}")
@@ -103,7 +101,7 @@ async def delete_user_account(token_data: dict = Depends(verify_supabase_token))
         return {
             "message": "Account successfully deleted",
             "user_id": user_id,
-            "deleted_at": datetime.utcnow().isoformat()
+            "deleted_at": datetime.now(timezone.utc).isoformat()
         }
 
     except HTTPException:
@@ -118,7 +116,10 @@ async def delete_user_account(token_data: dict = Depends(verify_supabase_token))
 
 
 @router.get("/users/stats", status_code=status.HTTP_200_OK)
-async def get_user_stats(token_data: dict = Depends(verify_supabase_token)):
+async def get_user_stats(
+    token_data: dict = Depends(verify_supabase_token),
+    supabase: Client = Depends(get_supabase_admin),
+):
     """
     Get statistics about user's data (useful for showing before deletion)
 
@@ -133,20 +134,23 @@ async def get_user_stats(token_data: dict = Depends(verify_supabase_token)):
             detail="Invalid token: user ID not found"
         )
 
-    supabase = get_supabase_admin()
-
     try:
-        # Count datasets
-        datasets = supabase.table("datasets")\
-            .select("id", count="exact")\
-            .eq("user_id", user_id)\
-            .execute()
-
-        # Count models
-        models = supabase.table("models")\
-            .select("id", count="exact")\
-            .eq("user_id", user_id)\
-            .execute()
+        # Count-only queries: limit(0) returns just the Content-Range total, no rows.
+        # They're independent, so run both at once
+        datasets, models = await asyncio.gather(
+            run_query(
+                supabase.table("datasets")
+                .select("id", count="exact")
+                .eq("user_id", user_id)
+                .limit(0)
+            ),
+            run_query(
+                supabase.table("models")
+                .select("id", count="exact")
+                .eq("user_id", user_id)
+                .limit(0)
+            ),
+        )
 
         return {
             "user_id": user_id,
@@ -8,6 +8,10 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     app_name: str = "RegressLab API"
     environment: str = Field(default="development")
+    # Print full tracebacks for failed training runs (TRAIN_DEBUG=1)
+    train_debug: bool = False
+    # Root log level; DEBUG turns on per-step validation/preprocessing logs (LOG_LEVEL)
+    log_level: str = "INFO"
     cors_origins: List[str] = Field(default_factory=lambda: ["http://localhost:3000", "https://model-mind-ai.vercel.app"])
 
     # Database & Supabase
@@ -17,6 +21,9 @@ class Settings(BaseSettings):
     supabase_service_role_key: Optional[str] = None
     supabase_jwks_url: Optional[str] = None
 
+    # Cache & queues (optional; in-process fallbacks are used when unset)
+    redis_url: Optional[str] = None
+
     # Other integrations
     openai_api_key: Optional[str] = None
     resend_api_key: Optional[str] = None
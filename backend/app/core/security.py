@@ -26,34 +26,193 @@ Security utilities for JWT verification and authentication
 File: app/core/security.py
 """
 from fastapi import Depends, HTTPException, Header, status
-from jose import jwt, JWTError
-import requests
-from functools import lru_cache
-from typing import Dict, Optional
+import jwt
+from jwt import PyJWK, PyJWTError
+import asyncio
+import base64
+import hashlib
+import httpx
+import orjson
+import time
+from typing import Dict, Optional, Tuple
 import logging
 from app.core.config import get_settings
+from app.db.redis_client import redis
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# JWKS indexed by kid. Expires so rotated keys are picked up without a restart
+JWKS_TTL_SECONDS = 600
+# Floor between fetches, so unknown kids (or a down auth server) can't turn every request into one
+JWKS_MIN_REFRESH_SECONDS = 30
 
-@lru_cache(maxsize=1)
-def get_supabase_jwks() -> Dict:
+_jwks_cache = TTLCache(ttl=JWKS_TTL_SECONDS, maxsize=4)
+
+# Verified claims by token digest, so repeat requests with the same bearer token skip the
+# parse + signature check. Entries never outlive the token's exp
+TOKEN_CACHE_TTL_SECONDS = 300
+_token_cache = TTLCache(ttl=TOKEN_CACHE_TTL_SECONDS, maxsize=10_000)
+# Single-flight: concurrent misses wait for the one in-progress fetch
+_jwks_lock = asyncio.Lock()
+_jwks_last_fetch = float("-inf")
+# Parsed key objects per kid, alongside the JWK they were built from
+_signing_keys: Dict[Optional[str], Tuple[Dict, PyJWK]] = {}
+# Last good key set plus its validators, kept past the TTL for conditional refetches
+_jwks_stale: Dict = {"keys": {}, "etag": None, "last_modified": None}
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _jwks_url() -> str:
+    return f"{settings.supabase_url}/auth/v1/keys"
+
+
+# Shared across workers when Redis is configured, so a restart costs one GET instead of
+# one JWKS download per worker
+_JWKS_REDIS_KEY = f"jwks:{hashlib.sha256(_jwks_url().encode()).hexdigest()[:16]}"
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=5)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the JWKS HTTP client (called on app shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _fetch_jwks() -> Dict[str, Dict]:
+    """Download the JWKS and index it by kid.
+
+    Revalidates with ETag / Last-Modified, so an unchanged key set costs a 304. On failure the
+    last good keys are returned without refreshing the cache.
+    """
+    global _jwks_last_fetch
+    _jwks_last_fetch = time.monotonic()
+    headers = {}
+    if _jwks_stale["etag"]:
+        headers["If-None-Match"] = _jwks_stale["etag"]
+    if _jwks_stale["last_modified"]:
+        headers["If-Modified-Since"] = _jwks_stale["last_modified"]
+    try:
+        response = await _get_http_client().get(_jwks_url(), headers=headers)
+        if response.status_code == 304 and _jwks_stale["keys"]:
+            keys = _jwks_stale["keys"]
+        else:
+            response.raise_for_status()
+            keys = {key.get("kid"): key for key in response.json().get("keys", [])}
+            _jwks_stale.update(
+                keys=keys,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+    except Exception as e:
+        logger.error(f"Failed to fetch JWKS: {str(e)}")
+        return _jwks_stale["keys"]
+    _jwks_cache.set("keys", keys)
+    await _store_shared_jwks(keys)
+    return keys
+
+
+async def _get_shared_jwks() -> Optional[Dict[str, Dict]]:
+    """Key set another worker stored in Redis, copied into the local cache for its remaining TTL"""
+    if redis is None:
+        return None
+    try:
+        cached = await redis.get(_JWKS_REDIS_KEY)
+        if not cached:
+            return None
+        entry = orjson.loads(cached)
+        remaining = JWKS_TTL_SECONDS - (time.time() - entry["fetched_at"])
+        if remaining <= 0:
+            return None
+        keys = {key.get("kid"): key for key in entry["keys"]}
+    except Exception as e:
+        logger.warning(f"Shared JWKS lookup failed: {str(e)}")
+        return None
+    _jwks_cache.set("keys", keys, ttl=remaining)
+    if not _jwks_stale["keys"]:
+        _jwks_stale["keys"] = keys
+    return keys
+
+
+async def _store_shared_jwks(keys: Dict[str, Dict]) -> None:
+    if redis is None:
+        return
+    try:
+        entry = orjson.dumps({"keys": list(keys.values()), "fetched_at": time.time()})
+        await redis.set(_JWKS_REDIS_KEY, entry, ex=JWKS_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Shared JWKS store failed: {str(e)}")
+
+
+async def get_supabase_jwks(force_refresh: bool = False) -> Dict[str, Dict]:
     """
-    Fetch and cache Supabase JWKS (JSON Web Key Set)
+    Fetch and cache Supabase JWKS (JSON Web Key Set), indexed by kid
     This is used to verify JWT signatures
     """
+    keys = _jwks_cache.get("keys")
+    if keys is not None and not force_refresh:
+        return keys
+
+    async with _jwks_lock:
+        # Another request may have refreshed while we waited for the lock
+        keys = _jwks_cache.get("keys")
+        recently_fetched = time.monotonic() - _jwks_last_fetch < JWKS_MIN_REFRESH_SECONDS
+        if (keys is not None and not force_refresh) or recently_fetched:
+            return keys or _jwks_stale["keys"]
+        if not force_refresh:
+            # A forced refresh means the cached keys are already stale, so it goes upstream
+            keys = await _get_shared_jwks()
+            if keys is not None:
+                return keys
+        return await _fetch_jwks()
+
+
+def _split_jwt(token: str) -> Tuple[str, str, str]:
+    """Header, payload and signature segments of a compact JWT (one split, no decoding)"""
+    parts = token.split(".", 2)
+    if len(parts) != 3:
+        raise jwt.InvalidTokenError("Not enough segments")
+    return parts[0], parts[1], parts[2]
+
+
+def _decode_segment(segment: str) -> Dict:
+    """base64url-decode and parse one JWT segment. No signature check"""
     try:
-        jwks_url = f"{settings.supabase_url}/auth/v1/keys"
-        response = requests.get(jwks_url, timeout=5)
-        response.raise_for_status()
-        return response.json()
+        decoded = orjson.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
     except Exception as e:
-        logger.error(f"Failed to fetch JWKS: {str(e)}")
-        return {}
+        raise jwt.InvalidTokenError(f"Invalid token segment: {str(e)}")
+    if not isinstance(decoded, dict):
+        raise jwt.InvalidTokenError("Invalid token segment")
+    return decoded
+
 
+async def _get_signing_key(kid: Optional[str]) -> PyJWK:
+    """Pick the key matching the token's kid, refetching the key set once if it isn't known."""
+    key = (await get_supabase_jwks()).get(kid)
+    if key is None:
+        # Keys may have been rotated since the cache was filled
+        key = (await get_supabase_jwks(force_refresh=True)).get(kid)
+    if key is None:
+        raise jwt.InvalidTokenError("No matching signing key for token")
 
-def verify_supabase_token(authorization: str = Header(...)) -> Dict:
+    # Building the RSA public key is the expensive part; redo it only if the JWK changed
+    cached = _signing_keys.get(kid)
+    if cached is None or cached[0] != key:
+        cached = (key, PyJWK(key))
+        _signing_keys[kid] = cached
+    return cached[1]
+
+
+async def verify_supabase_token(authorization: str = Header(...)) -> Dict:
     """
     Verify Supabase JWT token from Authorization header
 
@@ -77,15 +236,23 @@ def verify_supabase_token(authorization: str = Header(...)) -> Dict:
     # Extract token
     token = authorization.split(" ", 1)[1]
 
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     try:
+        header_segment, payload_segment, _ = _split_jwt(token)
+
         # For production: verify signature using JWKS
         if settings.environment == "production":
-            jwks = get_supabase_jwks()
+            # Only the header is parsed here; jwt.decode does the rest in its own single pass
+            signing_key = await _get_signing_key(_decode_segment(header_segment).get("kid"))
 
             # Decode and verify token
             decoded = jwt.decode(
                 token,
-                jwks,
+                signing_key.key,
                 algorithms=["RS256"],
                 audience="authenticated",
                 options={
@@ -97,11 +264,11 @@ def verify_supabase_token(authorization: str = Header(...)) -> Dict:
         else:
             # For development: decode without verification
             # WARNING: Only use this in development!
-            decoded = jwt.get_unverified_claims(token)
+            decoded = _decode_segment(payload_segment)
 
             # Basic validation even in development
             if not decoded.get("sub"):
-                raise JWTError("Token missing 'sub' claim")
+                raise jwt.InvalidTokenError("Token missing 'sub' claim")
 
         # Additional validation
         if not decoded.get("sub"):
@@ -111,9 +278,15 @@ def verify_supabase_token(authorization: str = Header(...)) -> Dict:
             )
 
         logger.info(f"Token verified for user: {decoded.get('sub')}")
+
+        ttl = float(TOKEN_CACHE_TTL_SECONDS)
+        if isinstance(decoded.get("exp"), (int, float)):
+            ttl = min(ttl, decoded["exp"] - time.time())
+        if ttl > 0:
+            _token_cache.set(cache_key, dict(decoded), ttl=ttl)
         return decoded
 
-    except JWTError as e:
+    except PyJWTError as e:
         logger.error(f"JWT validation error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,86 @@
+# backend/app/db/insert_batcher.py
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.db.supabase_client import supabase, run_query
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+
+class InsertBatcher:
+    """
+    Coalesce concurrent single-row inserts into one bulk INSERT.
+
+    The first caller opens a short window; every row queued before it closes (or
+    until max_batch rows are waiting) goes out in a single PostgREST request, and
+    each caller gets back its own inserted row. Rows must share the same keys.
+    A failed request fails every caller in it; rows are never re-sent one by one.
+    """
+
+    def __init__(self, table: str, window: float = 0.02, max_batch: int = 100) -> None:
+        self.table = table
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Row, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def insert(self, row: Row) -> Row:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        self._schedule()
+        return await future
+
+    def _schedule(self) -> None:
+        if len(self._pending) >= self.max_batch:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._spawn_flush()
+        elif self._pending and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+    def _spawn_flush(self) -> None:
+        task = asyncio.create_task(self._flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        batch = self._pending[:self.max_batch]
+        self._pending = self._pending[self.max_batch:]
+        self._schedule()
+        if not batch:
+            return
+
+        rows = [row for row, _ in batch]
+        try:
+            result = await run_query(supabase.table(self.table).insert(rows))
+            inserted = result.data
+            if len(inserted) != len(batch):
+                raise RuntimeError(f"expected {len(batch)} rows back, got {len(inserted)}")
+        except Exception as e:
+            # The insert is a single statement, but a failure here doesn't prove nothing was
+            # written (lost response, short reply), so re-sending rows could duplicate them.
+            # Every caller in the batch gets the error instead.
+            logger.warning("Batched insert of %s rows into %s failed: %s", len(batch), self.table, e)
+            self._resolve(batch, error=e)
+            return
+
+        logger.debug("Inserted %s rows into %s in one request", len(batch), self.table)
+        for (_, future), row in zip(batch, inserted):
+            if not future.done():
+                future.set_result(row)
+
+    @staticmethod
+    def _resolve(batch: List[Tuple[Row, asyncio.Future]], error: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
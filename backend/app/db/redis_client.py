@@ -0,0 +1,15 @@
+# backend/app/db/redis_client.py
+from typing import Optional
+from redis.asyncio import Redis
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Redis is optional: callers fall back to in-process behaviour when REDIS_URL is unset.
+# from_url() is lazy, so no connection is opened until the first command.
+redis: Optional[Redis] = (
+    Redis.from_url(settings.redis_url, decode_responses=True) if settings.redis_url else None
+)
+
+# Same server, raw bytes in and out, for binary payloads (pickled preprocessing results)
+redis_bytes: Optional[Redis] = Redis.from_url(settings.redis_url) if settings.redis_url else None
@@ -1,7 +1,153 @@
 # backend/app/db/supabase_client.py
-from supabase import create_client
+import asyncio
+from typing import Iterator, Optional
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient as PostgrestSession
+from storage3 import SyncStorageClient
+from storage3.utils import SyncClient as StorageSession
+from supabase import Client, ClientOptions
 from app.core.config import get_settings
+from app.utils.retry import is_transient, is_unsent, with_backoff
 
 settings = get_settings()
-supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
-print(supabase)
+
+# One keep-alive pool per sub-client (PostgREST, storage), so requests reuse
+# sockets instead of paying a TCP + TLS handshake each time
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(10.0)
+
+
+class PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose session uses the shared pool limits"""
+
+    def create_session(self, base_url, headers, timeout, verify=True) -> PostgrestSession:
+        return PostgrestSession(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            follow_redirects=True,
+            http2=True,
+            limits=HTTP_POOL_LIMITS,
+        )
+
+
+class PooledStorageClient(SyncStorageClient):
+    """Storage client whose session uses the shared pool limits"""
+
+    def _create_session(self, base_url, headers, timeout, verify=True) -> StorageSession:
+        return StorageSession(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=bool(verify),
+            follow_redirects=True,
+            http2=True,
+            limits=HTTP_POOL_LIMITS,
+        )
+
+
+class PooledClient(Client):
+    """Supabase client that builds its PostgREST and storage sessions with a tuned keep-alive pool"""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=HTTP_TIMEOUT, verify=True):
+        return PooledPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout, verify=verify)
+
+    @staticmethod
+    def _init_storage_client(storage_url, headers, storage_client_timeout=20, verify=True):
+        # supabase.storage caches the client it gets back, so this session lives for the process
+        return PooledStorageClient(storage_url, headers, storage_client_timeout, verify)
+
+
+supabase = PooledClient(
+    settings.supabase_url,
+    settings.supabase_service_role_key,
+    options=ClientOptions(postgrest_client_timeout=HTTP_TIMEOUT),
+)
+
+
+def _is_plain_insert(query) -> bool:
+    """POST to a table without an on-conflict resolution, i.e. .insert() rather than .upsert() or .rpc()"""
+    prefer = getattr(query, "headers", {}).get("prefer", "")
+    return (
+        getattr(query, "http_method", None) == "POST"
+        and not str(getattr(query, "path", "")).startswith("/rpc/")
+        and "resolution=" not in prefer
+    )
+
+
+async def run_query(query, idempotent: Optional[bool] = None):
+    """Execute a PostgREST query off the event loop, retrying 429/5xx and dropped connections.
+
+    Plain inserts default to idempotent=False: a 5xx or dropped response may arrive after the
+    row was committed, so they're only retried when the request never reached the server.
+    """
+    if idempotent is None:
+        idempotent = not _is_plain_insert(query)
+    return await with_backoff(
+        lambda: asyncio.to_thread(query.execute),
+        retry_if=is_transient if idempotent else is_unsent,
+    )
+
+
+def is_missing_column(exc: Exception) -> bool:
+    """True when PostgREST rejected a write/read for a column the table doesn't have (migration not applied)"""
+    if getattr(exc, "code", None) in ("PGRST204", "42703"):
+        return True
+    message = str(exc)
+    return "column" in message and ("does not exist" in message or "Could not find" in message)
+
+
+async def upload_object(bucket: str, path: str, data: bytes) -> None:
+    """Upload (upsert) a storage object off the event loop, retrying 429/5xx and dropped connections"""
+    await with_backoff(lambda: asyncio.to_thread(
+        supabase.storage.from_(bucket).upload, path, data, {"upsert": "true"}
+    ))
+
+
+async def download_prefix(bucket: str, path: str, nbytes: int) -> tuple[bytes, bool]:
+    """First nbytes of a storage object via a Range request; the flag is True when that's the whole file"""
+
+    def fetch() -> httpx.Response:
+        response = supabase.storage.session.get(
+            f"object/{bucket}/{path}", headers={"Range": f"bytes=0-{nbytes - 1}"}
+        )
+        response.raise_for_status()
+        return response
+
+    response = await with_backoff(lambda: asyncio.to_thread(fetch))
+    if response.status_code != 206:
+        # Range ignored: the server sent the whole object
+        return response.content, True
+    total = response.headers.get("content-range", "").rpartition("/")[2]
+    return response.content, total.isdigit() and int(total) <= len(response.content)
+
+
+async def open_object_stream(bucket: str, path: str, chunk_size: int = 64 * 1024) -> tuple[Iterator[bytes], Optional[str]]:
+    """Start a streamed GET of a storage object: (chunk iterator, Content-Length or None).
+
+    Errors (missing object, auth) are raised here, before any byte is handed to the caller.
+    The iterator closes the connection once exhausted.
+    """
+
+    def open_response() -> httpx.Response:
+        session = supabase.storage.session
+        response = session.send(session.build_request("GET", f"object/{bucket}/{path}"), stream=True)
+        if response.is_error:
+            response.close()
+            response.raise_for_status()
+        return response
+
+    response = await with_backoff(lambda: asyncio.to_thread(open_response))
+
+    def chunks() -> Iterator[bytes]:
+        try:
+            yield from response.iter_bytes(chunk_size)
+        finally:
+            response.close()
+
+    # iter_bytes() decodes gzip etc., so the upstream length is only valid for identity bodies
+    content_length = None if "content-encoding" in response.headers else response.headers.get("content-length")
+    return chunks(), content_length
@@ -0,0 +1,598 @@
+# backend/app/services/analytics_service.py
+"""
+Builds the analytics payloads behind GET /models/{id}/analytics (regression) and
+/models/{id}/classification-analytics. Training calls the same builders once and stores
+the result next to the predictions file, so the endpoints usually just fetch it.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import stats
+
+
+def analytics_sidecar_path(predictions_path: str) -> str:
+    """Storage path of the precomputed analytics JSON for a predictions file."""
+    return predictions_path[:-len(".json")] + ".analytics.json"
+
+
+def _residual_moments(residuals: np.ndarray, outlier_sigmas: float = 3.0) -> Dict[str, float]:
+    """MAE, RMSE, mean, std, skewness, excess kurtosis and outlier count in one pass of work.
+
+    Matches np.std / stats.skew / stats.kurtosis defaults (population, biased), without
+    each of them re-reading the array. Accumulates in float64 even for float32 input.
+    Outliers are residuals more than outlier_sigmas standard deviations from zero.
+    """
+    r = np.asarray(residuals, dtype=np.float64)
+    n = r.size
+    mean = r.mean()
+    d = r - mean
+    d2 = d * d
+    m2 = d2.mean()
+    # dot() reduces without allocating the d**3 / d**4 temporaries
+    m3 = np.dot(d2, d) / n
+    m4 = np.dot(d2, d2) / n
+    std = np.sqrt(m2)
+
+    # Reuse the centred buffer for |r|
+    abs_r = np.abs(r, out=d)
+    constant = m2 == 0
+    return {
+        "mae": float(abs_r.mean()),
+        "rmse": float(np.sqrt(m2 + mean * mean)),
+        "mean": float(mean),
+        "std": float(std),
+        "skewness": float("nan") if constant else float(m3 / m2 ** 1.5),
+        "kurtosis": float("nan") if constant else float(m4 / (m2 * m2) - 3.0),
+        "outlier_count": int(np.count_nonzero(abs_r > outlier_sigmas * float(std))),
+    }
+
+
+def _dagostino_pearson_p(skewness: float, kurtosis: float, n: int) -> float:
+    """p-value of D'Agostino-Pearson K^2 (same as stats.normaltest) from precomputed moments.
+
+    skewness / kurtosis are the biased sample values (kurtosis as excess), as returned by
+    _residual_moments, so the test costs no extra pass over the data. Needs n >= 20.
+    """
+    # Skewness test
+    y = skewness * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+    beta2 = 3.0 * (n * n + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = 1.0 if y == 0 else y
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+    # Kurtosis test
+    b2 = kurtosis + 3.0
+    expected = 3.0 * (n - 1) / (n + 1)
+    var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+    x = (b2 - expected) / np.sqrt(var_b2)
+    sqrt_beta1 = 6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) * np.sqrt(6.0 * (n + 3) * (n + 5) / (n * (n - 2) * (n - 3)))
+    a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+    denom = 1 + x * np.sqrt(2 / (a - 4.0))
+    if denom == 0:
+        return float("nan")
+    term2 = np.sign(denom) * ((1 - 2.0 / a) / abs(denom)) ** (1 / 3.0)
+    z_kurt = (1 - 2 / (9.0 * a) - term2) / np.sqrt(2 / (9.0 * a))
+
+    # chi-squared survival function with 2 degrees of freedom
+    return float(np.exp(-(z_skew ** 2 + z_kurt ** 2) / 2))
+
+
+def _stratified_sample_indices(residuals: np.ndarray, sample_size: int, strata: int = 10) -> np.ndarray:
+    """Sorted indices of a residual-stratified sample (Neyman allocation across quantile strata).
+
+    Strata with wider residual spread (the tails) get proportionally more points than a
+    uniform stride would give them, so outliers stay visible on the chart. Seeded, so the
+    same predictions always produce the same sample.
+    """
+    r = np.asarray(residuals, dtype=np.float64)
+    edges = np.quantile(r, np.linspace(0, 1, strata + 1))
+    labels = np.searchsorted(edges[1:-1], r, side="right")
+
+    counts = np.bincount(labels, minlength=strata)
+    sums = np.bincount(labels, weights=r, minlength=strata)
+    sq_sums = np.bincount(labels, weights=r * r, minlength=strata)
+    safe_counts = np.maximum(counts, 1)
+    stds = np.sqrt(np.maximum(sq_sums / safe_counts - (sums / safe_counts) ** 2, 0.0))
+
+    # N_h * S_h; fall back to proportional allocation when every stratum is constant
+    weights = counts * stds
+    if weights.sum() == 0:
+        weights = counts.astype(np.float64)
+    alloc = np.minimum(counts, np.floor(sample_size * weights / weights.sum()).astype(int))
+
+    # Hand out the rounding remainder, heaviest strata first, within each stratum's size
+    remaining = sample_size - int(alloc.sum())
+    for k in np.argsort(-weights, kind="stable"):
+        if remaining <= 0:
+            break
+        extra = min(remaining, int(counts[k] - alloc[k]))
+        alloc[k] += extra
+        remaining -= extra
+
+    rng = np.random.default_rng(0)
+    order = np.argsort(labels, kind="stable")
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    chosen = [
+        rng.choice(order[bounds[k]:bounds[k + 1]], size=alloc[k], replace=False)
+        for k in range(strata) if alloc[k] > 0
+    ]
+    return np.sort(np.concatenate(chosen))
+
+
+def build_regression_analytics(
+        arrays: np.ndarray,
+        r2: float,
+        sample_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Chart points (sampled if needed), residual statistics and interpretation for a regression model.
+
+    arrays is the (3, n) actual / predicted / residuals block, as stored in the .npy sidecar.
+    """
+    r2 = float(r2)
+    actual, predicted, residuals = arrays
+    n_samples = len(actual)
+
+    # Smart sampling for large datasets
+    if sample_size is None:
+        # Auto-determine sample size based on data size
+        if n_samples > 1000:
+            sample_size = min(500, n_samples)
+        else:
+            sample_size = n_samples
+
+    # Stratified on residual magnitude to preserve the distribution; only the chart points are
+    # sampled, the statistics below are vectorized over the full arrays
+    if n_samples > sample_size:
+        # One gather across all three rows
+        sample = arrays[:, _stratified_sample_indices(residuals, sample_size)]
+    else:
+        sample = arrays
+    actual_sample, predicted_sample, residuals_sample = sample
+
+    # Calculate comprehensive statistics
+
+    # Basic metrics and residual statistics, from one set of moments
+    moments = _residual_moments(residuals)
+    mae = moments["mae"]
+    rmse = moments["rmse"]
+
+    residual_mean = moments["mean"]
+    residual_std = moments["std"]
+    residual_skewness = moments["skewness"]
+    residual_kurtosis = moments["kurtosis"]
+
+    # Normality test: D'Agostino-Pearson from the moments above (O(n), no extra pass);
+    # Shapiro-Wilk only for samples too small for K^2
+    normality_p_value = 0.0
+    try:
+        if n_samples >= 20:
+            normality_p_value = _dagostino_pearson_p(residual_skewness, residual_kurtosis, n_samples)
+        else:
+            _, normality_p_value = stats.shapiro(residuals)
+            normality_p_value = float(normality_p_value)
+        if not np.isfinite(normality_p_value):
+            normality_p_value = 0.0
+    except Exception:
+        normality_p_value = 0.0
+
+    # Calculate prediction intervals (95% confidence)
+    margin = float(1.96 * residual_std)
+
+    # Domain range for perfect prediction line
+    min_val = float(min(actual.min(), predicted.min()))
+    max_val = float(max(actual.max(), predicted.max()))
+    padding = (max_val - min_val) * 0.05
+
+    # Outliers (beyond 3 standard deviations) were counted with the moments
+    outlier_threshold = 3 * residual_std
+    outlier_count = moments["outlier_count"]
+
+    # Prepare chart data - tolist() converts to native Python types in one pass,
+    # and the outlier flag is a mask over the sampled residuals themselves
+    outlier_mask_sample = np.abs(residuals_sample) > outlier_threshold
+    scatter_data = [
+        {
+            "actual": a,
+            "predicted": p,
+            "residual": r,
+            "is_outlier": o
+        }
+        for (a, p, r), o in zip(sample.T.tolist(), outlier_mask_sample.tolist())
+    ]
+
+    # Residual distribution bins (for histogram overlay). Equal-width bins already take numpy's
+    # arithmetic binning path (no digitize/searchsorted); a searchsorted rewrite measured slower
+    hist, bin_edges = np.histogram(residuals, bins=30, density=True)
+    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    residual_distribution = [
+        {"bin_center": c, "density": d}
+        for c, d in zip(bin_centers.tolist(), hist.tolist())
+    ]
+
+    # Performance interpretation
+    interpretation = _interpret_regression_performance(r2, mae, rmse, residual_mean, normality_p_value)
+
+    return {
+        "has_data": True,
+        "sample_info": {
+            "total_samples": int(n_samples),
+            "displayed_samples": int(len(scatter_data)),
+            "is_sampled": n_samples > len(scatter_data)
+        },
+        "scatter_data": scatter_data,
+        "residual_distribution": residual_distribution,
+        "domain": {
+            "min": float(min_val - padding),
+            "max": float(max_val + padding)
+        },
+        "statistics": {
+            "r2_score": r2,
+            "mae": mae,
+            "rmse": rmse,
+            "residual_mean": residual_mean,
+            "residual_std": residual_std,
+            "residual_skewness": residual_skewness,
+            "residual_kurtosis": residual_kurtosis,
+            "normality_p_value": normality_p_value,
+            "prediction_margin": margin,
+            "outlier_count": outlier_count,
+            "outlier_percentage": float(outlier_count / n_samples * 100)
+        },
+        "interpretation": interpretation
+    }
+
+
+# R² bands for the interpretation text, checked top-down; below the last band is "poor"
+_R2_BANDS = (
+    (0.9, "excellent", "explains over 90% of variance"),
+    (0.7, "strong", "captures most patterns effectively"),
+    (0.5, "moderate", "identifies significant patterns"),
+    (0.3, "weak", "provides limited predictive value"),
+)
+
+
+def _interpret_regression_performance(
+        r2: float,
+        mae: float,
+        rmse: float,
+        residual_mean: float,
+        normality_p: float
+) -> Dict[str, Any]:
+    """Generate human-readable interpretation of model performance."""
+    # The text only depends on which side of each threshold the metrics fall, so it's
+    # built once per combination of outcomes and reused
+    band = next((i for i, (threshold, _, _) in enumerate(_R2_BANDS) if r2 > threshold), len(_R2_BANDS))
+    r2_quality, r2_message, has_bias, bias_direction, is_normal, issues, recommendations = _regression_interpretation(
+        band,
+        r2 < 0.5,
+        r2 < 0.7,
+        r2 > 0.8,
+        bool(abs(residual_mean) > rmse * 0.1),
+        bool(residual_mean > 0),
+        bool(normality_p > 0.05),
+        bool(mae > rmse * 0.8)
+    )
+
+    return {
+        "r2_quality": r2_quality,
+        "r2_message": r2_message,
+        "has_bias": has_bias,
+        "bias_direction": bias_direction,
+        "residuals_normal": is_normal,
+        "issues": list(issues),
+        "recommendations": list(recommendations)
+    }
+
+
+@lru_cache(maxsize=256)
+def _regression_interpretation(
+        band: int,
+        low_r2: bool,
+        below_target_r2: bool,
+        high_r2: bool,
+        has_bias: bool,
+        overestimates: bool,
+        is_normal: bool,
+        large_errors: bool
+) -> Tuple:
+    """Interpretation text for one combination of threshold outcomes (cached; returns tuples)."""
+    r2_quality, r2_message = _R2_BANDS[band][1:] if band < len(_R2_BANDS) else (
+        "poor", "struggles to capture patterns")
+    bias_direction = "overestimates" if overestimates else "underestimates"
+
+    # Overall assessment
+    issues = []
+    if low_r2:
+        issues.append("Low R² indicates room for improvement")
+    if has_bias:
+        issues.append(f"Model systematically {bias_direction} (bias detected)")
+    if not is_normal:
+        issues.append("Residuals not normally distributed (check for patterns)")
+    if large_errors:
+        issues.append("Large errors present (check for outliers)")
+
+    return (
+        r2_quality,
+        r2_message,
+        has_bias,
+        bias_direction if has_bias else None,
+        is_normal,
+        tuple(issues),
+        tuple(_generate_recommendations(below_target_r2, high_r2, has_bias, is_normal))
+    )
+
+
+def _generate_recommendations(below_target_r2: bool, high_r2: bool, has_bias: bool, is_normal: bool) -> List[str]:
+    """Generate actionable recommendations based on performance."""
+    recommendations = []
+
+    if below_target_r2:
+        recommendations.append("Consider feature engineering or trying different algorithms")
+
+    if has_bias:
+        recommendations.append("Investigate systematic prediction bias - check for missing features")
+
+    if not is_normal:
+        recommendations.append("Non-normal residuals suggest non-linear patterns - try polynomial features")
+
+    if high_r2:
+        recommendations.append("Model performs well - ready for production use")
+
+    return recommendations
+
+
+def _per_class_scores(cm: np.ndarray):
+    """Per-class precision, recall, F1 and support read off a confusion matrix.
+
+    Same values as precision_recall_fscore_support(..., zero_division=0) over the matrix's
+    labels, without another pass over the label arrays.
+    """
+    tp = np.diag(cm).astype(np.float64)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+
+    def divide(numerator, denominator):
+        out = np.zeros_like(numerator)
+        np.divide(numerator, denominator, out=out, where=denominator != 0)
+        return out
+
+    precision = divide(tp, predicted.astype(np.float64))
+    recall = divide(tp, support.astype(np.float64))
+    f1 = divide(2 * tp, (support + predicted).astype(np.float64))
+    return precision, recall, f1, support
+
+
+def build_classification_analytics(
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        overall_metrics: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Confusion matrix, per-class metrics, class distribution and interpretation for a classifier."""
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+
+    # Encode labels to class indices once; the confusion matrix is a bincount over index pairs,
+    # so the labels are never looked up again
+    classes, codes = np.unique(np.concatenate([y_true, y_pred]), return_inverse=True)
+    n_classes = len(classes)
+    true_codes, pred_codes = codes[:len(y_true)], codes[len(y_true):]
+    cm = np.bincount(true_codes * n_classes + pred_codes, minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+    # Convert once to native Python values; the payload below is built from plain lists
+    class_labels = [str(c) for c in classes.tolist()]
+    cm_rows = cm.tolist()
+
+    # Build confusion matrix data for frontend
+    confusion_matrix_data = [
+        {
+            "actual": actual_class,
+            "predicted": predicted_class,
+            "count": count,
+            "is_correct": i == j
+        }
+        for i, (actual_class, row) in enumerate(zip(class_labels, cm_rows))
+        for j, (predicted_class, count) in enumerate(zip(class_labels, row))
+    ]
+
+    # Calculate per-class metrics
+    precision, recall, f1, support = _per_class_scores(cm)
+    support_list = support.tolist()
+
+    class_metrics = [
+        {
+            "class": class_label,
+            "precision": p,
+            "recall": r,
+            "f1_score": f,
+            "support": n
+        }
+        for class_label, p, r, f, n in zip(
+            class_labels, precision.tolist(), recall.tolist(), f1.tolist(), support_list
+        )
+    ]
+
+    # Calculate additional insights
+    # Straight off the confusion matrix instead of re-comparing the label arrays
+    total_predictions = int(cm.sum())
+    correct_predictions = int(np.trace(cm))
+    accuracy = float(correct_predictions / total_predictions)
+
+    # Most confused pairs: off-diagonal non-zero cells, top 5 by count (ties keep row-major order)
+    off_diagonal = (cm > 0) & ~np.eye(n_classes, dtype=bool)
+    pair_rows, pair_cols = np.nonzero(off_diagonal)
+    pair_counts = cm[pair_rows, pair_cols]
+    candidates = np.arange(pair_counts.size)
+    if pair_counts.size > 5:
+        # Partition instead of sorting every pair: everything above the 5th-largest count,
+        # then the first ties at that count, so the result matches a stable full sort
+        fifth = np.partition(pair_counts, pair_counts.size - 5)[pair_counts.size - 5]
+        above = np.flatnonzero(pair_counts > fifth)
+        ties = np.flatnonzero(pair_counts == fifth)[:5 - above.size]
+        candidates = np.sort(np.concatenate([above, ties]))
+    top = candidates[np.argsort(-pair_counts[candidates], kind="stable")]
+    row_totals = cm.sum(axis=1).tolist()
+    top_confusions = [
+        {
+            "actual": class_labels[i],
+            "predicted": class_labels[j],
+            "count": cm_rows[i][j],
+            "percentage": cm_rows[i][j] / row_totals[i] * 100
+        }
+        for i, j in zip(pair_rows[top].tolist(), pair_cols[top].tolist())
+    ]
+
+    # Class distribution
+    class_distribution = [
+        {
+            "class": class_label,
+            "count": class_count,
+            "percentage": class_count / total_predictions * 100
+        }
+        for class_label, class_count in zip(class_labels, support_list)
+    ]
+
+    # Performance interpretation
+    interpretation = _interpret_classification_performance(
+        overall_metrics.get("accuracy", 0),
+        overall_metrics.get("f1_score", 0),
+        precision,
+        recall,
+        f1,
+        class_labels
+    )
+
+    return {
+        "has_data": True,
+        "confusion_matrix": confusion_matrix_data,
+        "class_metrics": class_metrics,
+        "overall_metrics": {
+            "accuracy": accuracy,
+            "precision": float(overall_metrics.get("precision", 0)),
+            "recall": float(overall_metrics.get("recall", 0)),
+            "f1_score": float(overall_metrics.get("f1_score", 0)),
+            "total_predictions": total_predictions,
+            "correct_predictions": correct_predictions,
+            "n_classes": n_classes
+        },
+        "class_distribution": class_distribution,
+        "top_confusions": top_confusions,
+        "interpretation": interpretation
+    }
+
+
+def _interpret_classification_performance(
+        accuracy: float,
+        f1_score: float,
+        precision: np.ndarray,
+        recall: np.ndarray,
+        f1: np.ndarray,
+        class_labels: List[str]
+) -> Dict[str, Any]:
+    """Generate human-readable interpretation of classification performance."""
+
+    # Check for class imbalance issues
+    precision_std = float(np.std(precision))
+    recall_std = float(np.std(recall))
+    f1_std = float(np.std(f1))
+
+    # Find worst and best performing classes (first one wins on ties)
+    worst = int(np.argmin(f1))
+    best = int(np.argmax(f1))
+
+    # Everything below only depends on threshold outcomes and the rounded numbers shown
+    # in the text, so it's built once per combination and reused
+    quality, quality_message, has_imbalance, issues, recommendations = _classification_interpretation(
+        accuracy > 0.95 and f1_score > 0.95,
+        accuracy > 0.85 and f1_score > 0.85,
+        accuracy > 0.75,
+        accuracy > 0.6,
+        accuracy < 0.8,
+        f"{accuracy * 100:.1f}",
+        precision_std > 0.2 or recall_std > 0.2,
+        f"{f1_std:.2f}",
+        class_labels[worst],
+        f"{float(f1[worst]):.2f}",
+        f1_score < 0.7,
+        recall_std > 0.2
+    )
+
+    return {
+        "quality": quality,
+        "quality_message": quality_message,
+        "has_imbalance": has_imbalance,
+        "worst_class": class_labels[worst],
+        "best_class": class_labels[best],
+        "issues": list(issues),
+        "recommendations": list(recommendations),
+        "balance_score": float(1 - f1_std)  # Higher is better (0-1)
+    }
+
+
+@lru_cache(maxsize=1024)
+def _classification_interpretation(
+        excellent: bool,
+        strong: bool,
+        good: bool,
+        moderate: bool,
+        low_accuracy: bool,
+        accuracy_pct: str,
+        has_imbalance: bool,
+        f1_std: str,
+        worst_class: str,
+        worst_f1: str,
+        low_f1: bool,
+        recall_spread: bool
+) -> Tuple:
+    """Interpretation text for one combination of threshold outcomes (cached; returns tuples)."""
+
+    # Overall quality assessment
+    if excellent:
+        quality = "excellent"
+        quality_message = "achieves exceptional performance across all classes"
+    elif strong:
+        quality = "strong"
+        quality_message = "performs very well with good balance"
+    elif good:
+        quality = "good"
+        quality_message = "shows solid performance"
+    elif moderate:
+        quality = "moderate"
+        quality_message = "provides reasonable classification"
+    else:
+        quality = "weak"
+        quality_message = "struggles with classification accuracy"
+
+    # Generate issues
+    issues = []
+    if low_accuracy:
+        issues.append(f"Overall accuracy of {accuracy_pct}% suggests room for improvement")
+
+    if has_imbalance:
+        issues.append(f"Significant performance variance across classes (std: {f1_std})")
+        issues.append(
+            f"Class '{worst_class}' has notably lower performance (F1: {worst_f1})")
+
+    if low_f1:
+        issues.append("F1-score indicates imbalance between precision and recall")
+
+    # Generate recommendations
+    recommendations = []
+
+    if has_imbalance:
+        recommendations.append(
+            f"Focus on improving '{worst_class}' class - consider oversampling or class weights")
+
+    if low_accuracy:
+        recommendations.append("Try ensemble methods or feature engineering to boost performance")
+
+    if recall_spread:
+        recommendations.append(
+            "High recall variance suggests some classes are harder to detect - review training data balance")
+
+    if not recommendations:
+        recommendations.append("Model performs well - monitor performance on new data")
+
+    return quality, quality_message, bool(has_imbalance), tuple(issues), tuple(recommendations)
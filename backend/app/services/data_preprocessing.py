@@ -2,16 +2,30 @@
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, OneHotEncoder, TargetEncoder
+from sklearn.preprocessing import OneHotEncoder, TargetEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from sklearn.impute import SimpleImputer
 from sklearn.feature_selection import VarianceThreshold
-from typing import Tuple, Dict, Any
+from sklearn.base import BaseEstimator, TransformerMixin, OneToOneFeatureMixin
+from sklearn.utils.validation import check_is_fitted, validate_data
+from typing import Tuple, Dict, Any, Optional
+import asyncio
+import hashlib
 import io
-import traceback
-from app.db.supabase_client import supabase
-from app.utils.data_validation import DataValidator, DatasetHealthReport
+import pickle
+import logging
+import warnings
+import zlib
+from app.db.redis_client import redis_bytes
+from app.db.supabase_client import supabase, open_object_stream
+from app.utils.file_utils import ChunkedReader
+from app.utils.ttl_cache import TTLCache
+from app.utils.data_validation import DatasetHealthReport, default_validator
+
+logger = logging.getLogger(__name__)
+
+# dtype of the processed feature matrices; saved with each model so prediction inputs match
+FEATURE_DTYPE = np.float32
 
 
 class DataPreprocessingError(Exception):
@@ -19,12 +33,64 @@ class DataPreprocessingError(Exception):
     pass
 
 
+class MedianImputeScaler(OneToOneFeatureMixin, TransformerMixin, BaseEstimator):
+    """
+    Median imputation followed by standardization, in one transformer.
+
+    Same result as Pipeline([SimpleImputer(strategy="median"), StandardScaler()]), but the
+    mean/std of the imputed columns are derived from the observed values and the missing
+    count, and transform works in a single output buffer instead of materializing the
+    imputed matrix first.
+    """
+
+    def fit(self, X, y=None):
+        X = validate_data(self, X, dtype=np.float64, ensure_all_finite="allow-nan")
+        missing = np.isnan(X)
+        n_missing = missing.sum(axis=0)
+        n_samples = X.shape[0]
+
+        with warnings.catch_warnings():
+            # All-NaN columns warn here; they're handled just below
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median = np.nanmedian(X, axis=0) if n_missing.any() else np.median(X, axis=0)
+        # All-missing columns are removed before the pipeline is built; impute 0 if one slips through
+        median = np.where(n_missing == n_samples, 0.0, median)
+
+        # Moments of the imputed column: observed values plus n_missing copies of the median
+        observed = np.where(missing, 0.0, X)
+        mean = (observed.sum(axis=0) + n_missing * median) / n_samples
+        np.subtract(observed, mean, out=observed)
+        observed[missing] = 0.0
+        var = (np.einsum("ij,ij->j", observed, observed) + n_missing * (median - mean) ** 2) / n_samples
+
+        scale = np.sqrt(var)
+        # Constant columns are left unscaled, as StandardScaler does
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+
+        self.statistics_ = median
+        self.mean_ = mean
+        self.var_ = var
+        self.scale_ = scale
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, "scale_")
+        X = validate_data(self, X, dtype=np.float64, ensure_all_finite="allow-nan", reset=False, copy=True)
+        missing = np.isnan(X)
+        X -= self.mean_
+        X /= self.scale_
+        if missing.any():
+            # Missing entries become the standardized median of their column
+            X[missing] = np.broadcast_to((self.statistics_ - self.mean_) / self.scale_, X.shape)[missing]
+        return X
+
+
 class DataPreprocessing:
     def __init__(self):
         self.preprocessor = None
         self.feature_names = None
         self.removed_features = []
-        self.validator = DataValidator()
+        self.validator = default_validator
 
     def build_pipeline(
             self,
@@ -35,7 +101,7 @@ class DataPreprocessing:
         """
         Builds preprocessing pipeline dynamically with robust type detection.
         """
-        print(f"\n[Preprocessing] Building pipeline for {X.shape[1]} features...")
+        logger.debug("Building pipeline for %d features", X.shape[1])
 
         # DEFENSE: Ensure all column names are strings
         X.columns = X.columns.astype(str)
@@ -44,103 +110,85 @@ class DataPreprocessing:
         numeric_features = []
         categorical_features = []
 
-        for col in X.columns:
-            col_data = X[col].dropna()
+        # One vectorized null count for every column instead of a dropna() copy per column
+        non_null_counts = X.notna().sum()
 
-            if len(col_data) == 0:
-                print(f"  ⚠️  Column '{col}' is all null, skipping")
+        for col in X.columns:
+            if non_null_counts[col] == 0:
+                logger.warning("Column '%s' is all null, skipping", col)
                 self.removed_features.append(col)
                 continue
 
-            # Try numeric conversion
-            try:
-                numeric_converted = pd.to_numeric(col_data, errors='coerce')
-                conversion_rate = numeric_converted.notna().sum() / len(col_data)
-
-                # If >80% can be numeric, treat as numeric
-                if conversion_rate > 0.8:
-                    numeric_features.append(col)
-                    continue
-            except:
-                pass
-
-            # Otherwise categorical
-            categorical_features.append(col)
-
-        print(f"  ✓ Identified: {len(numeric_features)} numeric, {len(categorical_features)} categorical")
+            if self._is_numeric_column(X[col], int(non_null_counts[col])):
+                numeric_features.append(col)
+            else:
+                categorical_features.append(col)
 
-        # DEFENSE: Remove zero-variance columns
-        if variance_threshold > 0 and numeric_features:
-            try:
-                numeric_data = X[numeric_features].apply(pd.to_numeric, errors='coerce')
-                numeric_variances = numeric_data.var()
-                low_variance_cols = numeric_variances[numeric_variances <= variance_threshold].index.tolist()
-
-                if low_variance_cols:
-                    print(f"  ⚠️  Removing {len(low_variance_cols)} low-variance numeric features")
-                    numeric_features = [col for col in numeric_features if col not in low_variance_cols]
-                    self.removed_features.extend(low_variance_cols)
-            except Exception as e:
-                print(f"  ⚠️  Variance threshold check failed: {e}")
+        logger.debug("Identified: %d numeric, %d categorical", len(numeric_features), len(categorical_features))
 
         # DEFENSE: Separate high/low cardinality categoricals
         high_cardinality_cats = []
         low_cardinality_cats = []
 
-        for col in categorical_features:
+        if categorical_features:
+            # Unique counts for all categoricals in one call; per column only if that fails
             try:
-                n_unique = X[col].nunique()
-                n_samples = len(X[col].dropna())
-
-                # DEFENSE: Drop if too many unique values (likely ID column)
-                if n_unique > 1000 or n_unique == n_samples:
-                    print(f"  ⚠️  Dropping '{col}': too many unique values ({n_unique})")
-                    self.removed_features.append(col)
-                    continue
-
-                if n_unique > 50 or (n_unique / n_samples) > 0.5:
-                    high_cardinality_cats.append(col)
-                else:
-                    low_cardinality_cats.append(col)
-            except Exception as e:
-                print(f"  ⚠️  Error analyzing '{col}': {e}, dropping")
-                self.removed_features.append(col)
+                n_unique = X[categorical_features].nunique(dropna=True)
+            except Exception:
+                counts = {}
+                for col in categorical_features:
+                    try:
+                        counts[col] = X[col].nunique()
+                    except Exception as e:
+                        logger.warning("Error analyzing '%s': %s, dropping", col, e)
+                        self.removed_features.append(col)
+                n_unique = pd.Series(counts, dtype="int64")
+
+            n_samples = non_null_counts[n_unique.index]
+
+            # DEFENSE: Drop if too many unique values (likely ID column)
+            drop_mask = (n_unique > 1000) | (n_unique == n_samples)
+            high_mask = ~drop_mask & ((n_unique > 50) | (n_unique / n_samples > 0.5))
+
+            for col, count in n_unique[drop_mask].items():
+                logger.warning("Dropping '%s': too many unique values (%d)", col, count)
+            self.removed_features.extend(n_unique.index[drop_mask].tolist())
+            high_cardinality_cats = n_unique.index[high_mask].tolist()
+            low_cardinality_cats = n_unique.index[~drop_mask & ~high_mask].tolist()
 
         transformers = []
 
         # Numeric pipeline with robust imputation
         if numeric_features:
-            numeric_transformer = Pipeline(steps=[
-                ("imputer", SimpleImputer(strategy="median")),
-                ("scaler", StandardScaler())
-            ])
+            numeric_transformer = MedianImputeScaler()
+            # DEFENSE: Remove low-variance columns; dropped names are recorded after the fit
+            if variance_threshold > 0:
+                numeric_transformer = Pipeline(steps=[
+                    ("variance", VarianceThreshold(threshold=variance_threshold)),
+                    ("scaler", numeric_transformer)
+                ])
             transformers.append(("num", numeric_transformer, numeric_features))
 
         # Low cardinality categorical pipeline
+        # The encoders treat missing values as their own category, so no imputer step (and no
+        # object-array copy) is needed in front of them. No category-dtype cast either: the
+        # encoder validates to an object array regardless, and the cast would have to be
+        # repeated on every prediction input
         if low_cardinality_cats:
-            categorical_transformer = Pipeline(steps=[
-                ("imputer", SimpleImputer(strategy="constant", fill_value="missing")),
-                ("encoder", OneHotEncoder(handle_unknown="ignore", sparse_output=False, max_categories=100))
-            ])
+            categorical_transformer = OneHotEncoder(handle_unknown="ignore", sparse_output=True, max_categories=100)
             transformers.append(("cat_low", categorical_transformer, low_cardinality_cats))
 
         # High cardinality categorical pipeline with safety limits
         if high_cardinality_cats:
             if use_target_encoder:
-                high_card_transformer = Pipeline(steps=[
-                    ("imputer", SimpleImputer(strategy="constant", fill_value="missing")),
-                    ("encoder", TargetEncoder(target_type='auto', smooth='auto'))
-                ])
+                high_card_transformer = TargetEncoder(target_type='auto', smooth='auto')
             else:
                 # DEFENSE: Limit to top 50 categories to prevent memory issues
-                high_card_transformer = Pipeline(steps=[
-                    ("imputer", SimpleImputer(strategy="constant", fill_value="missing")),
-                    ("encoder", OneHotEncoder(
-                        handle_unknown="ignore",
-                        max_categories=50,
-                        sparse_output=False
-                    ))
-                ])
+                high_card_transformer = OneHotEncoder(
+                    handle_unknown="ignore",
+                    max_categories=50,
+                    sparse_output=True
+                )
             transformers.append(("cat_high", high_card_transformer, high_cardinality_cats))
 
         if not transformers:
@@ -150,14 +198,35 @@ class DataPreprocessing:
             )
 
         # Build preprocessor
+        # One-hot blocks are sparse; the combined output stays sparse (CSR) whenever it is under
+        # 30% non-zero, which every model in the registry and the AutoML estimators accept
         self.preprocessor = ColumnTransformer(
             transformers=transformers,
             remainder='drop',
+            sparse_threshold=0.3,
             verbose_feature_names_out=False
         )
 
         return self.preprocessor
 
+    # infer_dtype results for object columns whose values are all numbers
+    _NUMERIC_INFERRED_TYPES = {"integer", "floating", "decimal", "mixed-integer-float"}
+
+    def _is_numeric_column(self, series: pd.Series, non_null_count: int) -> bool:
+        """Treat a column as numeric if >80% of its non-null values parse as numbers"""
+        # Numeric dtypes and all-number object columns are decided without converting anything
+        if pd.api.types.is_numeric_dtype(series):
+            return True
+        if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in self._NUMERIC_INFERRED_TYPES:
+            return True
+
+        # Strings, mixed values, dates: fall back to trying the conversion
+        try:
+            numeric_converted = pd.to_numeric(series.dropna(), errors='coerce')
+            return numeric_converted.notna().sum() / non_null_count > 0.8
+        except:
+            return False
+
     def preprocess_data(
             self,
             df: pd.DataFrame,
@@ -171,12 +240,10 @@ class DataPreprocessing:
         ROBUST preprocessing with comprehensive validation and error handling.
         """
         try:
-            print("\n" + "=" * 60)
-            print("🛡️  STARTING ROBUST PREPROCESSING")
-            print("=" * 60)
+            logger.debug("Starting robust preprocessing")
 
             # STEP 1: Validate and clean dataset
-            print("\n📋 Step 1: Dataset Validation & Cleaning")
+            logger.debug("Step 1: dataset validation & cleaning")
             cleaned_df, health_report = self.validator.validate_and_clean(df, target_col)
 
             # DEFENSE: Check if target column survived cleaning
@@ -187,25 +254,26 @@ class DataPreprocessing:
                 )
 
             # STEP 2: Separate features and target
-            print(f"\n📋 Step 2: Separating features and target")
+            logger.debug("Step 2: separating features and target")
             X = cleaned_df.drop(columns=[target_col])
             y = cleaned_df[target_col]
 
-            print(f"  ✓ Features shape: {X.shape}")
-            print(f"  ✓ Target shape: {y.shape}")
-            print(f"  ✓ Target dtype: {y.dtype}")
+            logger.debug("Features shape: %s, target shape: %s, target dtype: %s", X.shape, y.shape, y.dtype)
 
             # DEFENSE: Final target validation
             if y.isnull().all():
                 raise DataPreprocessingError("Target column contains only null values")
 
             # Remove remaining null targets
-            if y.isnull().any():
-                null_count = y.isnull().sum()
-                valid_mask = ~y.isnull()
-                X = X[valid_mask].reset_index(drop=True)
-                y = y[valid_mask].reset_index(drop=True)
-                print(f"  ⚠️  Removed {null_count} rows with null targets")
+            # (Indexes are left as-is: train_test_split shuffles them anyway, so resetting
+            # would only copy X and y a second time)
+            null_mask = y.isnull()
+            null_count = int(null_mask.sum())
+            if null_count:
+                valid_mask = ~null_mask
+                X = X[valid_mask]
+                y = y[valid_mask]
+                logger.warning("Removed %d rows with null targets", null_count)
 
             # DEFENSE: Check minimum samples
             if len(X) < 10:
@@ -214,19 +282,19 @@ class DataPreprocessing:
                 )
 
             # STEP 3: Detect problem type
-            print(f"\n📋 Step 3: Problem Type Detection")
+            logger.debug("Step 3: problem type detection")
             problem_type = health_report.recommended_problem_type or self._detect_problem_type(y)
-            print(f"  ✓ Detected problem type: {problem_type}")
+            logger.debug("Detected problem type: %s", problem_type)
 
             # STEP 4: Split dataset
-            print(f"\n📋 Step 4: Train/Test Split ({test_size * 100:.0f}% test)")
+            logger.debug("Step 4: train/test split (%.0f%% test)", test_size * 100)
 
             # DEFENSE: Adjust test_size if dataset is small
             min_test_samples = 5
             if len(X) * test_size < min_test_samples:
                 old_test_size = test_size
                 test_size = max(min_test_samples / len(X), 0.1)
-                print(f"  ⚠️  Adjusted test_size from {old_test_size} to {test_size} (small dataset)")
+                logger.warning("Adjusted test_size from %s to %s (small dataset)", old_test_size, test_size)
 
             # DEFENSE: Stratification for classification
             stratify = None
@@ -235,9 +303,9 @@ class DataPreprocessing:
                     unique_classes = y.nunique()
                     if unique_classes < 20:
                         stratify = y
-                        print(f"  ✓ Using stratification ({unique_classes} classes)")
+                        logger.debug("Using stratification (%d classes)", unique_classes)
                 except Exception as e:
-                    print(f"  ⚠️  Stratification not possible: {e}")
+                    logger.warning("Stratification not possible: %s", e)
 
             try:
                 X_train, X_test, y_train, y_test = train_test_split(
@@ -248,18 +316,17 @@ class DataPreprocessing:
                 )
             except ValueError as e:
                 # Fallback without stratification
-                print(f"  ⚠️  Split with stratification failed: {e}")
-                print(f"  🔄 Retrying without stratification")
+                logger.warning("Split with stratification failed: %s; retrying without stratification", e)
                 X_train, X_test, y_train, y_test = train_test_split(
                     X, y,
                     test_size=test_size,
                     random_state=random_state
                 )
 
-            print(f"  ✓ Train: {len(X_train)} samples, Test: {len(X_test)} samples")
+            logger.debug("Train: %d samples, Test: %d samples", len(X_train), len(X_test))
 
             # STEP 5: Build preprocessing pipeline
-            print(f"\n📋 Step 5: Building Preprocessing Pipeline")
+            logger.debug("Step 5: building preprocessing pipeline")
             preprocessor = self.build_pipeline(
                 X_train,
                 use_target_encoder=use_target_encoder,
@@ -267,30 +334,28 @@ class DataPreprocessing:
             )
 
             # STEP 6: Fit and transform with error handling
-            print(f"\n📋 Step 6: Fitting and Transforming Data")
+            logger.debug("Step 6: fitting and transforming data")
 
             try:
-                print(f"  🔄 Fitting preprocessor on training data...")
-                X_train_processed = preprocessor.fit_transform(X_train, y_train)
-                print(f"  ✓ Training data transformed: {X_train_processed.shape}")
+                # float32 halves the matrix; models here don't need float64 precision on scaled features
+                X_train_processed = preprocessor.fit_transform(X_train, y_train).astype(FEATURE_DTYPE, copy=False)
+                logger.debug("Training data transformed: %s", X_train_processed.shape)
             except Exception as e:
-                print(f"  ❌ Fit/transform failed: {e}")
-                traceback.print_exc()
+                logger.exception("Fit/transform failed: %s", e)
                 raise DataPreprocessingError(f"Preprocessing fit failed: {str(e)}")
 
             try:
-                print(f"  🔄 Transforming test data...")
-                X_test_processed = preprocessor.transform(X_test)
-                print(f"  ✓ Test data transformed: {X_test_processed.shape}")
+                X_test_processed = preprocessor.transform(X_test).astype(FEATURE_DTYPE, copy=False)
+                logger.debug("Test data transformed: %s", X_test_processed.shape)
             except Exception as e:
-                print(f"  ❌ Test transform failed: {e}")
-                traceback.print_exc()
+                logger.exception("Test transform failed: %s", e)
                 raise DataPreprocessingError(f"Test data transform failed: {str(e)}")
 
             # STEP 7: Extract feature names
-            print(f"\n📋 Step 7: Extracting Feature Names")
+            logger.debug("Step 7: extracting feature names")
+            self._record_low_variance_features(preprocessor)
             self.feature_names = self._get_feature_names(preprocessor, X_train)
-            print(f"  ✓ Generated {len(self.feature_names)} feature names")
+            logger.debug("Generated %d feature names", len(self.feature_names))
 
             # STEP 8: Generate metadata
             metadata = {
@@ -310,23 +375,19 @@ class DataPreprocessing:
                 }
             }
 
-            print("\n" + "=" * 60)
-            print("✅ PREPROCESSING COMPLETE")
-            print("=" * 60)
-            print(f"✓ Input: {df.shape[0]} rows × {df.shape[1]} columns")
-            print(f"✓ Output: {X_train_processed.shape[0]} train + {X_test_processed.shape[0]} test")
-            print(f"✓ Features: {X_train_processed.shape[1]} (from {len(X.columns)} original)")
-            print(f"✓ Removed: {len(self.removed_features)} features")
-            print("=" * 60 + "\n")
+            logger.debug(
+                "Preprocessing complete: %d rows × %d columns in, %d train + %d test out, "
+                "%d features (from %d original), %d removed",
+                df.shape[0], df.shape[1], X_train_processed.shape[0], X_test_processed.shape[0],
+                X_train_processed.shape[1], len(X.columns), len(self.removed_features)
+            )
 
             return X_train_processed, X_test_processed, y_train, y_test, preprocessor, metadata
 
         except DataPreprocessingError:
             raise
         except Exception as e:
-            print(f"\n❌ PREPROCESSING FAILED")
-            print(f"Error: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Preprocessing failed: %s", e)
             raise DataPreprocessingError(f"Preprocessing failed: {str(e)}")
 
     def _detect_problem_type(self, y: pd.Series) -> str:
@@ -336,6 +397,21 @@ class DataPreprocessing:
             if len(y_clean) == 0:
                 return "classification"
 
+            # Typed targets answer the questions below without a conversion pass
+            if pd.api.types.is_bool_dtype(y_clean) or pd.api.types.is_integer_dtype(y_clean):
+                n_unique = y_clean.nunique()
+                if n_unique < 20 or (n_unique / len(y_clean)) < 0.05:
+                    return "classification"
+                return "regression"
+            if pd.api.types.is_float_dtype(y_clean):
+                values = y_clean.to_numpy()
+                n_unique = y_clean.nunique()
+                if n_unique < 20 and np.allclose(values, values.astype(int)):
+                    return "classification"
+                if (n_unique / len(y_clean)) < 0.05:
+                    return "classification"
+                return "regression"
+
             # Try numeric conversion
             try:
                 y_numeric = pd.to_numeric(y_clean, errors='coerce')
@@ -360,9 +436,20 @@ class DataPreprocessing:
                 return "classification"
 
         except Exception as e:
-            print(f"  ⚠️  Problem type detection error: {e}, defaulting to classification")
+            logger.warning("Problem type detection error: %s, defaulting to classification", e)
             return "classification"
 
+    def _record_low_variance_features(self, preprocessor: ColumnTransformer) -> None:
+        """Add the numeric columns the fitted VarianceThreshold step dropped to removed_features"""
+        numeric = preprocessor.named_transformers_.get("num")
+        if not isinstance(numeric, Pipeline) or "variance" not in numeric.named_steps:
+            return
+        support = numeric.named_steps["variance"].get_support()
+        low_variance_cols = [col for col, kept in zip(numeric.named_steps["variance"].feature_names_in_, support) if not kept]
+        if low_variance_cols:
+            logger.warning("Removing %d low-variance numeric features", len(low_variance_cols))
+            self.removed_features.extend(low_variance_cols)
+
     def _get_feature_names(self, preprocessor: ColumnTransformer, X: pd.DataFrame) -> list:
         """Extract feature names with error handling"""
         try:
@@ -377,44 +464,118 @@ class DataPreprocessing:
             return feature_names
 
 
+# Preprocessing output per (dataset file, target, split settings). Uploads never overwrite a
+# dataset, so the file URL and upload time identify its contents. Bump the version whenever
+# preprocessing changes, so stale entries are ignored
+PREPROCESS_CACHE_VERSION = 3
+PREPROCESS_CACHE_TTL = 24 * 3600
+# Larger results aren't worth holding in Redis
+PREPROCESS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_preprocess_fallback = TTLCache(ttl=1800, maxsize=4)
+
+
+def _preprocess_cache_key(dataset_info: Dict[str, Any], target_col: str, test_size: float,
+                          use_target_encoder: bool) -> str:
+    raw = (
+        f"{PREPROCESS_CACHE_VERSION}:{dataset_info['id']}:{dataset_info['file_url']}:"
+        f"{dataset_info.get('uploaded_at')}:{target_col}:{test_size}:{use_target_encoder}"
+    )
+    return f"preprocess:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+async def _get_cached_preprocessing(key: str) -> Optional[Dict[str, Any]]:
+    blob = None
+    if redis_bytes is not None:
+        try:
+            blob = await redis_bytes.get(key)
+        except Exception as e:
+            logger.warning("Preprocessing cache lookup failed, using local cache: %s", e)
+    if blob is None:
+        blob = _preprocess_fallback.get(key)
+    if blob is None:
+        return None
+    try:
+        return pickle.loads(zlib.decompress(blob))
+    except Exception as e:
+        logger.warning("Discarding unreadable preprocessing cache entry: %s", e)
+        return None
+
+
+async def _store_cached_preprocessing(key: str, result: Dict[str, Any]) -> None:
+    try:
+        blob = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    except Exception as e:
+        logger.warning("Preprocessing result not cacheable: %s", e)
+        return
+    if len(blob) > PREPROCESS_CACHE_MAX_BYTES:
+        return
+    if redis_bytes is not None:
+        try:
+            await redis_bytes.set(key, blob, ex=PREPROCESS_CACHE_TTL)
+            return
+        except Exception as e:
+            logger.warning("Preprocessing cache store failed, using local cache: %s", e)
+    _preprocess_fallback.set(key, blob)
+
+
+async def _read_dataset_csv(file_path: str) -> pd.DataFrame:
+    """Parse a dataset CSV straight off the storage stream, without buffering the raw file.
+
+    Tries UTF-8 first; a file that isn't valid UTF-8 is streamed again as latin-1, which
+    decodes any byte sequence.
+    """
+    for encoding in ("utf-8", "latin-1"):
+        chunks, _ = await open_object_stream("datasets", file_path, chunk_size=1 << 20)
+        reader = io.BufferedReader(ChunkedReader(chunks), buffer_size=1 << 20)
+        try:
+            return await asyncio.to_thread(pd.read_csv, reader, encoding=encoding)
+        except UnicodeDecodeError:
+            logger.info("%s is not UTF-8, re-reading as latin-1", file_path)
+        finally:
+            reader.close()
+
+
 async def preprocess_dataset(
         dataset_id: int,
         user_id: str,
         target_col: str,
         test_size: float = 0.2,
-        use_target_encoder: bool = False
+        use_target_encoder: bool = False,
+        dataset_info: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Main service function with full error handling.
+
+    Pass dataset_info (the full datasets row) when the caller has already fetched it.
     """
     try:
-        print(f"\n[Service] Preprocessing dataset {dataset_id} for user {user_id}")
+        logger.debug("Preprocessing dataset %s for user %s", dataset_id, user_id)
 
         # Fetch dataset metadata
-        dataset = supabase.table("datasets").select("*").eq("id", dataset_id).eq("user_id", user_id).execute()
+        if dataset_info is None:
+            dataset = supabase.table("datasets").select("*").eq("id", dataset_id).eq("user_id", user_id).execute()
 
-        if not dataset.data:
-            raise DataPreprocessingError(f"Dataset {dataset_id} not found for user {user_id}")
+            if not dataset.data:
+                raise DataPreprocessingError(f"Dataset {dataset_id} not found for user {user_id}")
 
-        dataset_info = dataset.data[0]
+            dataset_info = dataset.data[0]
+
+        # Same file and settings as an earlier run: skip the download and the refit
+        cache_key = _preprocess_cache_key(dataset_info, target_col, test_size, use_target_encoder)
+        cached = await _get_cached_preprocessing(cache_key)
+        if cached is not None:
+            logger.debug("Using cached preprocessing for dataset %s", dataset_id)
+            return cached
 
         # Download dataset from storage
         file_path = dataset_info['file_url'].split('/')[-2:]
         file_path = '/'.join(file_path)
 
-        print(f"[Service] Downloading file: {file_path}")
-        file_data = supabase.storage.from_('datasets').download(file_path)
-
-        # Load into DataFrame with robust parsing
-        try:
-            df = pd.read_csv(io.BytesIO(file_data), encoding='utf-8')
-        except UnicodeDecodeError:
-            try:
-                df = pd.read_csv(io.BytesIO(file_data), encoding='latin-1')
-            except:
-                df = pd.read_csv(io.BytesIO(file_data), encoding='iso-8859-1')
+        logger.debug("Downloading file: %s", file_path)
+        # Parsed while it downloads, so the raw file is never held in memory next to the DataFrame
+        df = await _read_dataset_csv(file_path)
 
-        print(f"[Service] Loaded dataset: {df.shape[0]} rows × {df.shape[1]} columns")
+        logger.debug("Loaded dataset: %d rows × %d columns", df.shape[0], df.shape[1])
 
         # Preprocess
         preprocessor = DataPreprocessing()
@@ -432,7 +593,7 @@ async def preprocess_dataset(
             "status": "success"
         }
 
-        return {
+        result = {
             "preprocessing_result": preprocessing_result,
             "X_train": X_train,
             "X_test": X_test,
@@ -440,10 +601,11 @@ async def preprocess_dataset(
             "y_test": y_test,
             "preprocessor": fitted_preprocessor
         }
+        await _store_cached_preprocessing(cache_key, result)
+        return result
 
     except DataPreprocessingError:
         raise
     except Exception as e:
-        print(f"[Service] Preprocessing service failed: {e}")
-        traceback.print_exc()
+        logger.exception("Preprocessing service failed: %s", e)
         raise DataPreprocessingError(f"Preprocessing service failed: {str(e)}")
\ No newline at end of file
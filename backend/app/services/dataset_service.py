@@ -2,7 +2,7 @@
 import pandas as pd
 import io
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from app.db.supabase_client import supabase
 
 
@@ -92,7 +92,7 @@ async def upload_dataset(file, user_id: str) -> Dict[str, Any]:
             "user_id": user_id,
             "name": file.filename,
             "file_url": public_url,
-            "uploaded_at": datetime.utcnow().isoformat(),
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
             "rows": len(df),
             "columns": len(df.columns),
             "has_missing": bool(df.isnull().values.any()),
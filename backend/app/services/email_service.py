@@ -1,169 +1,257 @@
 # backend/app/services/email_service.py
-import sib_api_v3_sdk
-from sib_api_v3_sdk.rest import ApiException
+import asyncio
+import functools
+import httpx
+import orjson
+import time
+from collections import deque
+from contextvars import ContextVar
+from html import escape
 from app.core.config import get_settings
-from typing import Optional
+from app.utils.retry import is_transient, with_backoff
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# Configure Brevo API
-configuration = sib_api_v3_sdk.Configuration()
-configuration.api_key['api-key'] = settings.brevo_api_key
-
-# Log configuration on startup
-logger.info("=" * 60)
-logger.info("📧 EMAIL SERVICE INITIALIZED")
-logger.info(f"Brevo API Key: {'*' * 20}{settings.brevo_api_key[-8:] if len(settings.brevo_api_key) > 8 else '***'}")
-logger.info(f"Sender Email: {settings.brevo_sender_email}")
-logger.info(f"Admin Email: modelmind.team@gmail.com")
-logger.info("=" * 60)
-
-
-class EmailService:
-    """Service for sending emails via Brevo (formerly Sendinblue)"""
-
-    @staticmethod
-    async def send_email(
-            to: str,
-            subject: str,
-            html_content: str,
-            from_email: Optional[str] = None,
-            from_name: Optional[str] = None
-    ) -> bool:
-        """
-        Send an email using Brevo
-
-        Args:
-            to: Recipient email address
-            subject: Email subject
-            html_content: HTML email body
-            from_email: Sender email (default from settings)
-            from_name: Sender name (default: ModelMind)
-
-        Returns:
-            bool: True if sent successfully, False otherwise
-        """
-        logger.info("=" * 60)
-        logger.info(f"📤 ATTEMPTING TO SEND EMAIL")
-        logger.info(f"To: {to}")
-        logger.info(f"Subject: {subject}")
-
-        try:
-            api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
-                sib_api_v3_sdk.ApiClient(configuration)
-            )
-
-            # Use default sender email from settings
-            if not from_email:
-                from_email = settings.brevo_sender_email
-            if not from_name:
-                from_name = "ModelMind"
+TEAM_EMAIL = "modelmind.team@gmail.com"
+DEV_EMAIL = "davidaniago@gmail.com"
+
+# Accent colour per feedback type in team emails
+PRIORITY_COLORS = {"bug": "#ef4444"}
+DEFAULT_PRIORITY_COLOR = "#3b82f6"
+
+# Header emoji per feedback type in the user's confirmation email
+FEEDBACK_EMOJI = {
+    'suggestion': '💡',
+    'bug': '🐛',
+    'feature': '✨',
+    'other': '💬'
+}
+
+DEFAULT_SENDER = {"email": settings.brevo_sender_email, "name": "ModelMind"}
+
+# Brevo REST API; called directly with an async client so sends don't block the event loop
+BREVO_SEND_URL = "https://api.brevo.com/v3/smtp/email"
+
+logger.info("Email service initialized (sender: %s)", settings.brevo_sender_email)
+
+
+BULK_SEND_CONCURRENCY = 50
+SEND_QUEUE_MAXSIZE = 10_000
+SEND_WORKERS = 8
+
+# 429 / 5xx from Brevo are retried; the budget caps retries process-wide so a Brevo outage
+# during a bulk send doesn't turn into a retry storm
+SEND_MAX_RETRIES = 2
+SEND_BACKOFF_BASE = 1.0
+SEND_BACKOFF_CAP = 8.0
+SEND_BACKOFF_JITTER = 0.25
+# Wall-clock cap on one send_email call, retries and backoff included
+SEND_DEADLINE_SECONDS = 30.0
+# Each attempt gets an equal share of what the deadline leaves after the backoff sleeps
+# (base * 2**n plus jitter, as with_backoff waits), so every retry can finish
+# inside it. A long Retry-After can still stretch the sleeps; the deadline stays the hard cap
+SEND_ATTEMPT_TIMEOUT = (
+    SEND_DEADLINE_SECONDS
+    - sum(min(SEND_BACKOFF_BASE * 2 ** n + SEND_BACKOFF_JITTER, SEND_BACKOFF_CAP) for n in range(SEND_MAX_RETRIES))
+) / (SEND_MAX_RETRIES + 1)
+RETRY_BUDGET_PER_MINUTE = 30
+_retry_times: Deque[float] = deque()
+
+# Set whenever a send returns False: True when the failure may clear on its own (Brevo outage,
+# timeout, open circuit), False when retrying can't help (4xx, template error). Per task, so a
+# caller can read it right after awaiting a send
+last_failure_transient: ContextVar[bool] = ContextVar("last_failure_transient", default=False)
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_lock = asyncio.Lock()
+
+
+async def _get_http_client() -> httpx.AsyncClient:
+    """Shared client, so sends reuse pooled keep-alive connections to Brevo.
+
+    Sized for the most sends that can be in flight (bulk sends plus the queue workers), all
+    to the one Brevo host; HTTP/2 is negotiated when available so they multiplex instead.
+    """
+    global _http_client
+    if _http_client is None:
+        async with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(10, connect=3),
+                    limits=httpx.Limits(
+                        max_connections=BULK_SEND_CONCURRENCY + SEND_WORKERS,
+                        max_keepalive_connections=BULK_SEND_CONCURRENCY + SEND_WORKERS,
+                        keepalive_expiry=75,
+                    ),
+                    http2=True,
+                    headers={
+                        "api-key": settings.brevo_api_key,
+                        "accept": "application/json",
+                        "content-type": "application/json",
+                    },
+                )
+    return _http_client
+
+
+def _should_retry(exc: Exception) -> bool:
+    """Retry transient failures while the per-minute retry budget lasts"""
+    if not is_transient(exc):
+        return False
+    now = time.monotonic()
+    while _retry_times and now - _retry_times[0] > 60:
+        _retry_times.popleft()
+    if len(_retry_times) >= RETRY_BUDGET_PER_MINUTE:
+        return False
+    _retry_times.append(now)
+    return True
+
+
+class _Breaker:
+    """Circuit breaker for Brevo: after FAILURE_THRESHOLD consecutive transient failures, sends
+    fail fast for RESET_SECONDS, then a single probe decides whether to close again"""
+
+    FAILURE_THRESHOLD = 5
+    RESET_SECONDS = 30.0
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.state = "closed"
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.RESET_SECONDS:
+            self.state = "half_open"
+            return True
+        return False
 
-            logger.info(f"From: {from_name} <{from_email}>")
+    def record_success(self) -> None:
+        self.failures = 0
+        self.state = "closed"
 
-            # Create email
-            send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
-                to=[{"email": to}],
-                sender={"email": from_email, "name": from_name},
-                subject=subject,
-                html_content=html_content
-            )
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.FAILURE_THRESHOLD:
+            if self.state != "open":
+                logger.warning("Brevo circuit open after %s failures", self.failures)
+            self.state = "open"
+            self.opened_at = time.monotonic()
 
-            logger.info("Calling Brevo API...")
 
-            # Send email
-            api_response = api_instance.send_transac_email(send_smtp_email)
+_breaker = _Breaker()
 
-            logger.info(f"✅ EMAIL SENT SUCCESSFULLY!")
-            logger.info(f"Message ID: {api_response.message_id}")
-            logger.info("=" * 60)
-            return True
 
-        except ApiException as e:
-            logger.error("=" * 60)
-            logger.error(f"❌ BREVO API ERROR!")
-            logger.error(f"Status Code: {e.status}")
-            logger.error(f"Reason: {e.reason}")
-            logger.error(f"Body: {e.body}")
-            logger.error(f"To: {to}")
-            logger.error("=" * 60)
-            return False
-        except Exception as e:
-            logger.error("=" * 60)
-            logger.error(f"❌ GENERAL ERROR SENDING EMAIL!")
-            logger.error(f"Error Type: {type(e).__name__}")
-            logger.error(f"Error Message: {str(e)}")
-            logger.error(f"To: {to}")
-            logger.error("=" * 60)
-            return False
+# In-process send queue: handlers enqueue and return, a fixed pool of workers does the sends
+# (and owns their retries), so request latency never includes the Brevo round trip
+_send_queue: "asyncio.Queue[tuple]" = asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE)
+_send_workers: List[asyncio.Task] = []
 
-    @staticmethod
-    async def send_waitlist_confirmation(email: str) -> bool:
-        """Send confirmation email for waitlist signup"""
-        logger.info(f"🎯 Preparing WAITLIST CONFIRMATION email for {email}")
 
-        subject = "Welcome to ModelMind Dashboard AI Waitlist!"
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {{ 
+async def _send_worker() -> None:
+    while True:
+        send, args, kwargs = await _send_queue.get()
+        try:
+            await send(*args, **kwargs)
+        except Exception:
+            logger.exception("Queued email %s failed", getattr(send, "__name__", send))
+        finally:
+            _send_queue.task_done()
+
+
+def _ensure_send_workers() -> None:
+    """Start the worker pool on first use, inside the running event loop"""
+    if not _send_workers:
+        _send_workers.extend(asyncio.create_task(_send_worker()) for _ in range(SEND_WORKERS))
+
+
+async def stop_send_workers(drain_timeout: float = 10.0) -> None:
+    """Give queued sends a chance to finish, then stop the workers (called on app shutdown)"""
+    if not _send_workers:
+        return
+    try:
+        await asyncio.wait_for(_send_queue.join(), timeout=drain_timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Dropping %s queued emails on shutdown", _send_queue.qsize())
+    for task in _send_workers:
+        task.cancel()
+    await asyncio.gather(*_send_workers, return_exceptions=True)
+    _send_workers.clear()
+
+
+async def close_http_client() -> None:
+    """Close the Brevo HTTP client (called on app shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Rules shared by every template; the rest of each <style> block is template-specific
+BASE_CSS = """body { 
                     font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif; 
                     line-height: 1.6; 
                     color: #333;
                     margin: 0;
                     padding: 0;
                     background-color: #f5f5f5;
-                }}
-                .container {{ 
+                }
+                .container { 
                     max-width: 600px; 
                     margin: 20px auto; 
                     background: white;
                     border-radius: 12px;
                     overflow: hidden;
                     box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }}
-                .header {{ 
+                }"""
+
+# These bodies have no per-recipient fields, so they are built once and shared by every send
+WAITLIST_CONFIRMATION_SUBJECT = "Welcome to ModelMind Dashboard AI Waitlist!"
+WAITLIST_CONFIRMATION_HTML = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <style>
+                """ + BASE_CSS + """
+                .header { 
                     background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%); 
                     padding: 40px 30px; 
                     text-align: center;
-                }}
-                .header h1 {{ 
+                }
+                .header h1 { 
                     color: white; 
                     margin: 0; 
                     font-size: 28px;
                     font-weight: 600;
-                }}
-                .content {{ 
+                }
+                .content { 
                     padding: 40px 30px;
-                }}
-                .content h2 {{
+                }
+                .content h2 {
                     color: #1f2937;
                     margin-top: 0;
-                }}
-                .features {{
+                }
+                .features {
                     background: #f9fafb;
                     padding: 20px;
                     border-radius: 8px;
                     margin: 20px 0;
-                }}
-                .features ul {{
+                }
+                .features ul {
                     margin: 10px 0;
                     padding-left: 20px;
-                }}
-                .features li {{
+                }
+                .features li {
                     margin: 8px 0;
                     color: #4b5563;
-                }}
-                .button {{ 
+                }
+                .button { 
                     display: inline-block; 
                     background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%);
                     color: white !important; 
@@ -173,15 +261,15 @@ class EmailService:
                     margin: 20px 0;
                     font-weight: 600;
                     text-align: center;
-                }}
-                .footer {{ 
+                }
+                .footer { 
                     text-align: center; 
                     padding: 30px; 
                     background: #f9fafb;
                     color: #6b7280; 
                     font-size: 14px;
                     border-top: 1px solid #e5e7eb;
-                }}
+                }
             </style>
         </head>
         <body>
@@ -216,31 +304,275 @@ class EmailService:
             </div>
         </body>
         </html>
+"""
+
+LAUNCH_NOTIFICATION_SUBJECT = "🎉 Dashboard AI Assistant is Live!"
+LAUNCH_NOTIFICATION_HTML = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <style>
+                """ + BASE_CSS + """
+                .header { 
+                    background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%); 
+                    padding: 50px 30px; 
+                    text-align: center;
+                }
+                .header h1 { 
+                    color: white; 
+                    margin: 0; 
+                    font-size: 36px;
+                    font-weight: 700;
+                }
+                .content { 
+                    padding: 40px 30px;
+                }
+                .features { 
+                    background: #f9fafb; 
+                    padding: 25px; 
+                    border-radius: 12px; 
+                    margin: 25px 0;
+                }
+                .features h3 {
+                    margin-top: 0;
+                    color: #1f2937;
+                }
+                .features ul {
+                    list-style: none;
+                    padding: 0;
+                }
+                .features li { 
+                    padding: 10px 0;
+                    color: #4b5563;
+                }
+                .button { 
+                    display: inline-block; 
+                    background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%);
+                    color: white !important; 
+                    padding: 16px 48px; 
+                    text-decoration: none; 
+                    border-radius: 10px; 
+                    margin: 20px 0;
+                    font-weight: 700;
+                    font-size: 18px;
+                    text-align: center;
+                }
+                .footer {
+                    text-align: center;
+                    padding: 30px;
+                    background: #f9fafb;
+                    color: #6b7280;
+                    font-size: 14px;
+                    border-top: 1px solid #e5e7eb;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>🚀 We're Live!</h1>
+                </div>
+                <div class="content">
+                    <h2>The wait is over!</h2>
+                    <p>The Dashboard AI Assistant is now available and ready to supercharge your analytics workflow.</p>
+
+                    <div class="features">
+                        <h3>What you can do today:</h3>
+                        <ul>
+                            <li>💬 Interact with your data using natural language</li>
+                            <li>📊 Get instant insights and visualizations</li>
+                            <li>🤖 Leverage AI-powered analytics</li>
+                            <li>⚡ Streamline your workflow</li>
+                            <li>🎯 Make data-driven decisions faster</li>
+                        </ul>
+                    </div>
+
+                    <p style="text-align: center;">
+                        <a href="https://modelmind.ai/dashboard-ai" class="button">
+                            Get Started Now →
+                        </a>
+                    </p>
+
+                    <p style="margin-top: 30px;">Thank you for being an early supporter! We can't wait to see what you build.</p>
+                    <p><strong>- The ModelMind Team</strong></p>
+                </div>
+                <div class="footer">
+                    <p>© 2025 ModelMind. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+"""
+
+
+def _message_html(message: str) -> str:
+    """Escape a user's free-text message and keep its line breaks"""
+    return escape(message.strip()).replace("\r\n", "\n").replace("\n", "<br>")
+
+
+def _never_raises(send: Callable[..., Awaitable[bool]]) -> Callable[..., Awaitable[bool]]:
+    """Turn any error while building or sending an email into a logged False.
+
+    Sends run as background tasks and from the digest worker, so a bad template field
+    must not escape into the caller. CancelledError is not an Exception and still propagates.
+    """
+    @functools.wraps(send)
+    async def wrapper(*args, **kwargs) -> bool:
+        try:
+            return await send(*args, **kwargs)
+        except Exception:
+            logger.exception("Failed to build or send %s", send.__name__)
+            last_failure_transient.set(False)
+            return False
+    return wrapper
+
+
+class EmailService:
+    """Service for sending emails via Brevo (formerly Sendinblue).
+
+    Every send method returns True on success and False on any failure; none of them raise.
+    """
+
+    @staticmethod
+    def enqueue(send: Callable[..., Awaitable[bool]], *args, **kwargs) -> bool:
+        """
+        Queue an EmailService send (e.g. EmailService.send_waitlist_confirmation) for the
+        background workers and return immediately
+
+        Returns:
+            bool: False if the queue is full and the email was dropped
         """
-        result = await EmailService.send_email(email, subject, html_content)
+        _ensure_send_workers()
+        try:
+            _send_queue.put_nowait((send, args, kwargs))
+            return True
+        except asyncio.QueueFull:
+            logger.error("Email queue full, dropping %s", getattr(send, "__name__", send))
+            return False
+
+    @staticmethod
+    async def send_email(
+            to: str,
+            subject: str,
+            html_content: str,
+            from_email: Optional[str] = None,
+            from_name: Optional[str] = None
+    ) -> bool:
+        """
+        Send an email using Brevo
+
+        Args:
+            to: Recipient email address
+            subject: Email subject
+            html_content: HTML email body
+            from_email: Sender email (default from settings)
+            from_name: Sender name (default: ModelMind)
+
+        Returns:
+            bool: True if sent successfully, False otherwise (never raises)
+        """
+        if not _breaker.allow():
+            logger.error("Brevo circuit open, not sending email to %s", to)
+            last_failure_transient.set(True)
+            return False
+
+        try:
+            # Every current caller uses the default sender
+            if from_email is None and from_name is None:
+                sender = DEFAULT_SENDER
+            else:
+                sender = {
+                    "email": from_email or settings.brevo_sender_email,
+                    "name": from_name or DEFAULT_SENDER["name"],
+                }
+
+            logger.debug("Sending email to %s from %s <%s>: %s", to, sender["name"], sender["email"], subject)
+
+            # Create email
+            payload = {
+                "to": [{"email": to}],
+                "sender": sender,
+                "subject": subject,
+                "htmlContent": html_content,
+            }
+
+            # Send email
+            client = await _get_http_client()
+            # Serialised once and reused across retries; orjson escapes the multi-KB HTML body
+            # several times faster than the stdlib encoder httpx would use for json=
+            body = orjson.dumps(payload)
+
+            async def _post() -> httpx.Response:
+                # httpx timeouts are per phase (connect, write, read), so bound the attempt as a whole
+                try:
+                    response = await asyncio.wait_for(
+                        client.post(BREVO_SEND_URL, content=body), timeout=SEND_ATTEMPT_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    # Surface as an httpx timeout so with_backoff treats it as transient
+                    raise httpx.ReadTimeout(f"Brevo send attempt exceeded {SEND_ATTEMPT_TIMEOUT:.1f}s")
+                response.raise_for_status()
+                return response
+
+            response = await asyncio.wait_for(
+                with_backoff(_post, max_retries=SEND_MAX_RETRIES, base=SEND_BACKOFF_BASE,
+                             cap=SEND_BACKOFF_CAP, jitter=SEND_BACKOFF_JITTER, retry_if=_should_retry),
+                timeout=SEND_DEADLINE_SECONDS,
+            )
+            _breaker.record_success()
+
+            logger.info("Email sent to %s (message id %s)", to, response.json().get("messageId"))
+            return True
+
+        except httpx.HTTPStatusError as e:
+            last_failure_transient.set(is_transient(e))
+            if is_transient(e):
+                _breaker.record_failure()
+            else:
+                # Brevo answered; a rejected request says nothing about its health
+                _breaker.record_success()
+            logger.error(
+                "Brevo API error sending to %s: %s %s %s",
+                to, e.response.status_code, e.response.reason_phrase, e.response.text
+            )
+            return False
+        except asyncio.TimeoutError:
+            _breaker.record_failure()
+            last_failure_transient.set(True)
+            logger.error("Brevo send to %s timed out after %ss", to, SEND_DEADLINE_SECONDS)
+            return False
+        except Exception as e:
+            _breaker.record_failure()
+            last_failure_transient.set(is_transient(e))
+            logger.error("Error sending email to %s: %s: %s", to, type(e).__name__, e)
+            return False
+
+    @staticmethod
+    @_never_raises
+    async def send_waitlist_confirmation(email: str) -> bool:
+        """Send confirmation email for waitlist signup"""
+        logger.debug("Preparing WAITLIST CONFIRMATION email for %s", email)
+
+        result = await EmailService.send_email(email, WAITLIST_CONFIRMATION_SUBJECT, WAITLIST_CONFIRMATION_HTML)
 
         if result:
-            logger.info(f"✅ Waitlist confirmation sent to {email}")
+            logger.debug("Waitlist confirmation sent to %s", email)
         else:
-            logger.error(f"❌ Failed to send waitlist confirmation to {email}")
+            logger.debug("Failed to send waitlist confirmation to %s", email)
 
         return result
 
     @staticmethod
+    @_never_raises
     async def send_feedback_confirmation(email: str, feedback_type: str, subject: str) -> bool:
         """Send confirmation email for feedback submission"""
-        logger.info(f"🎯 Preparing FEEDBACK CONFIRMATION email for {email}")
+        logger.debug("Preparing FEEDBACK CONFIRMATION email for %s", email)
 
         email_subject = f"We received your {feedback_type}"
 
-        # Emoji mapping
-        emoji_map = {
-            'suggestion': '💡',
-            'bug': '🐛',
-            'feature': '✨',
-            'other': '💬'
-        }
-        emoji = emoji_map.get(feedback_type, '💬')
+        emoji = FEEDBACK_EMOJI.get(feedback_type, '💬')
 
         html_content = f"""
         <!DOCTYPE html>
@@ -249,22 +581,7 @@ class EmailService:
             <meta charset="utf-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <style>
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif; 
-                    line-height: 1.6; 
-                    color: #333;
-                    margin: 0;
-                    padding: 0;
-                    background-color: #f5f5f5;
-                }}
-                .container {{ 
-                    max-width: 600px; 
-                    margin: 20px auto; 
-                    background: white;
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }}
+                {BASE_CSS}
                 .header {{ 
                     background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%); 
                     padding: 40px 30px; 
@@ -304,7 +621,7 @@ class EmailService:
                 <div class="content">
                     <h2>We've received your {feedback_type}</h2>
                     <div class="info-box">
-                        <p><strong>Subject:</strong> {subject}</p>
+                        <p><strong>Subject:</strong> {escape(subject)}</p>
                     </div>
                     <p>Our team will review it and get back to you if needed.</p>
                     <p>Your input helps us build a better product for everyone. Thank you! 🙏</p>
@@ -319,13 +636,14 @@ class EmailService:
         result = await EmailService.send_email(email, email_subject, html_content)
 
         if result:
-            logger.info(f"✅ Feedback confirmation sent to {email}")
+            logger.debug("Feedback confirmation sent to %s", email)
         else:
-            logger.error(f"❌ Failed to send feedback confirmation to {email}")
+            logger.debug("Failed to send feedback confirmation to %s", email)
 
         return result
 
     @staticmethod
+    @_never_raises
     async def send_feedback_notification_to_team(
             feedback_type: str,
             subject: str,
@@ -334,17 +652,14 @@ class EmailService:
             email: Optional[str] = None
     ) -> bool:
         """Send feedback notification to ModelMind team"""
-        team_email = "modelmind.team@gmail.com"
+        team_email = TEAM_EMAIL
 
-        logger.info(f"🎯 Preparing ADMIN NOTIFICATION email for {team_email}")
-        logger.info(f"Feedback Type: {feedback_type}")
-        logger.info(f"Subject: {subject}")
-        logger.info(f"From User: {name or 'Anonymous'} ({email or 'No email'})")
+        logger.debug("Preparing ADMIN NOTIFICATION email for %s", team_email)
 
         email_subject = f"🔔 New {feedback_type.upper()}: {subject}"
 
         # Priority styling
-        priority_color = "#ef4444" if feedback_type == "bug" else "#3b82f6"
+        priority_color = PRIORITY_COLORS.get(feedback_type, DEFAULT_PRIORITY_COLOR)
 
         html_content = f"""
         <!DOCTYPE html>
@@ -353,22 +668,7 @@ class EmailService:
             <meta charset="utf-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <style>
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif; 
-                    line-height: 1.6; 
-                    color: #333;
-                    margin: 0;
-                    padding: 0;
-                    background-color: #f5f5f5;
-                }}
-                .container {{ 
-                    max-width: 600px; 
-                    margin: 20px auto; 
-                    background: white;
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }}
+                {BASE_CSS}
                 .header {{ 
                     background: #1f2937; 
                     padding: 30px; 
@@ -419,13 +719,13 @@ class EmailService:
                 <div class="content">
                     <div class="info-box">
                         <p><span class="badge">{feedback_type}</span></p>
-                        <p><strong>From:</strong> {name or 'Anonymous'}</p>
-                        <p><strong>Email:</strong> {email or 'Not provided'}</p>
-                        <p><strong>Subject:</strong> {subject}</p>
+                        <p><strong>From:</strong> {escape(name or 'Anonymous')}</p>
+                        <p><strong>Email:</strong> {escape(email or 'Not provided')}</p>
+                        <p><strong>Subject:</strong> {escape(subject)}</p>
                     </div>
                     <div class="message-box">
                         <p><strong>Message:</strong></p>
-                        <p>{message}</p>
+                        <p>{_message_html(message)}</p>
                     </div>
                     <p style="color: #6b7280; font-size: 14px; margin-top: 20px;">
                         <em>View all feedback in your Supabase dashboard</em>
@@ -438,20 +738,105 @@ class EmailService:
         result = await EmailService.send_email(team_email, email_subject, html_content)
 
         if result:
-            logger.info(f"✅ Admin notification sent to {team_email}")
+            logger.debug("Admin notification sent to %s", team_email)
         else:
-            logger.error(f"❌ Failed to send admin notification to {team_email}")
+            logger.debug("Failed to send admin notification to %s", team_email)
 
         return result
 
     @staticmethod
+    @_never_raises
+    async def send_feedback_digest_to_team(events: List[Dict[str, Any]]) -> bool:
+        """Send one email to the ModelMind team covering a batch of feedback submissions"""
+        if len(events) == 1:
+            return await EmailService.send_feedback_notification_to_team(**events[0])
+
+        team_email = TEAM_EMAIL
+        bug_count = sum(1 for event in events if event["feedback_type"] == "bug")
+
+        logger.debug("Preparing FEEDBACK DIGEST (%s items, %s bugs) for %s", len(events), bug_count, team_email)
+
+        email_subject = f"🔔 {len(events)} new feedback submissions"
+        if bug_count:
+            email_subject += f" ({bug_count} bugs)"
+
+        items_html = "".join(
+            f"""
+                    <div class="item" style="border-left-color: {PRIORITY_COLORS.get(event['feedback_type'], DEFAULT_PRIORITY_COLOR)};">
+                        <p><strong>[{event['feedback_type'].upper()}] {escape(event['subject'])}</strong></p>
+                        <p class="meta">From: {escape(event.get('name') or 'Anonymous')} ({escape(event.get('email') or 'No email')})</p>
+                        <p>{_message_html(event['message'])}</p>
+                    </div>"""
+            for event in events
+        )
+
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <style>
+                {BASE_CSS}
+                .header {{ 
+                    background: #1f2937; 
+                    padding: 30px; 
+                }}
+                .header h1 {{ 
+                    color: white; 
+                    margin: 0; 
+                    font-size: 22px;
+                    font-weight: 600;
+                }}
+                .content {{ 
+                    padding: 30px;
+                }}
+                .item {{ 
+                    background: #f9fafb; 
+                    padding: 15px 20px; 
+                    border-radius: 8px; 
+                    margin: 15px 0; 
+                    border-left: 4px solid #3b82f6;
+                }}
+                .item p {{
+                    margin: 6px 0;
+                }}
+                .meta {{
+                    color: #6b7280;
+                    font-size: 14px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>📬 {len(events)} New Feedback Submissions</h1>
+                </div>
+                <div class="content">{items_html}
+                    <p style="color: #6b7280; font-size: 14px; margin-top: 20px;">
+                        <em>View all feedback in your Supabase dashboard</em>
+                    </p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        result = await EmailService.send_email(team_email, email_subject, html_content)
+
+        if result:
+            logger.debug("Feedback digest sent to %s", team_email)
+        else:
+            logger.debug("Failed to send feedback digest to %s", team_email)
+
+        return result
+
+    @staticmethod
+    @_never_raises
     async def send_launch_reminder_to_dev(days_remaining: int, launch_date: str) -> bool:
         """Send 15-day launch reminder to developer"""
-        admin_email = "davidaniago@gmail.com"
+        admin_email = DEV_EMAIL
 
-        logger.info(f"🎯 Preparing 15-DAY LAUNCH REMINDER for {admin_email}")
-        logger.info(f"Days Remaining: {days_remaining}")
-        logger.info(f"Launch Date: {launch_date}")
+        logger.debug("Preparing 15-DAY LAUNCH REMINDER for %s", admin_email)
 
         subject = f"🚨 {days_remaining} Days Until Dashboard AI Launch!"
 
@@ -462,22 +847,7 @@ class EmailService:
             <meta charset="utf-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <style>
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif; 
-                    line-height: 1.6; 
-                    color: #333;
-                    margin: 0;
-                    padding: 0;
-                    background-color: #f5f5f5;
-                }}
-                .container {{ 
-                    max-width: 600px; 
-                    margin: 20px auto; 
-                    background: white;
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }}
+                {BASE_CSS}
                 .header {{ 
                     background: linear-gradient(135deg, #ef4444 0%, #f97316 100%); 
                     padding: 40px 30px; 
@@ -576,136 +946,47 @@ class EmailService:
         result = await EmailService.send_email(admin_email, subject, html_content)
 
         if result:
-            logger.info(f"✅ Launch reminder sent to {admin_email}")
+            logger.debug("Launch reminder sent to %s", admin_email)
         else:
-            logger.error(f"❌ Failed to send launch reminder to {admin_email}")
+            logger.debug("Failed to send launch reminder to %s", admin_email)
 
         return result
 
     @staticmethod
+    @_never_raises
     async def send_launch_notification(email: str) -> bool:
         """Send launch day notification to waitlist subscribers"""
-        logger.info(f"🎯 Preparing LAUNCH NOTIFICATION for {email}")
+        logger.debug("Preparing LAUNCH NOTIFICATION for %s", email)
 
-        subject = "🎉 Dashboard AI Assistant is Live!"
-        html_content = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body { 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif; 
-                    line-height: 1.6; 
-                    color: #333;
-                    margin: 0;
-                    padding: 0;
-                    background-color: #f5f5f5;
-                }
-                .container { 
-                    max-width: 600px; 
-                    margin: 20px auto; 
-                    background: white;
-                    border-radius: 12px;
-                    overflow: hidden;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }
-                .header { 
-                    background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%); 
-                    padding: 50px 30px; 
-                    text-align: center;
-                }
-                .header h1 { 
-                    color: white; 
-                    margin: 0; 
-                    font-size: 36px;
-                    font-weight: 700;
-                }
-                .content { 
-                    padding: 40px 30px;
-                }
-                .features { 
-                    background: #f9fafb; 
-                    padding: 25px; 
-                    border-radius: 12px; 
-                    margin: 25px 0;
-                }
-                .features h3 {
-                    margin-top: 0;
-                    color: #1f2937;
-                }
-                .features ul {
-                    list-style: none;
-                    padding: 0;
-                }
-                .features li { 
-                    padding: 10px 0;
-                    color: #4b5563;
-                }
-                .button { 
-                    display: inline-block; 
-                    background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%);
-                    color: white !important; 
-                    padding: 16px 48px; 
-                    text-decoration: none; 
-                    border-radius: 10px; 
-                    margin: 20px 0;
-                    font-weight: 700;
-                    font-size: 18px;
-                    text-align: center;
-                }
-                .footer {
-                    text-align: center;
-                    padding: 30px;
-                    background: #f9fafb;
-                    color: #6b7280;
-                    font-size: 14px;
-                    border-top: 1px solid #e5e7eb;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🚀 We're Live!</h1>
-                </div>
-                <div class="content">
-                    <h2>The wait is over!</h2>
-                    <p>The Dashboard AI Assistant is now available and ready to supercharge your analytics workflow.</p>
+        result = await EmailService.send_email(email, LAUNCH_NOTIFICATION_SUBJECT, LAUNCH_NOTIFICATION_HTML)
 
-                    <div class="features">
-                        <h3>What you can do today:</h3>
-                        <ul>
-                            <li>💬 Interact with your data using natural language</li>
-                            <li>📊 Get instant insights and visualizations</li>
-                            <li>🤖 Leverage AI-powered analytics</li>
-                            <li>⚡ Streamline your workflow</li>
-                            <li>🎯 Make data-driven decisions faster</li>
-                        </ul>
-                    </div>
+        if result:
+            logger.debug("Launch notification sent to %s", email)
+        else:
+            logger.debug("Failed to send launch notification to %s", email)
 
-                    <p style="text-align: center;">
-                        <a href="https://modelmind.ai/dashboard-ai" class="button">
-                            Get Started Now →
-                        </a>
-                    </p>
+        return result
 
-                    <p style="margin-top: 30px;">Thank you for being an early supporter! We can't wait to see what you build.</p>
-                    <p><strong>- The ModelMind Team</strong></p>
-                </div>
-                <div class="footer">
-                    <p>© 2025 ModelMind. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
+    @staticmethod
+    async def send_launch_notification_bulk(emails: List[str]) -> List[bool]:
         """
-        result = await EmailService.send_email(email, subject, html_content)
+        Send the launch notification to many subscribers concurrently
 
-        if result:
-            logger.info(f"✅ Launch notification sent to {email}")
-        else:
-            logger.error(f"❌ Failed to send launch notification to {email}")
+        Sends overlap on the shared HTTP client, capped at BULK_SEND_CONCURRENCY in flight
+        so Brevo isn't hit with the whole waitlist at once.
+
+        Returns:
+            List[bool]: Per-recipient send result, in the same order as emails
+        """
+        logger.debug("Sending LAUNCH NOTIFICATION to %s subscribers", len(emails))
+
+        semaphore = asyncio.Semaphore(BULK_SEND_CONCURRENCY)
+
+        async def _send_one(email: str) -> bool:
+            async with semaphore:
+                return await EmailService.send_email(email, LAUNCH_NOTIFICATION_SUBJECT, LAUNCH_NOTIFICATION_HTML)
+
+        results = await asyncio.gather(*(_send_one(email) for email in emails))
 
-        return result
\ No newline at end of file
+        logger.info("Launch notification sent to %s/%s subscribers", sum(results), len(emails))
+        return list(results)
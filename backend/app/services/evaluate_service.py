@@ -5,7 +5,7 @@ import pandas as pd
 import joblib
 import json
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from sklearn.metrics import (
     mean_squared_error, mean_absolute_error, r2_score,
     accuracy_score, precision_score, recall_score,
@@ -119,7 +119,7 @@ async def evaluate_model(model_id, model_path, X_test, y_test, user_id):
         "problem_type": problem_type,
         "metrics": metrics_json,
         "summary": summary_json,
-        "created_at": datetime.utcnow().isoformat(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
     # Insert results into Supabase (non-blocking safe)
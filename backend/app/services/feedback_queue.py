@@ -0,0 +1,120 @@
+# backend/app/services/feedback_queue.py
+"""
+Team notifications for feedback go through a Redis list instead of one email per
+submission. The API only LPUSHes the event; a digest worker BRPOPs events, groups
+everything that arrives within a short window and sends a single email. A batch that
+fails transiently is requeued; after DIGEST_MAX_ATTEMPTS tries, or on a permanent failure,
+its events move to a dead-letter list.
+"""
+import asyncio
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+from app.db.redis_client import redis
+from app.services.email_service import EmailService, last_failure_transient
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_QUEUE_KEY = "feedback:queue"
+# Events that can't be delivered (permanent failure, or out of attempts) are parked here for a human
+FEEDBACK_DEAD_LETTER_KEY = "feedback:dead"
+DIGEST_WINDOW_SECONDS = 30
+DIGEST_MAX_EVENTS = 50
+DIGEST_MAX_ATTEMPTS = 5
+RETRY_DELAY_SECONDS = 5
+
+# Delivery attempts so far, carried inside a requeued event's JSON and stripped before sending
+ATTEMPTS_FIELD = "_attempts"
+
+
+async def queue_team_notification(event: Dict[str, Any]) -> None:
+    """Queue a feedback event for the team digest, or email it directly when Redis is unavailable"""
+    if redis is not None:
+        try:
+            await redis.lpush(FEEDBACK_QUEUE_KEY, json.dumps(event))
+            return
+        except Exception as e:
+            logger.warning("Could not queue feedback notification, sending directly: %s", e)
+
+    EmailService.enqueue(EmailService.send_feedback_notification_to_team, **event)
+
+
+async def _decode(raw) -> Optional[Dict[str, Any]]:
+    """Parse a queued event; anything unreadable goes straight to the dead-letter list"""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        logger.error("Unreadable feedback event moved to %s", FEEDBACK_DEAD_LETTER_KEY)
+        await redis.lpush(FEEDBACK_DEAD_LETTER_KEY, raw)
+        return None
+
+
+async def _collect_batch() -> List[Dict[str, Any]]:
+    """Block until one event arrives, then gather more until the window closes or the batch is full"""
+    events: List[Dict[str, Any]] = []
+    while not events:
+        _, raw = await redis.brpop(FEEDBACK_QUEUE_KEY, timeout=0)
+        event = await _decode(raw)
+        if event is not None:
+            events.append(event)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DIGEST_WINDOW_SECONDS
+    while len(events) < DIGEST_MAX_EVENTS:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        item = await redis.brpop(FEEDBACK_QUEUE_KEY, timeout=math.ceil(remaining))
+        if item is None:
+            break
+        event = await _decode(item[1])
+        if event is not None:
+            events.append(event)
+
+    return events
+
+
+async def _requeue_failed(events: List[Dict[str, Any]], attempts: List[int], transient: bool) -> None:
+    """Put a failed batch back for another try, or dead-letter it when retrying can't help"""
+    retry, dead = [], []
+    for event, attempt in zip(events, attempts):
+        payload = json.dumps({**event, ATTEMPTS_FIELD: attempt})
+        (retry if transient and attempt < DIGEST_MAX_ATTEMPTS else dead).append(payload)
+
+    try:
+        if retry:
+            # Back at the consuming end, oldest last-in, so order is kept
+            await redis.rpush(FEEDBACK_QUEUE_KEY, *reversed(retry))
+        if dead:
+            await redis.lpush(FEEDBACK_DEAD_LETTER_KEY, *dead)
+            logger.error(
+                "Moved %s feedback notifications to %s (%s)", len(dead), FEEDBACK_DEAD_LETTER_KEY,
+                "out of attempts" if transient else "permanent failure"
+            )
+    except Exception as e:
+        logger.error("Dropped %s feedback notifications: %s", len(events), e)
+
+
+async def run_digest_worker() -> None:
+    """Consume the feedback queue forever; started from the app lifespan when Redis is configured"""
+    logger.info("Feedback digest worker started (window=%ss)", DIGEST_WINDOW_SECONDS)
+
+    while True:
+        try:
+            events = await _collect_batch()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Could not read the feedback queue: %s", e)
+            await asyncio.sleep(RETRY_DELAY_SECONDS)
+            continue
+
+        attempts = [event.pop(ATTEMPTS_FIELD, 0) + 1 for event in events]
+        if await EmailService.send_feedback_digest_to_team(events):
+            continue
+
+        logger.error("Feedback digest for %s events was not sent", len(events))
+        await _requeue_failed(events, attempts, transient=last_failure_transient.get())
+        await asyncio.sleep(RETRY_DELAY_SECONDS)
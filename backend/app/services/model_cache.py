@@ -0,0 +1,18 @@
+# backend/app/services/model_cache.py
+"""
+In-process caches for per-user model data. Anything that creates, updates or
+deletes a model row should call invalidate_user_models() so readers don't
+serve stale numbers for the rest of the TTL.
+"""
+from app.utils.ttl_cache import TTLCache
+
+# calculate_model_summary() result per user; paging through /models doesn't change it
+summary_cache = TTLCache(ttl=30, maxsize=10_000)
+
+# Analytics payloads keyed by (kind, model_id, predictions_url, ...). Predictions never change
+# once written and a retrain writes a new file, so the URL doubles as the version
+analytics_cache = TTLCache(ttl=3600, maxsize=256)
+
+
+def invalidate_user_models(user_id: str) -> None:
+    summary_cache.pop(f"summary:{user_id}")
@@ -2,9 +2,11 @@
 import joblib
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Union
-from datetime import datetime
+from typing import Dict, Any, List, Tuple, Union
+from collections import OrderedDict
+from datetime import datetime, timezone
 import io
+import threading
 from app.db.supabase_client import supabase
 
 
@@ -14,26 +16,30 @@ class PredictionError(Exception):
 
 
 class ModelStore:
-    """Handles model loading and caching"""
+    """Handles model loading and caching (LRU, keyed by model id)"""
 
-    def __init__(self):
-        self._cache = {}
-        self._cache_limit = 10  # Maximum models to keep in memory
+    def __init__(self, cache_limit: int = 10):
+        self._cache: "OrderedDict[Any, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._cache_limit = cache_limit  # Maximum models to keep in memory
+        self._lock = threading.Lock()  # load_model may run in worker threads
 
     def load_model(self, model_url: str, model_id: int) -> Dict[str, Any]:
         """
         Load model from storage with caching
 
         Args:
-            model_url: URL of model in storage
+            model_url: URL of model in storage (a different URL for the same id forces a reload)
             model_id: Model identifier for caching
 
         Returns:
             Dict containing model, preprocessor, and metadata
         """
         # Check cache first
-        if model_id in self._cache:
-            return self._cache[model_id]
+        with self._lock:
+            cached = self._cache.get(model_id)
+            if cached is not None and cached[0] == model_url:
+                self._cache.move_to_end(model_id)
+                return cached[1]
 
         try:
             print(f"[ModelStore] Loading model {model_id}")
@@ -53,33 +59,32 @@ class ModelStore:
             # Download from Supabase storage
             model_bytes = supabase.storage.from_('models').download(file_path)
 
-            # Load model bundle
+            # Load model bundle straight from memory, no temp file
             model_bundle = joblib.load(io.BytesIO(model_bytes))
 
-            # Cache the model
-            self._cache[model_id] = model_bundle
-
-            # Implement simple LRU cache by removing oldest if limit exceeded
-            if len(self._cache) > self._cache_limit:
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
-
-            return model_bundle
-
         except Exception as e:
             raise PredictionError(f"Failed to load model: {str(e)}")
 
+        # Cache the model, evicting the least recently used beyond the limit
+        with self._lock:
+            self._cache[model_id] = (model_url, model_bundle)
+            self._cache.move_to_end(model_id)
+            while len(self._cache) > self._cache_limit:
+                self._cache.popitem(last=False)
+
+        return model_bundle
+
     def clear_cache(self):
         """Clear all cached models"""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
 
     def remove_from_cache(self, model_id: int):
         """Remove specific model from cache"""
-        if model_id in self._cache:
-            del self._cache[model_id]
+        with self._lock:
+            self._cache.pop(model_id, None)
 
 
-# Global model store instance
 model_store = ModelStore()
 
 
@@ -91,6 +96,8 @@ class PredictionService:
         self.preprocessor = model_bundle.get('preprocessor')
         self.model_type = model_bundle.get('model_type')
         self.problem_type = model_bundle.get('problem_type')
+        # Models trained before features were downcast have no entry and keep float64 inputs
+        self.feature_dtype = model_bundle.get('feature_dtype')
 
         if self.model is None:
             raise PredictionError("Model not found in bundle")
@@ -124,6 +131,8 @@ class PredictionService:
             # Preprocess input
             if self.preprocessor is not None:
                 X_processed = self.preprocessor.transform(df)
+                if self.feature_dtype:
+                    X_processed = X_processed.astype(self.feature_dtype, copy=False)
             else:
                 X_processed = df.values
 
@@ -263,12 +272,14 @@ async def predict(
 
         # Save predictions if requested
         if save_predictions:
+            # One timestamp for both writes
+            now_iso = datetime.now(timezone.utc).isoformat()
             prediction_data = {
                 "model_id": model_id,
                 "user_id": user_id,
                 "predictions": result['predictions'],
                 "n_samples": result['n_samples'],
-                "predicted_at": datetime.utcnow().isoformat()
+                "predicted_at": now_iso
             }
 
             if 'probabilities' in result:
@@ -278,7 +289,7 @@ async def predict(
 
             # Update model last_used timestamp
             supabase.table("models").update({
-                "last_used_at": datetime.utcnow().isoformat()
+                "last_used_at": now_iso
             }).eq("id", model_id).execute()
 
         return {
@@ -347,7 +358,7 @@ async def predict_from_file(
             "model_id": model_id,
             "user_id": user_id,
             "n_samples": result['n_samples'],
-            "predicted_at": datetime.utcnow().isoformat(),
+            "predicted_at": datetime.now(timezone.utc).isoformat(),
             "source_file": file.filename
         }
 
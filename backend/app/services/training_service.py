@@ -1,8 +1,11 @@
 # app/services/training_service.py
 import numpy as np
 import pandas as pd
-import joblib, os, io, time, tempfile, json
-from datetime import datetime
+import asyncio
+import logging
+import joblib, io, time, traceback
+import orjson
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 
 from sklearn.utils.validation import check_is_fitted
@@ -10,24 +13,92 @@ from sklearn.exceptions import NotFittedError
 from sklearn.exceptions import UndefinedMetricWarning
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import PolynomialFeatures
-from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
-
-from app.db.supabase_client import supabase
-from app.services.data_preprocessing import preprocess_dataset, DataPreprocessingError
+from sklearn.metrics import (
+    accuracy_score,
+    mean_absolute_error,
+    mean_squared_error,
+    precision_recall_fscore_support,
+    r2_score,
+)
+
+from app.core.config import get_settings
+from app.db.supabase_client import supabase, run_query, upload_object, is_missing_column
+from app.services.data_preprocessing import preprocess_dataset, DataPreprocessingError, FEATURE_DTYPE
+from app.services.model_cache import invalidate_user_models
+from app.services.analytics_service import (
+    analytics_sidecar_path,
+    build_classification_analytics,
+    build_regression_analytics,
+)
 from app.core.model_registry import get_model
 from app.core.model_selector import AutoModelSelector
-from app.utils.safe_label_encoding import SafeLabelEncoder, safe_encode_labels, validate_label_distribution
+from app.utils.safe_label_encoding import (
+    SafeLabelEncoder,
+    identity_encode_labels,
+    safe_encode_labels,
+    validate_label_distribution,
+)
 import warnings
 
+logger = logging.getLogger(__name__)
+
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 warnings.filterwarnings("ignore", category=UndefinedMetricWarning)
 
+# Model bundle compression: lz4 encodes far faster than zlib at a similar ratio when installed;
+# otherwise zlib level 3. joblib.load detects either format on its own
+try:
+    import lz4.frame  # noqa: F401
+    MODEL_COMPRESSION = ("lz4", 3)
+except ImportError:
+    MODEL_COMPRESSION = 3
+
+# models columns added by later migrations; dropped from the insert when the database doesn't have them yet
+OPTIONAL_MODEL_COLUMNS = ("feature_importance", "prediction_samples")
+
+# Physical cores (cgroup-aware): tree ensembles gain nothing from hyperthread siblings
+PHYSICAL_CORES = joblib.cpu_count(only_physical_cores=True)
+
+class _NameSafeTable(dict):
+    """str.translate table for model names: alphanumerics, "_" and "-" are kept, anything else
+    becomes "_". Filled lazily so any code point is covered; repeats are C-level dict hits."""
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        self[codepoint] = value = char if char.isalnum() or char in "_-" else "_"
+        return value
+
+
+_NAME_SAFE_TABLE = _NameSafeTable()
+
 
 class ModelTrainingError(Exception):
     pass
 
 
+def _json_array(values) -> Any:
+    """The ndarray itself when orjson can serialize it natively (numeric / bool), else a list."""
+    values = np.asarray(values)
+    return np.ascontiguousarray(values) if values.dtype.kind in "fiub" else values.tolist()
+
+
+def _float_target(y) -> np.ndarray:
+    """Regression target as a 1-D float64 array; zero-copy when it already is one."""
+    if isinstance(y, np.ndarray) and y.dtype == np.float64 and y.ndim == 1:
+        return y
+    return np.asarray(y, dtype=np.float64).ravel()
+
+
+def _has_float_values(y_numeric) -> bool:
+    """True if any non-NaN value has a fractional part (one vectorized pass, no int copy)."""
+    y_numeric = np.asarray(y_numeric)
+    if y_numeric.dtype.kind in "iub":
+        return False
+    values = y_numeric[~np.isnan(y_numeric)]
+    return bool(np.any(np.mod(values, 1) != 0))
+
+
 class ModelTrainer:
     """Encapsulates model initialization, training, and metrics computation."""
 
@@ -40,6 +111,7 @@ class ModelTrainer:
         self.y_test_predicted = None
         self.feature_names = None
         self.label_encoding_stats = None  # Store encoding statistics
+        self._inferred_problem_type = None  # Set by the caller when it already ran inference
 
     def initialize_model(
             self,
@@ -70,7 +142,7 @@ class ModelTrainer:
     def _get_default_params(self, model_type: str):
         """Default hyperparameters for common models."""
         defaults = {
-            "random_forest": {"n_estimators": 100, "max_depth": 10, "random_state": 42, "n_jobs": -1},
+            "random_forest": {"n_estimators": 100, "max_depth": 10, "random_state": 42, "n_jobs": PHYSICAL_CORES},
             "ridge": {"alpha": 1.0, "random_state": 42},
             "lasso": {"alpha": 1.0, "random_state": 42},
             "svr": {"kernel": "rbf", "C": 1.0},
@@ -82,23 +154,23 @@ class ModelTrainer:
         }
         return defaults.get(model_type, {})
 
-    def _infer_problem_type(self, y):
-        """Automatically detect if target is classification or regression."""
+    def _infer_problem_type(self, y, n_unique: Optional[int] = None):
+        """Automatically detect if target is classification or regression.
+
+        Pass n_unique (non-null distinct count) when the caller has already computed it.
+        """
         y_array = np.asarray(y).ravel()
-        n_unique = len(np.unique(y_array[~pd.isna(y_array)]))
-        n_samples = len(y_array)
 
-        try:
-            y_numeric = pd.to_numeric(y_array, errors='coerce')
-            has_floats = not np.allclose(y_numeric[~np.isnan(y_numeric)],
-                                         y_numeric[~np.isnan(y_numeric)].astype(int),
-                                         equal_nan=True)
-        except:
-            has_floats = False
-
-        if y_array.dtype == object or y_array.dtype.name.startswith('str'):
+        # String / object targets are always classes; skip the numeric checks entirely
+        if y_array.dtype.kind in "OUS":
             return "classification"
-        elif n_unique < 20 and n_unique < (0.05 * n_samples) and not has_floats:
+
+        if n_unique is None:
+            n_unique = pd.Series(y_array).nunique(dropna=True)
+        n_samples = len(y_array)
+        has_floats = _has_float_values(pd.to_numeric(y_array, errors='coerce'))
+
+        if n_unique < 20 and n_unique < (0.05 * n_samples) and not has_floats:
             return "classification"
         else:
             return "regression"
@@ -112,6 +184,13 @@ class ModelTrainer:
         """
         print("[ModelTrainer] Starting safe label encoding...")
 
+        # Already 0..K-1 integer codes (and every test label seen): nothing to encode
+        identity = identity_encode_labels(y_train, y_test, handle_unknown='use_mode')
+        if identity is not None:
+            y_train_encoded, y_test_encoded, self.label_encoder, self.label_encoding_stats = identity
+            logger.debug("Labels already integer-encoded, skipping re-encoding")
+            return y_train_encoded, y_test_encoded
+
         # FIX: Validate label distribution before encoding
         validation = validate_label_distribution(y_train, y_test, min_samples_per_class=1)
 
@@ -154,11 +233,11 @@ class ModelTrainer:
 
         # FIX: Handle labels based on problem type with safe encoding
         if self.problem_type == "classification":
-            detected_type = self._infer_problem_type(y_train)
+            detected_type = self._inferred_problem_type or self._infer_problem_type(y_train)
             if detected_type == "regression":
                 raise ModelTrainingError(
                     f"Classification model selected but target appears to be continuous. "
-                    f"Found {len(np.unique(y_train))} unique values. "
+                    f"Found {pd.unique(np.asarray(y_train).ravel()).size} unique values. "
                     f"Please use regression models or verify your target column."
                 )
 
@@ -167,8 +246,8 @@ class ModelTrainer:
 
         else:
             # Regression - convert to float
-            y_train_processed = pd.Series(y_train).astype(float).to_numpy()
-            y_test_processed = pd.Series(y_test).astype(float).to_numpy()
+            y_train_processed = _float_target(y_train)
+            y_test_processed = _float_target(y_test)
 
         # Train model
         try:
@@ -204,9 +283,10 @@ class ModelTrainer:
         result = {
             "training_time": train_time,
             "metrics": metrics,
+            # Arrays are serialized straight from their buffers by orjson (OPT_SERIALIZE_NUMPY)
             "predictions": {
-                "actual": y_test_processed.tolist(),
-                "predicted": y_pred.tolist()
+                "actual": _json_array(y_test_processed),
+                "predicted": _json_array(y_pred)
             },
             **self._extract_model_details()
         }
@@ -222,18 +302,20 @@ class ModelTrainer:
         return result
 
     def _regression_metrics(self, y_true, y_pred):
+        mse = float(mean_squared_error(y_true, y_pred))
         return {
             "r2_score": float(r2_score(y_true, y_pred)),
-            "mse": float(mean_squared_error(y_true, y_pred)),
+            "mse": mse,
             "mae": float(mean_absolute_error(y_true, y_pred)),
-            "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+            "rmse": float(np.sqrt(mse)),
         }
 
     def _classification_metrics(self, y_true, y_pred):
-        from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-
-        y_true = np.asarray(y_true).ravel().astype(int)
-        y_pred = np.asarray(y_pred).ravel().astype(int)
+        # Encoded labels are 0..K-1, so a narrow dtype holds them; without an encoder keep int64
+        classes = getattr(self.label_encoder, "classes_", None)
+        dtype = np.int16 if classes is not None and len(classes) < np.iinfo(np.int16).max else np.int64
+        y_true = np.asarray(y_true, dtype=dtype).ravel()
+        y_pred = np.asarray(y_pred, dtype=dtype).ravel()
 
         # FIX: Handle edge cases in metric calculation
         unique_classes = np.unique(y_true)
@@ -252,15 +334,16 @@ class ModelTrainer:
         average = "binary" if n_classes == 2 else "weighted"
 
         try:
-            precision = float(precision_score(y_true, y_pred, average=average, zero_division=0))
-            recall = float(recall_score(y_true, y_pred, average=average, zero_division=0))
-            f1 = float(f1_score(y_true, y_pred, average=average, zero_division=0))
+            # One multilabel-confusion pass yields all three scores
+            precision, recall, f1, _ = precision_recall_fscore_support(
+                y_true, y_pred, average=average, zero_division=0
+            )
 
             return {
                 "accuracy": accuracy,
-                "precision": precision,
-                "recall": recall,
-                "f1_score": f1,
+                "precision": float(precision),
+                "recall": float(recall),
+                "f1_score": float(f1),
             }
         except Exception as e:
             print(f"[Trainer] Metric calculation warning: {e}")
@@ -282,27 +365,52 @@ class ModelTrainer:
             print(f"[Trainer] Model not fitted, skipping detail extraction: {e}")
             return details
 
+        # Slice before .tolist() so only the kept values become Python floats
         if hasattr(model, "coef_"):
-            details["coefficients"] = model.coef_.ravel().tolist()[:100]
+            details["coefficients"] = np.ravel(model.coef_)[:100].tolist()
         if hasattr(model, "intercept_"):
             details["intercept"] = float(np.ravel(model.intercept_)[0])
         if hasattr(model, "feature_importances_"):
-            details["feature_importances"] = model.feature_importances_.tolist()[:100]
+            details["feature_importances"] = np.asarray(model.feature_importances_)[:100].tolist()
 
         return details
 
-    def save_model(self, path, preprocessor=None):
-        """Save model bundle with all necessary components."""
-        bundle = {
+    def _feature_importance(self):
+        """Per-feature importance (tree importances, or |coef| for linear models); None if unavailable."""
+        model = self.model.named_steps["model"] if isinstance(self.model, Pipeline) else self.model
+        if hasattr(model, "feature_importances_"):
+            return np.asarray(model.feature_importances_, dtype=float).tolist()
+        if hasattr(model, "coef_"):
+            coef = np.asarray(model.coef_, dtype=float)
+            return np.abs(coef[0] if coef.ndim > 1 else coef).tolist()
+        return None
+
+    def _model_bundle(self, preprocessor=None) -> Dict[str, Any]:
+        """Model bundle with all necessary components for prediction."""
+        return {
             "model": self.model,
             "preprocessor": preprocessor,
             "label_encoder": self.label_encoder,  # SafeLabelEncoder instance
             "model_type": self.model_type,
             "problem_type": self.problem_type,
             "feature_names": self.feature_names,
-            "label_encoding_stats": self.label_encoding_stats  # FIX: Save encoding stats
+            "label_encoding_stats": self.label_encoding_stats,  # FIX: Save encoding stats
+            "feature_dtype": np.dtype(FEATURE_DTYPE).name
         }
-        joblib.dump(bundle, path)
+
+    def save_model(self, path, preprocessor=None):
+        """Save model bundle with all necessary components."""
+        joblib.dump(self._model_bundle(preprocessor), path, compress=MODEL_COMPRESSION)
+
+    def save_model_bytes(self, preprocessor=None) -> bytes:
+        """Serialize the model bundle in memory, ready for upload.
+
+        Compressed with MODEL_COMPRESSION, which typically shrinks tree ensembles
+        several-fold; joblib.load decompresses transparently.
+        """
+        buffer = io.BytesIO()
+        joblib.dump(self._model_bundle(preprocessor), buffer, compress=MODEL_COMPRESSION)
+        return buffer.getvalue()
 
 
 async def train_model(
@@ -325,9 +433,10 @@ async def train_model(
 
         # STEP 1: Fetch dataset metadata
         print("[Training] Step 1/5: Fetching dataset metadata...")
-        dataset_result = supabase.table("datasets").select("metadata, file_url").eq(
-            "id", dataset_id
-        ).eq("user_id", user_id).execute()
+        # The full row is handed to preprocess_dataset so it doesn't fetch it again
+        dataset_result = await run_query(
+            supabase.table("datasets").select("*").eq("id", dataset_id).eq("user_id", user_id)
+        )
 
         if not dataset_result.data:
             raise ModelTrainingError(f"Dataset {dataset_id} not found for user {user_id}")
@@ -345,7 +454,8 @@ async def train_model(
             user_id=user_id,
             target_col=target_col,
             test_size=test_size,
-            use_target_encoder=use_target_encoder
+            use_target_encoder=use_target_encoder,
+            dataset_info=dataset_result.data[0]
         )
 
         X_train, X_test = preprocess_result["X_train"], preprocess_result["X_test"]
@@ -354,17 +464,20 @@ async def train_model(
         metadata = preprocess_result["preprocessing_result"]["metadata"]
 
         # STEP 3: Determine problem type
-        temp_trainer = ModelTrainer()
+        trainer = ModelTrainer()
+        detected_type = None
         if problem_type == "auto":
-            detected_type = temp_trainer._infer_problem_type(y_train)
+            detected_type = trainer._infer_problem_type(y_train)
             problem_type = detected_type
             print(f"[Training] Auto-detected problem type: {problem_type}")
-        else:
-            detected_type = temp_trainer._infer_problem_type(y_train)
+        elif problem_type == "classification" or np.asarray(y_train).dtype.kind in "OUS":
+            # Only sanity-check when a mismatch is plausible; numeric regression targets skip the pass
+            detected_type = trainer._infer_problem_type(y_train)
             if detected_type != problem_type:
                 print(f"[Training] WARNING: Specified '{problem_type}' but data suggests '{detected_type}'")
 
-        trainer = ModelTrainer(problem_type=problem_type)
+        trainer.problem_type = problem_type
+        trainer._inferred_problem_type = detected_type
 
         # STEP 4: Model selection or initialization
         print("[Training] Step 3/5: Initializing model...")
@@ -381,8 +494,8 @@ async def train_model(
                 label_encoder_backup = trainer.label_encoder
 
             else:
-                y_train_encoded = pd.Series(y_train).astype(float).to_numpy()
-                y_test_encoded = pd.Series(y_test).astype(float).to_numpy()
+                y_train_encoded = _float_target(y_train)
+                y_test_encoded = _float_target(y_test)
                 label_encoder_backup = None
 
             # FIX: AutoML with properly encoded labels
@@ -390,7 +503,7 @@ async def train_model(
             selector = AutoModelSelector(
                 task=flaml_task,
                 time_budget=60,
-                n_jobs=-1,
+                n_jobs=PHYSICAL_CORES,
                 estimator_list=["lgbm", "xgboost", "rf"],
                 metric="r2" if flaml_task == "regression" else "accuracy",
                 verbose=1
@@ -426,8 +539,8 @@ async def train_model(
                 "training_time": training_time,
                 "metrics": metrics,
                 "predictions": {
-                    "actual": y_test_encoded.tolist(),
-                    "predicted": y_pred.tolist()
+                    "actual": _json_array(y_test_encoded),
+                    "predicted": _json_array(y_pred)
                 },
                 **model_details
             }
@@ -477,31 +590,83 @@ async def train_model(
             model_name = user_input_name
 
         # Save model bundle
-        tmp_path = os.path.join(tempfile.gettempdir(), f"model_{dataset_id}.pkl")
-        trainer.save_model(tmp_path, preprocessor)
+        model_bytes = trainer.save_model_bytes(preprocessor)
 
-        with open(tmp_path, "rb") as f:
-            model_bytes = f.read()
-
-        filename = f"{user_id}/models/model_{dataset_id}_{int(time.time())}.pkl"
-        supabase.storage.from_("models").upload(filename, model_bytes, {"upsert": "true"})
+        # One clock reading shared by both filenames and the DB row
+        saved_at = datetime.now(timezone.utc)
+        saved_ts = int(saved_at.timestamp())
+        filename = f"{user_id}/models/model_{dataset_id}_{saved_ts}.pkl"
         model_url = supabase.storage.from_("models").get_public_url(filename)
 
         # Save predictions
-        predictions_filename = f"{user_id}/predictions/pred_{dataset_id}_{int(time.time())}.json"
+        predictions_filename = f"{user_id}/predictions/pred_{dataset_id}_{saved_ts}.json"
+        actual = np.asarray(trainer.y_test_actual if trainer.y_test_actual is not None
+                            else results["predictions"]["actual"])
+        predicted = np.asarray(trainer.y_test_predicted if trainer.y_test_predicted is not None
+                               else results["predictions"]["predicted"])
+        # Residuals are computed once here so analytics never has to
+        residuals = (actual - predicted
+                     if np.issubdtype(actual.dtype, np.number) and np.issubdtype(predicted.dtype, np.number)
+                     else None)
         predictions_data = {
-            "actual": (trainer.y_test_actual.tolist() if trainer.y_test_actual is not None
-                       else results["predictions"]["actual"]),
-            "predicted": (trainer.y_test_predicted.tolist() if trainer.y_test_predicted is not None
-                          else results["predictions"]["predicted"]),
-            "residuals": ((trainer.y_test_actual - trainer.y_test_predicted).tolist()
-                          if trainer.y_test_actual is not None else None)
+            "actual": _json_array(actual),
+            "predicted": _json_array(predicted),
+            "residuals": _json_array(residuals) if residuals is not None else None
         }
-        predictions_json = json.dumps(predictions_data)
-        supabase.storage.from_("models").upload(predictions_filename, predictions_json.encode(),
-                                                {"upsert": "true"})
+        predictions_json = await asyncio.to_thread(
+            orjson.dumps, predictions_data, option=orjson.OPT_SERIALIZE_NUMPY
+        )
         predictions_url = supabase.storage.from_("models").get_public_url(predictions_filename)
 
+        # The blobs are independent, so they upload concurrently
+        uploads = [
+            upload_object("models", filename, model_bytes),
+            upload_object("models", predictions_filename, predictions_json),
+        ]
+
+        # Compact float32 copy (rows: actual, predicted, residuals) next to the JSON for analytics
+        arrays = None
+        if problem_type == "regression" and residuals is not None:
+            arrays = np.stack([actual, predicted, residuals]).astype(np.float32)
+            arrays_buffer = io.BytesIO()
+            np.save(arrays_buffer, arrays)
+            uploads.append(upload_object("models", predictions_filename[:-len(".json")] + ".npy",
+                                         arrays_buffer.getvalue()))
+
+        # Precompute the default analytics view from the same data the endpoints would read
+        analytics_json = None
+        try:
+            analytics = None
+            if arrays is not None:
+                analytics = build_regression_analytics(arrays, results["metrics"].get("r2_score", 0))
+            elif problem_type == "classification":
+                analytics = build_classification_analytics(np.array(predictions_data["actual"]),
+                                                           np.array(predictions_data["predicted"]),
+                                                           results["metrics"])
+            if analytics is not None:
+                analytics_json = orjson.dumps(analytics, option=orjson.OPT_SERIALIZE_NUMPY)
+        except Exception as e:
+            # Not fatal: the analytics endpoints build the payload on demand
+            logger.warning("Could not precompute analytics: %s", e)
+
+        if analytics_json is not None:
+            async def _upload_analytics():
+                try:
+                    await upload_object("models", analytics_sidecar_path(predictions_filename), analytics_json)
+                except Exception as e:
+                    logger.warning("Could not upload precomputed analytics: %s", e)
+
+            uploads.append(_upload_analytics())
+
+        await asyncio.gather(*uploads)
+
+        try:
+            feature_importance = trainer._feature_importance()
+        except Exception as e:
+            # Only a stored shortcut for the feature-importance endpoint; never worth failing the run
+            logger.warning("Could not extract feature importance: %s", e)
+            feature_importance = None
+
         # Store in database
         db_data = {
             "user_id": user_id,
@@ -511,18 +676,22 @@ async def train_model(
             "problem_type": problem_type,
             "model_url": model_url,
             "predictions_url": predictions_url,
+            "prediction_samples": int(len(actual)),
             "target_column": target_col,
             "metrics": results["metrics"],
             "training_time": results["training_time"],
             "feature_columns": trainer.feature_names,
+            # Stored once here so the feature-importance endpoint never has to load the pickle
+            "feature_importance": feature_importance,
             "parameters": model_params or trainer._get_default_params(trainer.model_type),
             "status": "completed",
             "description": f"Trained {trainer.model_type} model on {target_col}",
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": saved_at.isoformat(),
         }
 
-        db_res = supabase.table("models").insert(db_data).execute()
+        db_res = await _insert_model_row(db_data)
         model_id = db_res.data[0]["id"]
+        invalidate_user_models(user_id)
 
         print(f"[Training] ✅ Complete! Model ID: {model_id}")
         print(f"[Training] Model: {trainer.model_type}")
@@ -541,11 +710,26 @@ async def train_model(
     except DataPreprocessingError as e:
         raise ModelTrainingError(f"Preprocessing failed: {str(e)}")
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        if get_settings().train_debug:
+            traceback.print_exc()
         raise ModelTrainingError(f"Training failed: {str(e)}")
 
 
+async def _insert_model_row(db_data: Dict[str, Any]):
+    """Insert the models row; if the database predates OPTIONAL_MODEL_COLUMNS, retry without them."""
+    try:
+        return await run_query(supabase.table("models").insert(db_data))
+    except Exception as e:
+        optional = [key for key in OPTIONAL_MODEL_COLUMNS if key in db_data]
+        if not optional or not is_missing_column(e):
+            raise
+        # The rejected insert wrote nothing, so sending it again is safe
+        logger.warning("models table is missing %s (migration not applied?), saving without them: %s", optional, e)
+    return await run_query(
+        supabase.table("models").insert({k: v for k, v in db_data.items() if k not in optional})
+    )
+
+
 # Keep existing helper functions
 async def check_model_name_exists(user_id: str, model_name: str) -> bool:
     """Check if a model name already exists for a user."""
@@ -563,6 +747,46 @@ async def check_model_name_exists(user_id: str, model_name: str) -> bool:
         return False
 
 
+async def _fetch_existing_names(user_id: str, prefix: str) -> set:
+    """All of the user's model names starting with prefix, in one query."""
+    try:
+        # '_' in prefix is a LIKE wildcard, so this can over-match; callers test exact membership
+        result = await run_query(
+            supabase.table("models")
+            .select("model_name")
+            .eq("user_id", user_id)
+            .like("model_name", f"{prefix}%")
+        )
+        return {row["model_name"] for row in result.data}
+    except Exception as e:
+        logger.warning("Error checking model names: %s", e)
+        return set()
+
+
+async def validate_train_request(dataset_id: str, user_id: str, model_name: Optional[str]) -> tuple:
+    """Return (dataset_owned, name_taken) for a training request in one round-trip.
+
+    Uses the validate_train_request() SQL function; falls back to running both lookups
+    concurrently if it isn't deployed. name_taken is False when no model_name is given.
+    """
+    try:
+        result = await run_query(
+            supabase.rpc("validate_train_request", {"did": dataset_id, "uid": user_id, "mname": model_name})
+        )
+        return bool(result.data["dataset_exists"]), bool(result.data["name_taken"])
+    except Exception as e:
+        logger.warning("validate_train_request RPC unavailable, checking separately: %s", e)
+
+    async def name_taken() -> bool:
+        return bool(model_name) and await check_model_name_exists(user_id, model_name)
+
+    dataset_result, taken = await asyncio.gather(
+        run_query(supabase.table("datasets").select("id").eq("id", dataset_id).eq("user_id", user_id)),
+        name_taken()
+    )
+    return bool(dataset_result.data), taken
+
+
 async def generate_unique_model_name(
         user_id: str,
         base_name: str,
@@ -570,26 +794,27 @@ async def generate_unique_model_name(
         target_col: str
 ) -> str:
     """Generate a unique model name for the user."""
-    from datetime import datetime
-
     if not base_name:
         base_name = f"{model_type}_{target_col}"
 
-    base_name = "".join(c if c.isalnum() or c in ['_', '-'] else '_' for c in base_name)
+    base_name = base_name.translate(_NAME_SAFE_TABLE)
 
-    if not await check_model_name_exists(user_id, base_name):
+    # Every candidate starts with base_name, so one query covers them all
+    existing = await _fetch_existing_names(user_id, base_name)
+
+    if base_name not in existing:
         return base_name
 
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     name_with_timestamp = f"{base_name}_{timestamp}"
 
-    if not await check_model_name_exists(user_id, name_with_timestamp):
+    if name_with_timestamp not in existing:
         return name_with_timestamp
 
     counter = 1
     while True:
         unique_name = f"{base_name}_{timestamp}_{counter}"
-        if not await check_model_name_exists(user_id, unique_name):
+        if unique_name not in existing:
             return unique_name
         counter += 1
         if counter > 100:
@@ -609,29 +834,28 @@ async def analyze_target_column(
 
         file_url = dataset.data[0]["file_url"]
         response = supabase.storage.from_("datasets").download(file_url.split("/datasets/")[-1])
-        df = pd.read_csv(io.BytesIO(response))
+        # Only the target column is materialized; a missing column yields an empty frame
+        df = pd.read_csv(io.BytesIO(response), usecols=lambda col: col == target_col)
 
         if target_col not in df.columns:
             raise ValueError(f"Target column '{target_col}' not found in dataset")
 
         y = df[target_col].dropna()
+        # Hash-based distinct values, computed once; only the distinct values get sorted
+        unique_values = y.unique()
+        n_unique = len(unique_values)
+
         trainer = ModelTrainer()
-        detected_type = trainer._infer_problem_type(y)
+        detected_type = trainer._infer_problem_type(y, n_unique=n_unique)
 
-        n_unique = len(np.unique(y))
         n_samples = len(y)
         unique_ratio = n_unique / n_samples
 
-        try:
-            y_numeric = pd.to_numeric(y, errors='coerce')
-            has_floats = not np.allclose(y_numeric[~np.isnan(y_numeric)],
-                                         y_numeric[~np.isnan(y_numeric)].astype(int))
-            is_numeric = y.dtype in ['int64', 'float64'] or not y_numeric.isna().all()
-        except:
-            has_floats = False
-            is_numeric = False
-
-        sample_values = np.unique(y)[:10].tolist()
+        y_numeric = pd.to_numeric(y, errors='coerce')
+        has_floats = _has_float_values(y_numeric.to_numpy(dtype=float, na_value=np.nan))
+        is_numeric = y.dtype in ['int64', 'float64'] or not y_numeric.isna().all()
+
+        sample_values = np.sort(unique_values)[:10].tolist()
         warnings_list = []
 
         if detected_type == "regression" and n_unique < 10:
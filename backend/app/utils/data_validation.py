@@ -3,12 +3,60 @@
 Defensive data validation and schema inference layer.
 Handles all edge cases before preprocessing begins.
 """
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+from pandas.api.types import infer_dtype
 from typing import Dict, List, Tuple, Any, Optional
 import warnings
 from dataclasses import dataclass, asdict
 
+logger = logging.getLogger(__name__)
+
+# Type inference looks at a random sample of at most this many non-null values per column
+INFERENCE_SAMPLE_CAP = 1_000_000
+
+# infer_dtype kinds whose values can never parse as numbers / as datetimes,
+# so the corresponding conversion probe can be skipped outright
+_NON_NUMERIC_KINDS = {'datetime', 'date', 'time', 'period', 'interval'}
+_NON_DATETIME_KINDS = {'time', 'period', 'interval'}
+
+# Superset of the strings pd.to_numeric parses; text columns where few sampled values even
+# look numeric can't reach the 80% conversion threshold, so the parse is skipped for them
+_NUMBER_LIKE = re.compile(
+    r'^\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*$|^\s*[+-]?(?:inf|infinity)\s*$',
+    re.IGNORECASE
+)
+NUMERIC_PRECHECK_SAMPLE = 10_000
+
+# Wide frames get their (independent) column analyses spread over a small thread pool;
+# below PARALLEL_MIN_COLUMNS the pool costs more than it saves
+PARALLEL_MIN_COLUMNS = 16
+ANALYSIS_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _is_integral(values) -> bool:
+    """True if every value is a whole number; integer / bool dtypes answer without a pass.
+
+    Float arrays are checked with a modulo pass (a leading 10k slice first, so most
+    fractional columns stop early) instead of an astype(int) copy plus allclose.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        return True
+    if values.dtype.kind != "f":
+        return bool(np.allclose(values, values.astype(int)))
+    with np.errstate(invalid="ignore"):  # inf % 1 is NaN, i.e. not integral
+        if len(values) > NUMERIC_PRECHECK_SAMPLE and np.any(values[:NUMERIC_PRECHECK_SAMPLE] % 1):
+            return False
+        if np.any(values % 1):
+            return False
+    # Whole numbers outside the int64 range still can't be treated as integers
+    return len(values) == 0 or bool(np.abs(values).max() < 2 ** 63)
+
 
 @dataclass
 class ColumnHealth:
@@ -71,21 +119,31 @@ class DataValidator:
         Returns:
             Tuple of (cleaned_df, health_report)
         """
-        print("\n" + "=" * 60)
-        print("🔍 STARTING DEFENSIVE DATA VALIDATION")
-        print("=" * 60)
+        logger.debug("Starting defensive data validation")
 
         if df is None or df.empty:
             raise ValueError("Dataset is empty or None")
 
         original_shape = df.shape
-        print(f"📊 Original dataset: {original_shape[0]} rows × {original_shape[1]} columns")
+        logger.debug("Original dataset: %d rows × %d columns", original_shape[0], original_shape[1])
 
         # Step 1: Infer schema for all columns
-        print("\n1️⃣  Inferring column schemas...")
-        column_reports = {}
-        for col in df.columns:
-            column_reports[col] = self._analyze_column(df[col], col)
+        logger.debug("Step 1: inferring column schemas")
+        # Null and distinct counts for every column in one frame-level pass each
+        null_counts = df.isna().sum()
+        unique_counts = df.nunique(dropna=True)
+
+        def analyze(col) -> ColumnHealth:
+            return self._analyze_column(
+                df[col], col, null_count=null_counts[col], unique_count=int(unique_counts[col])
+            )
+
+        if len(df.columns) >= PARALLEL_MIN_COLUMNS and ANALYSIS_WORKERS > 1:
+            with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as pool:
+                reports = list(pool.map(analyze, df.columns))
+        else:
+            reports = [analyze(col) for col in df.columns]
+        column_reports = dict(zip(df.columns, reports))
 
         # Step 2: Analyze target column (if specified)
         target_health = None
@@ -94,16 +152,16 @@ class DataValidator:
             if target_col not in df.columns:
                 raise ValueError(f"Target column '{target_col}' not found in dataset")
 
-            print(f"\n2️⃣  Analyzing target column: '{target_col}'")
+            logger.debug("Step 2: analyzing target column '%s'", target_col)
             target_health = column_reports[target_col]
             recommended_problem_type = self._infer_problem_type(df[target_col], target_health)
-            print(f"   ✓ Recommended problem type: {recommended_problem_type}")
-            print(f"   ✓ Target type: {target_health.inferred_type}")
-            print(f"   ✓ Unique values: {target_health.unique_count}")
+            logger.debug(
+                "Recommended problem type: %s, target type: %s, unique values: %d",
+                recommended_problem_type, target_health.inferred_type, target_health.unique_count
+            )
 
         # Step 3: Clean and coerce columns
-        print("\n3️⃣  Cleaning and coercing columns...")
-        cleaned_df = df.copy()
+        logger.debug("Step 3: cleaning and coercing columns")
         dropped_cols = []
         coerced_cols = []
 
@@ -113,21 +171,25 @@ class DataValidator:
                 continue
 
             if health.recommended_action == 'drop':
-                print(f"   ❌ Dropping '{col_name}': {', '.join(health.issues)}")
-                cleaned_df = cleaned_df.drop(columns=[col_name])
+                logger.warning("Dropping '%s': %s", col_name, ', '.join(health.issues))
                 dropped_cols.append(col_name)
 
             elif health.recommended_action == 'coerce':
-                print(f"   🔄 Coercing '{col_name}' to {health.coerce_to_dtype}")
-                cleaned_df[col_name] = self._coerce_column(
-                    cleaned_df[col_name],
-                    health.coerce_to_dtype
-                )
+                logger.debug("Coercing '%s' to %s", col_name, health.coerce_to_dtype)
                 coerced_cols.append(col_name)
 
+        # One drop builds the cleaned frame (a new object, so df itself is never mutated);
+        # coerced columns then replace their originals in place
+        cleaned_df = df.drop(columns=dropped_cols)
+        for col_name in coerced_cols:
+            cleaned_df[col_name] = self._coerce_column(
+                cleaned_df[col_name],
+                column_reports[col_name].coerce_to_dtype
+            )
+
         # Step 4: Handle target column
         if target_col and target_col in cleaned_df.columns:
-            print(f"\n4️⃣  Cleaning target column: '{target_col}'")
+            logger.debug("Step 4: cleaning target column '%s'", target_col)
             cleaned_df, target_health = self._clean_target_column(
                 cleaned_df,
                 target_col,
@@ -138,14 +200,14 @@ class DataValidator:
 
         # Step 5: Remove rows with null targets
         if target_col:
-            null_target_mask = cleaned_df[target_col].isna()
-            if null_target_mask.any():
-                n_null = null_target_mask.sum()
-                print(f"\n5️⃣  Removing {n_null} rows with null target values")
-                cleaned_df = cleaned_df[~null_target_mask].reset_index(drop=True)
+            non_null_df = cleaned_df.dropna(subset=[target_col])
+            n_null = len(cleaned_df) - len(non_null_df)
+            if n_null:
+                logger.warning("Removing %d rows with null target values", n_null)
+                cleaned_df = non_null_df.reset_index(drop=True)
 
         # Step 6: Final validation
-        print(f"\n6️⃣  Final validation...")
+        logger.debug("Step 6: final validation")
         valid_columns = [c for c in cleaned_df.columns if c != target_col]
 
         if len(valid_columns) == 0:
@@ -175,28 +237,37 @@ class DataValidator:
             recommended_problem_type=recommended_problem_type
         )
 
-        print("\n" + "=" * 60)
-        print("✅ VALIDATION COMPLETE")
-        print("=" * 60)
-        print(f"📊 Final dataset: {cleaned_df.shape[0]} rows × {cleaned_df.shape[1]} columns")
-        print(f"✓ Valid features: {len(valid_columns)}")
-        print(f"❌ Dropped columns: {len(dropped_cols)}")
-        print(f"🔄 Coerced columns: {len(coerced_cols)}")
-        if overall_issues:
-            print(f"⚠️  Warnings: {len(overall_issues)}")
-        print("=" * 60 + "\n")
+        logger.debug(
+            "Validation complete: %d rows × %d columns, %d valid features, %d dropped, %d coerced",
+            cleaned_df.shape[0], cleaned_df.shape[1], len(valid_columns), len(dropped_cols), len(coerced_cols)
+        )
+        for issue in overall_issues:
+            logger.warning("%s", issue)
 
         return cleaned_df, health_report
 
-    def _analyze_column(self, series: pd.Series, col_name: str) -> ColumnHealth:
-        """Analyze a single column and return health report"""
+    def _analyze_column(
+            self,
+            series: pd.Series,
+            col_name: str,
+            null_count: Optional[int] = None,
+            unique_count: Optional[int] = None
+    ) -> ColumnHealth:
+        """Analyze a single column and return health report.
+
+        null_count / unique_count may be passed in when already computed for the whole frame.
+        """
         n_total = len(series)
-        null_count = series.isna().sum()
+        if null_count is None:
+            # Plain float columns: count NaNs on the ndarray, skipping pandas' isna dispatch
+            values = series.to_numpy()
+            null_count = np.isnan(values).sum() if values.dtype.kind == 'f' else series.isna().sum()
         null_pct = (null_count / n_total) * 100 if n_total > 0 else 100
 
-        # Get non-null values for analysis
-        non_null = series.dropna()
-        unique_count = non_null.nunique() if len(non_null) > 0 else 0
+        # Get non-null values for analysis (no copy needed when nothing is missing)
+        non_null = series.dropna() if null_count else series
+        if unique_count is None:
+            unique_count = non_null.nunique() if len(non_null) > 0 else 0
         cardinality_ratio = unique_count / len(non_null) if len(non_null) > 0 else 0
 
         # Sample values
@@ -223,7 +294,7 @@ class DataValidator:
             )
 
         # Infer actual type
-        inferred_type, has_mixed, coerce_to = self._infer_column_type(non_null)
+        inferred_type, has_mixed, coerce_to = self._infer_column_type(non_null, n_unique=unique_count)
 
         # Check for single unique value
         if unique_count <= 1 and len(non_null) > 0:
@@ -260,10 +331,16 @@ class DataValidator:
             coerce_to_dtype=coerce_to
         )
 
-    def _infer_column_type(self, series: pd.Series) -> Tuple[str, bool, Optional[str]]:
+    def _infer_column_type(
+            self,
+            series: pd.Series,
+            n_unique: Optional[int] = None
+    ) -> Tuple[str, bool, Optional[str]]:
         """
         Infer actual column type from data.
 
+        n_unique is the distinct count of series, if the caller already has it.
+
         Returns:
             (inferred_type, has_mixed_types, coerce_to_dtype)
         """
@@ -272,40 +349,65 @@ class DataValidator:
 
         original_dtype = series.dtype
 
-        # Try numeric conversion
-        try:
-            numeric_series = pd.to_numeric(series, errors='coerce')
-            non_null_numeric = numeric_series.dropna()
-
-            # If >80% can be converted to numeric, treat as numeric
-            conversion_rate = len(non_null_numeric) / len(series)
-            if conversion_rate > 0.8:
-                has_mixed = conversion_rate < 1.0
-
-                # Check if all are integers
-                if np.allclose(non_null_numeric, non_null_numeric.astype(int)):
-                    return 'numeric', has_mixed, 'int64'
-                else:
-                    return 'numeric', has_mixed, 'float64'
-        except:
-            pass
+        # Parsing is the expensive part, so large columns are typed from a fixed sample;
+        # the conversion rate below is the sample's, extrapolated to the column
+        sample = (series.sample(n=INFERENCE_SAMPLE_CAP, random_state=0)
+                  if len(series) > INFERENCE_SAMPLE_CAP else series)
+
+        # One cheap scan of the sample decides which conversion probes can succeed
+        kind = infer_dtype(sample, skipna=True)
+        try_numeric = kind not in _NON_NUMERIC_KINDS and not (
+            kind == 'string' and self._number_like_rate(sample) < 0.5
+        )
+
+        # Try numeric conversion (a no-op for columns that already have a numeric dtype)
+        if try_numeric:
+            try:
+                numeric_series = sample if original_dtype.kind in "biuf" else pd.to_numeric(sample, errors='coerce')
+                non_null_numeric = numeric_series.dropna()
+
+                # If >80% can be converted to numeric, treat as numeric
+                conversion_rate = len(non_null_numeric) / len(sample)
+                if conversion_rate > 0.8:
+                    has_mixed = conversion_rate < 1.0
+
+                    # Check if all are integers
+                    if _is_integral(non_null_numeric):
+                        return 'numeric', has_mixed, 'int64'
+                    else:
+                        return 'numeric', has_mixed, 'float64'
+            except:
+                pass
 
         # Try datetime
-        try:
-            pd.to_datetime(series, errors='raise')
-            return 'datetime', False, 'datetime64[ns]'
-        except:
-            pass
+        if kind not in _NON_DATETIME_KINDS:
+            try:
+                # The values are non-null: if the first one doesn't parse, the column can't,
+                # so most non-date columns fail here instead of after a full parse
+                pd.to_datetime(sample.iloc[0])
+                pd.to_datetime(sample, errors='raise')
+                return 'datetime', False, 'datetime64[ns]'
+            except:
+                pass
 
         # Check if it's categorical
-        unique_ratio = series.nunique() / len(series)
+        if n_unique is None:
+            n_unique = series.nunique()
+        unique_ratio = n_unique / len(series)
 
-        if unique_ratio < 0.5 or series.nunique() < 50:
+        if unique_ratio < 0.5 or n_unique < 50:
             return 'categorical', False, 'object'
 
         # Default to text
         return 'text', False, 'object'
 
+    @staticmethod
+    def _number_like_rate(series: pd.Series) -> float:
+        """Share of (up to NUMERIC_PRECHECK_SAMPLE) string values that look like numbers."""
+        if len(series) > NUMERIC_PRECHECK_SAMPLE:
+            series = series.sample(n=NUMERIC_PRECHECK_SAMPLE, random_state=0)
+        return float(series.str.match(_NUMBER_LIKE).mean())
+
     def _coerce_column(self, series: pd.Series, target_dtype: str) -> pd.Series:
         """Safely coerce column to target dtype"""
         try:
@@ -318,7 +420,7 @@ class DataValidator:
             else:
                 return series
         except Exception as e:
-            print(f"   ⚠️  Coercion failed: {e}, keeping original")
+            logger.warning("Coercion failed: %s, keeping original", e)
             return series
 
     def _clean_target_column(
@@ -333,7 +435,7 @@ class DataValidator:
         if problem_type == 'regression':
             # Ensure target is numeric
             if target_health.inferred_type != 'numeric':
-                print(f"   🔄 Coercing target to numeric for regression")
+                logger.debug("Coercing target to numeric for regression")
                 df[target_col] = pd.to_numeric(df[target_col], errors='coerce')
                 target_health.coerce_to_dtype = 'float64'
                 target_health.inferred_type = 'numeric'
@@ -344,7 +446,7 @@ class DataValidator:
                 # Check if it's actually discrete
                 unique_count = df[target_col].nunique()
                 if unique_count < 20:
-                    print(f"   ℹ️  Target is numeric but has {unique_count} unique values - treating as categorical")
+                    logger.debug("Target is numeric but has %d unique values - treating as categorical", unique_count)
                     df[target_col] = df[target_col].astype(str)
                     target_health.inferred_type = 'categorical'
 
@@ -362,7 +464,7 @@ class DataValidator:
 
         # If categorical or text, must be classification
         if health.inferred_type in ['categorical', 'text']:
-            print(f"   ℹ️  Target is {health.inferred_type} → classification")
+            logger.debug("Target is %s → classification", health.inferred_type)
             return 'classification'
 
         # If numeric, check cardinality
@@ -371,23 +473,27 @@ class DataValidator:
                 numeric_vals = pd.to_numeric(non_null, errors='coerce').dropna()
 
                 # Check if all integers
-                is_all_integers = np.allclose(numeric_vals, numeric_vals.astype(int))
+                is_all_integers = _is_integral(numeric_vals)
 
                 # Classification if: few unique values AND integers
                 if unique_count < self.min_unique_for_regression and is_all_integers:
-                    print(f"   ℹ️  Target has {unique_count} discrete values → classification")
+                    logger.debug("Target has %d discrete values → classification", unique_count)
                     return 'classification'
 
                 # Classification if very low cardinality ratio
                 cardinality_ratio = unique_count / n_samples
                 if cardinality_ratio < 0.05:
-                    print(f"   ℹ️  Target has low cardinality ({cardinality_ratio:.2%}) → classification")
+                    logger.debug("Target has low cardinality (%.2f%%) → classification", cardinality_ratio * 100)
                     return 'classification'
 
-                print(f"   ℹ️  Target is continuous ({unique_count} unique values) → regression")
+                logger.debug("Target is continuous (%d unique values) → regression", unique_count)
                 return 'regression'
             except Exception as e:
-                print(f"   ⚠️  Error inferring problem type: {e}, defaulting to classification")
+                logger.warning("Error inferring problem type: %s, defaulting to classification", e)
                 return 'classification'
 
-        return 'classification'
\ No newline at end of file
+        return 'classification'
+
+
+# DataValidator holds only its thresholds, so callers using the defaults can share one instance
+default_validator = DataValidator()
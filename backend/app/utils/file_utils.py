@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import io
 from io import BytesIO
-from typing import Tuple
+from typing import Iterator, Tuple
 
 import pandas as pd
 
@@ -24,3 +25,33 @@ def parse_tabular_file(file_bytes: bytes, filename: str) -> Tuple[pd.DataFrame,
     return df, summary
 
 
+class ChunkedReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks (e.g. a streamed HTTP body).
+
+    Lets pd.read_csv parse a download as it arrives instead of from a fully buffered copy.
+    Closing it closes the iterator, which releases the underlying connection.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        close_chunks = getattr(self._chunks, "close", None)
+        if close_chunks is not None:
+            close_chunks()
+        super().close()
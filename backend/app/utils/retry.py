@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Postgres error codes worth retrying: serialization failure, deadlock, too many connections
+_TRANSIENT_PG_CODES = {"40001", "40P01", "53300"}
+
+
+def _status_of(exc: Exception) -> Optional[int]:
+    """HTTP status carried by an exception, across postgrest / httpx error types"""
+    for attr in ("status", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    if isinstance(getattr(response, "status_code", None), int):
+        return response.status_code
+    # postgrest.APIError puts the HTTP status in `code` when the body wasn't JSON
+    code = getattr(exc, "code", None)
+    if isinstance(code, int) or (isinstance(code, str) and code.isdigit() and len(code) == 3):
+        return int(code)
+    return None
+
+
+def is_transient(exc: Exception) -> bool:
+    """True for rate limiting, 5xx responses and dropped connections"""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if getattr(exc, "code", None) in _TRANSIENT_PG_CODES:
+        return True
+    status = _status_of(exc)
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def is_unsent(exc: Exception) -> bool:
+    """True only when the request provably never reached the server (connect failure, rate limit).
+
+    Safe to retry for non-idempotent writes: a read timeout or 5xx may come after the server
+    already committed, so retrying an INSERT on those can duplicate the row.
+    """
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    return _status_of(exc) == 429
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header on the failed response, if it sent one"""
+    response = getattr(exc, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+async def with_backoff(
+    op: Callable[[], Awaitable[T]],
+    max_retries: int = 5,
+    base: float = 0.2,
+    cap: float = 8.0,
+    jitter: float = 0.25,
+    retry_if: Callable[[Exception], bool] = is_transient,
+) -> T:
+    """Await op(), retrying transient failures with capped exponential backoff plus jitter.
+
+    A Retry-After header on the failed response raises the delay (still bounded by cap).
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await op()
+        except Exception as e:
+            if attempt == max_retries or not retry_if(e):
+                raise
+            delay = min(max(base * 2 ** attempt + random.random() * jitter, _retry_after(e) or 0), cap)
+            logger.warning("Transient error (%s), retry %s/%s in %.2fs", type(e).__name__, attempt + 1, max_retries, delay)
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
@@ -8,6 +8,9 @@ from sklearn.preprocessing import LabelEncoder
 from typing import Tuple, Optional, List, Dict, Any
 import warnings
 
+# Integer classes spanning at most this many values are looked up through a dense table
+INTEGER_LUT_MAX_SPAN = 1 << 16
+
 
 class SafeLabelEncoder:
     """
@@ -51,8 +54,14 @@ class SafeLabelEncoder:
         self.classes_ = self.encoder.classes_
 
         # FIX: Store most common class for fallback
-        unique, counts = np.unique(y_clean, return_counts=True)
-        self.mode_class_ = unique[np.argmax(counts)]
+        # classes_ is already the sorted distinct set, so count codes instead of re-sorting
+        # the labels; argmax keeps ties on the smallest class, as np.unique did
+        if y_clean.dtype.kind in "iu" and self.classes_.dtype.kind in "iu" \
+                and int(self.classes_[-1]) - int(self.classes_[0]) < INTEGER_LUT_MAX_SPAN:
+            codes, _ = self._integer_codes(y_clean)
+        else:
+            codes = np.searchsorted(self.classes_, y_clean)
+        self.mode_class_ = self.classes_[np.bincount(codes, minlength=len(self.classes_)).argmax()]
 
         # Initialize stats
         self.mapping_stats_ = {
@@ -77,14 +86,116 @@ class SafeLabelEncoder:
             raise ValueError("SafeLabelEncoder must be fitted before transform")
 
         y_array = np.asarray(y).ravel()
+
+        try:
+            encoded, unseen_mask, unseen_labels = self._transform_vectorized(y_array)
+        except TypeError:
+            # Labels numpy can't order against classes_ (e.g. mixed str / int objects)
+            encoded, unseen_mask, unseen_labels = self._transform_elementwise(y_array)
+
+        # FIX: Log and store unseen label statistics
+        if unseen_mask.any():
+            unique_unseen = np.unique([l for l in unseen_labels if not pd.isna(l)])
+            self.unseen_labels_.extend(unique_unseen.tolist())
+
+            warning_msg = (
+                f"WARNING: {unseen_mask.sum()} unseen labels encountered during transform. "
+                f"Unique unseen labels: {unique_unseen.tolist()[:10]}... "
+                f"Strategy: {self.handle_unknown}"
+            )
+            warnings.warn(warning_msg, UserWarning)
+            print(f"[SafeLabelEncoder] {warning_msg}")
+
+        # Update statistics
+        transform_stats = {
+            'total_samples': len(y_array),
+            'unseen_count': int(unseen_mask.sum()),
+            'unseen_labels': unique_unseen.tolist() if unseen_mask.any() else [],
+            'unseen_percentage': float(unseen_mask.sum() / len(y_array) * 100),
+            'strategy_used': self.handle_unknown
+        }
+
+        return encoded, transform_stats
+
+    def _transform_vectorized(self, y_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+        """Vectorized lookup: classes_ is sorted, so searchsorted finds each label's code.
+
+        Mirrors _transform_elementwise (NaN -> unknown_value, unseen -> strategy, and the
+        same error for the first offending element). Raises TypeError when the labels
+        can't be compared with classes_.
+        """
+        numeric = "biuf"
+        if (y_array.dtype.kind in numeric) != (self.classes_.dtype.kind in numeric) \
+                and "O" not in (y_array.dtype.kind, self.classes_.dtype.kind):
+            raise TypeError("labels and classes_ are not comparable")
+
+        nan_mask = np.asarray(pd.isna(y_array), dtype=bool)
+        valid_idx = np.flatnonzero(~nan_mask)
+        valid = y_array[valid_idx]
+
+        if valid.dtype.kind in "iu" and self.classes_.dtype.kind in "iu" \
+                and int(self.classes_[-1]) - int(self.classes_[0]) < INTEGER_LUT_MAX_SPAN:
+            codes, unseen_valid = self._integer_codes(valid)
+        else:
+            codes = np.searchsorted(self.classes_, valid)
+            in_range = codes < len(self.classes_)
+            unseen_valid = ~in_range
+            unseen_valid[in_range] = self.classes_[codes[in_range]] != valid[in_range]
+        unseen_idx = valid_idx[unseen_valid]
+
+        if self.handle_unknown == 'error' and (nan_mask.any() or len(unseen_idx)):
+            first_nan = np.argmax(nan_mask) if nan_mask.any() else len(y_array)
+            first_unseen = unseen_idx[0] if len(unseen_idx) else len(y_array)
+            if first_nan < first_unseen:
+                raise ValueError(f"NaN value encountered at index {first_nan}")
+            raise ValueError(
+                f"Label '{y_array[first_unseen]}' not seen during training. "
+                f"Known labels: {self.classes_}"
+            )
+
+        if self.handle_unknown == 'use_mode':
+            fallback = int(np.searchsorted(self.classes_, self.mode_class_))
+        else:  # use_encoded_value
+            fallback = self.unknown_value
+        codes[unseen_valid] = fallback
+
+        encoded = np.full(len(y_array), self.unknown_value, dtype=int)
+        encoded[valid_idx] = codes
+        unseen_mask = nan_mask.copy()
+        unseen_mask[unseen_idx] = True
+
+        return encoded, unseen_mask, y_array[unseen_idx].tolist()
+
+    def _integer_codes(self, labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Codes for integer labels via a dense label -> code table over classes_' range.
+
+        One gather per label instead of a binary search; -1 marks labels that aren't classes.
+        """
+        low, high = int(self.classes_[0]), int(self.classes_[-1])
+        table = np.full(high - low + 1, -1, dtype=np.intp)
+        table[self.classes_.astype(np.int64) - low] = np.arange(len(self.classes_))
+
+        codes = np.full(len(labels), -1, dtype=np.intp)
+        in_range = (labels >= low) & (labels <= high)
+        codes[in_range] = table[labels[in_range].astype(np.int64) - low]
+        return codes, codes < 0
+
+    def _transform_elementwise(self, y_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+        """Per-element fallback for labels of mixed / incomparable types."""
         encoded = np.zeros(len(y_array), dtype=int)
         unseen_mask = np.zeros(len(y_array), dtype=bool)
         unseen_labels = []
+        # NaN check hoisted out of the loop, and the mode's code looked up once
+        nan_mask = np.asarray(pd.isna(y_array), dtype=bool)
+        mode_code = None
+        # Hash lookup instead of scanning classes_ and calling encoder.transform per label;
+        # built here rather than in fit so encoders pickled before it still work
+        class_codes = {label: code for code, label in enumerate(self.classes_.tolist())}
 
         # FIX: Handle each element individually to catch unseen labels
         for i, label in enumerate(y_array):
             # Handle NaN
-            if pd.isna(label):
+            if nan_mask[i]:
                 if self.handle_unknown == 'error':
                     raise ValueError(f"NaN value encountered at index {i}")
                 encoded[i] = self.unknown_value
@@ -92,7 +203,11 @@ class SafeLabelEncoder:
                 continue
 
             # Check if label was seen during training
-            if label not in self.classes_:
+            try:
+                code = class_codes.get(label)
+            except TypeError:  # unhashable label: fall back to the array scan
+                code = self.encoder.transform([label])[0] if label in self.classes_ else None
+            if code is None:
                 unseen_mask[i] = True
                 unseen_labels.append(label)
 
@@ -103,36 +218,16 @@ class SafeLabelEncoder:
                     )
                 elif self.handle_unknown == 'use_mode':
                     # Map to most common class
-                    encoded[i] = self.encoder.transform([self.mode_class_])[0]
+                    if mode_code is None:
+                        mode_code = self.encoder.transform([self.mode_class_])[0]
+                    encoded[i] = mode_code
                 else:  # use_encoded_value
                     encoded[i] = self.unknown_value
             else:
                 # Normal encoding
-                encoded[i] = self.encoder.transform([label])[0]
+                encoded[i] = code
 
-        # FIX: Log and store unseen label statistics
-        if unseen_mask.any():
-            unique_unseen = np.unique([l for l in unseen_labels if not pd.isna(l)])
-            self.unseen_labels_.extend(unique_unseen.tolist())
-
-            warning_msg = (
-                f"WARNING: {unseen_mask.sum()} unseen labels encountered during transform. "
-                f"Unique unseen labels: {unique_unseen.tolist()[:10]}... "
-                f"Strategy: {self.handle_unknown}"
-            )
-            warnings.warn(warning_msg, UserWarning)
-            print(f"[SafeLabelEncoder] {warning_msg}")
-
-        # Update statistics
-        transform_stats = {
-            'total_samples': len(y_array),
-            'unseen_count': int(unseen_mask.sum()),
-            'unseen_labels': unique_unseen.tolist() if unseen_mask.any() else [],
-            'unseen_percentage': float(unseen_mask.sum() / len(y_array) * 100),
-            'strategy_used': self.handle_unknown
-        }
-
-        return encoded, transform_stats
+        return encoded, unseen_mask, unseen_labels
 
     def fit_transform(self, y) -> Tuple[np.ndarray, Dict[str, Any]]:
         """Fit and transform in one step."""
@@ -145,16 +240,18 @@ class SafeLabelEncoder:
         Handles unknown_value gracefully.
         """
         y_array = np.asarray(y).ravel()
+        if len(y_array) == 0:
+            return np.empty(0, dtype=object)
 
         # FIX: Handle unknown values in inverse transform
-        decoded = np.empty(len(y_array), dtype=object)
-        for i, encoded_val in enumerate(y_array):
-            if encoded_val == self.unknown_value:
-                decoded[i] = f"<UNKNOWN_{self.unknown_value}>"
-            elif encoded_val < 0 or encoded_val >= len(self.classes_):
-                decoded[i] = f"<INVALID_{encoded_val}>"
-            else:
-                decoded[i] = self.classes_[encoded_val]
+        unknown = y_array == self.unknown_value
+        invalid = ~unknown & ((y_array < 0) | (y_array >= len(self.classes_)))
+
+        # One gather for the valid codes; the flagged slots are overwritten below
+        decoded = self.classes_[np.where(unknown | invalid, 0, y_array)].astype(object)
+        decoded[unknown] = f"<UNKNOWN_{self.unknown_value}>"
+        for i in np.flatnonzero(invalid):
+            decoded[i] = f"<INVALID_{y_array[i]}>"
 
         return decoded
 
@@ -215,6 +312,51 @@ def safe_encode_labels(
     return y_train_encoded, y_test_encoded, encoder, combined_stats
 
 
+def identity_encode_labels(
+        y_train,
+        y_test,
+        handle_unknown: str = 'use_mode'
+) -> Optional[Tuple[np.ndarray, np.ndarray, SafeLabelEncoder, Dict[str, Any]]]:
+    """
+    Fast path for targets that are already integer codes 0..K-1 with no unseen test labels.
+
+    The encoding is then the identity, so the per-element transform is skipped. Returns the
+    same tuple as safe_encode_labels, or None when the labels don't qualify.
+    """
+    y_train_array = np.asarray(y_train).ravel()
+    y_test_array = np.asarray(y_test).ravel()
+    if y_train_array.dtype.kind not in "iu" or y_test_array.dtype.kind not in "iu" or len(y_train_array) == 0:
+        return None
+
+    encoder = SafeLabelEncoder(handle_unknown=handle_unknown).fit(y_train_array)
+    n_classes = len(encoder.classes_)
+    if encoder.classes_[0] != 0 or encoder.classes_[-1] != n_classes - 1:
+        return None
+    if len(y_test_array) and (y_test_array.min() < 0 or y_test_array.max() >= n_classes):
+        return None
+
+    def _stats(y_array: np.ndarray) -> Dict[str, Any]:
+        return {
+            'total_samples': len(y_array),
+            'unseen_count': 0,
+            'unseen_labels': [],
+            'unseen_percentage': 0.0,
+            'strategy_used': handle_unknown
+        }
+
+    combined_stats = {
+        'train': _stats(y_train_array),
+        'test': _stats(y_test_array),
+        'encoder_info': encoder.get_stats()
+    }
+    return (
+        y_train_array.astype(int, copy=False),
+        y_test_array.astype(int, copy=False),
+        encoder,
+        combined_stats
+    )
+
+
 def validate_label_distribution(y_train, y_test, min_samples_per_class: int = 2) -> Dict[str, Any]:
     """
     Validate that label distribution is suitable for training.
@@ -1,3 +1,7 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
 
@@ -10,15 +14,41 @@ from app.api.routes import models as models_routes
 from app.api.routes import users as users_routes
 from app.api.routes import test_supabase
 from app.api.routes import coming_soon  # NEW
+from app.core.config import get_settings
 from app.core.cors import get_cors_kwargs
 from app.api.errors import register_exception_handlers
+from app.db.redis_client import redis
+from app.core import security
+from app.services import email_service, feedback_queue
+
+# The app owns logging setup; library modules only create loggers
+logging.basicConfig(level=get_settings().log_level.upper())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm caches that would otherwise cost a Supabase round-trip on first request
+    await coming_soon.prime_launch_cache()
+
+    digest_worker = asyncio.create_task(feedback_queue.run_digest_worker()) if redis is not None else None
+    yield
+
+    if digest_worker is not None:
+        digest_worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await digest_worker
+
+    await security.close_http_client()
+    await email_service.stop_send_workers()
+    await email_service.close_http_client()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title="ModelMind API",
         version="0.1.0",
-        description="AI-powered analytics platform with intelligent dashboard assistant"
+        description="AI-powered analytics platform with intelligent dashboard assistant",
+        lifespan=lifespan
     )
 
     # CORS
@@ -0,0 +1,9 @@
+-- One waitlist row per email, so /waitlist can upsert with ON CONFLICT (email)
+
+-- Drop duplicates left behind by the old check-then-insert flow
+DELETE FROM waitlist a
+USING waitlist b
+WHERE a.email = b.email
+  AND a.ctid > b.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS waitlist_email_key ON waitlist (email);
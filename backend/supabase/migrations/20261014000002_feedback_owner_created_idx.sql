@@ -0,0 +1,15 @@
+-- Cover both GET /feedback paths (filter by user_id or email, newest first)
+-- so the lookup is an index scan with no separate sort step.
+-- Plain CREATE INDEX: migrations run inside a transaction, which CONCURRENTLY does not allow.
+
+CREATE INDEX IF NOT EXISTS feedback_user_created_idx
+    ON feedback (user_id, created_at DESC)
+    WHERE user_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS feedback_email_created_idx
+    ON feedback (email, created_at DESC)
+    WHERE email IS NOT NULL;
+
+-- Check with:
+--   EXPLAIN SELECT * FROM feedback WHERE user_id = '<id>' ORDER BY created_at DESC;
+-- which should show an Index Scan on feedback_user_created_idx.
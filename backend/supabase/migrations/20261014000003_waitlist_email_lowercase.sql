@@ -0,0 +1,10 @@
+-- The API now lowercases emails before writing, so fold existing rows to match;
+-- otherwise "User@x.com" and "user@x.com" slip past waitlist_email_key.
+
+DELETE FROM waitlist a
+USING waitlist b
+WHERE lower(a.email) = lower(b.email)
+  AND a.ctid > b.ctid;
+
+UPDATE waitlist SET email = lower(email) WHERE email <> lower(email);
+UPDATE feedback SET email = lower(email) WHERE email <> lower(email);
@@ -0,0 +1,5 @@
+-- Keyset pagination for GET /models: WHERE user_id = ? AND (created_at, id) < (?, ?)
+-- ORDER BY created_at DESC, id DESC is a single index range scan.
+
+CREATE INDEX IF NOT EXISTS models_user_created_id_idx
+    ON models (user_id, created_at DESC, id DESC);
@@ -0,0 +1,43 @@
+-- Aggregate the /models summary in the database: one round-trip and a handful of
+-- scalars back, instead of shipping every model row to the API.
+-- Mirrors calculate_model_summary(): zero/missing scores are left out of the averages,
+-- and the best model is the top regression r2 (or top classification accuracy).
+
+CREATE OR REPLACE FUNCTION model_summary(uid uuid)
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+    WITH user_models AS (
+        SELECT * FROM models WHERE user_id = uid
+    ),
+    stats AS (
+        SELECT
+            count(*) AS total_models,
+            count(*) FILTER (WHERE problem_type = 'regression') AS regression_count,
+            count(*) FILTER (WHERE problem_type = 'classification') AS classification_count,
+            avg(NULLIF((metrics->>'r2_score')::float, 0)) FILTER (WHERE problem_type = 'regression') AS avg_r2,
+            avg(NULLIF((metrics->>'accuracy')::float, 0)) FILTER (WHERE problem_type = 'classification') AS avg_accuracy,
+            mode() WITHIN GROUP (ORDER BY dataset_id) AS most_used_dataset_id
+        FROM user_models
+    )
+    SELECT json_build_object(
+        'total_models', s.total_models,
+        'avg_r2', s.avg_r2,
+        'avg_accuracy', s.avg_accuracy,
+        'most_used_dataset', (SELECT d.name FROM datasets d WHERE d.id = s.most_used_dataset_id),
+        'best_performing_model', (
+            SELECT row_to_json(m)
+            FROM user_models m
+            WHERE m.problem_type = CASE WHEN s.regression_count > 0 THEN 'regression' ELSE 'classification' END
+            ORDER BY CASE
+                WHEN s.regression_count > 0 THEN (m.metrics->>'r2_score')::float
+                ELSE (m.metrics->>'accuracy')::float
+            END DESC NULLS LAST
+            LIMIT 1
+        ),
+        'regression_count', s.regression_count,
+        'classification_count', s.classification_count
+    )
+    FROM stats s;
+$$;
@@ -0,0 +1,14 @@
+-- Delete a model and its prediction history in one round-trip and one transaction,
+-- so a failure halfway can't leave orphaned predictions behind.
+-- Storage files are removed separately by the API.
+
+CREATE OR REPLACE FUNCTION delete_model_rows(mid uuid, uid uuid)
+RETURNS void
+LANGUAGE sql
+AS $$
+    DELETE FROM predictions
+    WHERE model_id = mid
+      AND EXISTS (SELECT 1 FROM models WHERE id = mid AND user_id = uid);
+
+    DELETE FROM models WHERE id = mid AND user_id = uid;
+$$;
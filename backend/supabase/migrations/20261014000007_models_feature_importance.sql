@@ -0,0 +1,5 @@
+-- Feature importances (or |coef| for linear models) captured at training time,
+-- so the feature-importance endpoint can answer without loading the model pickle.
+-- NULL for models trained before this column existed; the API falls back to the pickle.
+
+ALTER TABLE models ADD COLUMN IF NOT EXISTS feature_importance jsonb;
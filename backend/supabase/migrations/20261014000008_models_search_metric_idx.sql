@@ -0,0 +1,22 @@
+-- GET /models filters and sorts.
+-- search: model_name/description ILIKE '%term%' can't use a btree; trigram GIN indexes
+-- serve it (and keep substring semantics, unlike a tsvector word match).
+-- sort_by=metrics.<key>: PostgREST emits ORDER BY metrics->'<key>' (jsonb), so index
+-- that exact expression next to user_id.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS models_model_name_trgm_idx
+    ON models USING gin (model_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS models_description_trgm_idx
+    ON models USING gin (description gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS models_user_metric_r2_idx
+    ON models (user_id, (metrics->'r2_score'));
+
+CREATE INDEX IF NOT EXISTS models_user_metric_mae_idx
+    ON models (user_id, (metrics->'mae'));
+
+CREATE INDEX IF NOT EXISTS models_user_metric_accuracy_idx
+    ON models (user_id, (metrics->'accuracy'));
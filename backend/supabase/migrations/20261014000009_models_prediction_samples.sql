@@ -0,0 +1,5 @@
+-- Number of held-out predictions stored for a model, written at training time, so
+-- "does this model have analytics" probes (?summary=true) never download the file.
+-- Kept out of metrics: that JSON is rendered key-by-key as score cards.
+
+ALTER TABLE models ADD COLUMN IF NOT EXISTS prediction_samples integer;
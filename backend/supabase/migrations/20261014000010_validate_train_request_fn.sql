@@ -0,0 +1,15 @@
+-- Pre-flight checks for POST /train/{dataset_id} in one round-trip:
+-- does the dataset belong to the user, and is the requested model name already taken.
+-- mname may be NULL (auto-generated names), in which case name_taken is false.
+
+CREATE OR REPLACE FUNCTION validate_train_request(did uuid, uid uuid, mname text)
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT json_build_object(
+        'dataset_exists', EXISTS (SELECT 1 FROM datasets WHERE id = did AND user_id = uid),
+        'name_taken', mname IS NOT NULL
+            AND EXISTS (SELECT 1 FROM models WHERE user_id = uid AND model_name = mname)
+    );
+$$;
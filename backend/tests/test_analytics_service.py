@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from scipy import stats
+from sklearn.metrics import confusion_matrix, precision_recall_fscore_support
+
+from app.services.analytics_service import (
+    _dagostino_pearson_p,
+    _per_class_scores,
+    _residual_moments,
+    _stratified_sample_indices,
+)
+
+
+RESIDUALS = {
+    "normal": np.random.default_rng(0).normal(size=500),
+    "skewed": np.random.default_rng(1).exponential(size=500),
+    "heavy_tailed": np.random.default_rng(2).standard_t(3, size=2000),
+    "small": np.random.default_rng(3).normal(size=20),
+    "float32": np.random.default_rng(4).normal(size=1000).astype(np.float32),
+}
+
+
+@pytest.mark.parametrize("name", RESIDUALS)
+def test_residual_moments_match_numpy_and_scipy(name):
+    r = RESIDUALS[name]
+    moments = _residual_moments(r)
+    r64 = r.astype(np.float64)
+
+    assert moments["mae"] == pytest.approx(np.abs(r64).mean())
+    assert moments["rmse"] == pytest.approx(np.sqrt(np.mean(r64 ** 2)))
+    assert moments["std"] == pytest.approx(np.std(r64))
+    assert moments["skewness"] == pytest.approx(stats.skew(r64))
+    assert moments["kurtosis"] == pytest.approx(stats.kurtosis(r64))
+    assert moments["outlier_count"] == np.count_nonzero(np.abs(r64) > 3 * np.std(r64))
+
+
+@pytest.mark.parametrize("name", RESIDUALS)
+def test_dagostino_pearson_matches_normaltest(name):
+    r = RESIDUALS[name].astype(np.float64)
+    moments = _residual_moments(r)
+
+    p = _dagostino_pearson_p(moments["skewness"], moments["kurtosis"], r.size)
+
+    assert p == pytest.approx(stats.normaltest(r).pvalue, rel=1e-6, abs=1e-12)
+
+
+def test_stratified_sample_is_exact_sorted_unique_and_seeded():
+    r = RESIDUALS["heavy_tailed"]
+
+    idx = _stratified_sample_indices(r, 300)
+
+    assert len(idx) == 300
+    assert np.all(np.diff(idx) > 0)
+    assert idx.min() >= 0 and idx.max() < len(r)
+    assert np.array_equal(idx, _stratified_sample_indices(r, 300))
+
+
+def test_stratified_sample_keeps_more_tail_points_than_uniform():
+    r = RESIDUALS["heavy_tailed"]
+    tails = np.abs(r) > np.quantile(np.abs(r), 0.9)
+
+    idx = _stratified_sample_indices(r, 200)
+
+    # A uniform sample of 200 from 2000 keeps ~10% tail points
+    assert tails[idx].mean() > 0.15
+
+
+def test_stratified_sample_of_constant_residuals_falls_back_to_proportional():
+    idx = _stratified_sample_indices(np.zeros(100), 30)
+    assert len(idx) == 30
+    assert len(np.unique(idx)) == 30
+
+
+def test_per_class_scores_match_sklearn():
+    rng = np.random.default_rng(5)
+    y_true = rng.integers(0, 4, 300)
+    # Class 3 is never predicted, so its precision hits the zero-division branch
+    y_pred = np.where(rng.random(300) < 0.7, y_true, rng.integers(0, 3, 300)) % 3
+    labels = np.arange(4)
+
+    cm = confusion_matrix(y_true, y_pred, labels=labels)
+    ours = _per_class_scores(cm)
+    expected = precision_recall_fscore_support(y_true, y_pred, labels=labels, zero_division=0)
+
+    for got, want in zip(ours, expected):
+        np.testing.assert_allclose(got, want)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.services.data_preprocessing import MedianImputeScaler
+
+
+def _reference(**imputer_kwargs):
+    return make_pipeline(SimpleImputer(strategy="median", **imputer_kwargs), StandardScaler())
+
+
+def _with_missing(rng, shape, rate):
+    X = rng.normal(loc=5, scale=3, size=shape)
+    X[rng.random(shape) < rate] = np.nan
+    return X
+
+
+@pytest.mark.parametrize("rate", [0.0, 0.1, 0.5])
+def test_matches_simple_imputer_plus_standard_scaler(rate):
+    rng = np.random.default_rng(0)
+    X_train = _with_missing(rng, (200, 6), rate)
+    X_test = _with_missing(rng, (50, 6), rate)
+
+    ours = MedianImputeScaler().fit(X_train)
+    reference = _reference().fit(X_train)
+
+    np.testing.assert_allclose(ours.transform(X_train), reference.transform(X_train), atol=1e-10)
+    np.testing.assert_allclose(ours.transform(X_test), reference.transform(X_test), atol=1e-10)
+    np.testing.assert_allclose(ours.statistics_, reference[0].statistics_)
+
+
+def test_constant_and_all_missing_columns():
+    rng = np.random.default_rng(1)
+    X = _with_missing(rng, (100, 3), 0.2)
+    X[:, 1] = 7.0
+    X[::2, 1] = np.nan
+    X[:, 2] = np.nan
+
+    ours = MedianImputeScaler().fit_transform(X)
+    # keep_empty_features: SimpleImputer then imputes 0 in the all-missing column, as we do
+    reference = _reference(keep_empty_features=True).fit_transform(X)
+
+    np.testing.assert_allclose(ours, reference, atol=1e-10)
+    assert np.all(ours[:, 1] == 0)
+
+
+def test_dataframe_and_float32_input():
+    rng = np.random.default_rng(2)
+    X = pd.DataFrame(_with_missing(rng, (80, 2), 0.1).astype(np.float32), columns=["a", "b"])
+
+    ours = MedianImputeScaler().fit(X)
+
+    np.testing.assert_allclose(ours.transform(X), _reference().fit(X).transform(X), atol=1e-5)
+    assert list(ours.get_feature_names_out()) == ["a", "b"]
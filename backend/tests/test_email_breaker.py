@@ -0,0 +1,77 @@
+import pytest
+
+from app.services import email_service
+from app.services.email_service import _Breaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(email_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _trip(breaker):
+    for _ in range(_Breaker.FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+
+def test_stays_closed_below_threshold(clock):
+    breaker = _Breaker()
+    for _ in range(_Breaker.FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = _Breaker()
+    for _ in range(_Breaker.FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_opens_at_threshold_and_fails_fast(clock):
+    breaker = _Breaker()
+    _trip(breaker)
+    assert breaker.state == "open"
+    clock[0] += _Breaker.RESET_SECONDS - 1
+    assert not breaker.allow()
+
+
+def test_half_open_probe_after_reset_window(clock):
+    breaker = _Breaker()
+    _trip(breaker)
+    clock[0] += _Breaker.RESET_SECONDS
+
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    # Only the one probe goes through while it's in flight
+    assert not breaker.allow()
+
+
+def test_probe_success_closes(clock):
+    breaker = _Breaker()
+    _trip(breaker)
+    clock[0] += _Breaker.RESET_SECONDS
+    breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_probe_failure_reopens_for_a_full_window(clock):
+    breaker = _Breaker()
+    _trip(breaker)
+    clock[0] += _Breaker.RESET_SECONDS
+    breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock[0] += _Breaker.RESET_SECONDS - 1
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import feedback_queue
+from app.services.feedback_queue import (
+    ATTEMPTS_FIELD,
+    DIGEST_MAX_ATTEMPTS,
+    FEEDBACK_DEAD_LETTER_KEY,
+    FEEDBACK_QUEUE_KEY,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+
+    async def lpush(self, key, *values):
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value)
+
+    async def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def events(self, key):
+        return [json.loads(value) for value in self.lists.get(key, [])]
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(feedback_queue, "redis", fake)
+    return fake
+
+
+def test_transient_failure_requeues_with_attempt_count(redis):
+    events = [{"subject": "a"}, {"subject": "b"}]
+    asyncio.run(feedback_queue._requeue_failed(events, [1, 2], transient=True))
+
+    # Consumed from the right, so the oldest event must be last
+    assert redis.events(FEEDBACK_QUEUE_KEY) == [
+        {"subject": "b", ATTEMPTS_FIELD: 2},
+        {"subject": "a", ATTEMPTS_FIELD: 1},
+    ]
+    assert FEEDBACK_DEAD_LETTER_KEY not in redis.lists
+
+
+def test_out_of_attempts_goes_to_dead_letter(redis):
+    events = [{"subject": "a"}, {"subject": "b"}]
+    asyncio.run(feedback_queue._requeue_failed(events, [DIGEST_MAX_ATTEMPTS, 1], transient=True))
+
+    assert redis.events(FEEDBACK_QUEUE_KEY) == [{"subject": "b", ATTEMPTS_FIELD: 1}]
+    assert redis.events(FEEDBACK_DEAD_LETTER_KEY) == [{"subject": "a", ATTEMPTS_FIELD: DIGEST_MAX_ATTEMPTS}]
+
+
+def test_permanent_failure_is_never_requeued(redis):
+    asyncio.run(feedback_queue._requeue_failed([{"subject": "a"}], [1], transient=False))
+
+    assert FEEDBACK_QUEUE_KEY not in redis.lists
+    assert redis.events(FEEDBACK_DEAD_LETTER_KEY) == [{"subject": "a", ATTEMPTS_FIELD: 1}]
+
+
+def test_unreadable_event_is_dead_lettered(redis):
+    assert asyncio.run(feedback_queue._decode("{not json")) is None
+    assert redis.lists[FEEDBACK_DEAD_LETTER_KEY] == ["{not json"]
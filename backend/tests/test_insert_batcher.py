@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import insert_batcher
+from app.db.insert_batcher import InsertBatcher
+
+
+class FakeTable:
+    def __init__(self, name):
+        self.name = name
+
+    def insert(self, rows):
+        return SimpleNamespace(table=self.name, rows=rows)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Records every insert request; the test sets `respond` to decide what comes back"""
+    calls = SimpleNamespace(requests=[], respond=lambda rows: [dict(r, id=i) for i, r in enumerate(rows)])
+
+    async def fake_run_query(query):
+        calls.requests.append(query.rows)
+        result = calls.respond(query.rows)
+        if isinstance(result, Exception):
+            raise result
+        return SimpleNamespace(data=result)
+
+    monkeypatch.setattr(insert_batcher, "supabase", SimpleNamespace(table=FakeTable))
+    monkeypatch.setattr(insert_batcher, "run_query", fake_run_query)
+    return calls
+
+
+async def _insert_all(batcher, rows):
+    return await asyncio.gather(*(batcher.insert(row) for row in rows), return_exceptions=True)
+
+
+def test_concurrent_inserts_share_one_request(sent):
+    batcher = InsertBatcher("feedback", window=0.01)
+    rows = [{"message": str(i)} for i in range(5)]
+
+    results = asyncio.run(_insert_all(batcher, rows))
+
+    assert len(sent.requests) == 1
+    assert results == [dict(r, id=i) for i, r in enumerate(rows)]
+
+
+def test_max_batch_splits_requests(sent):
+    batcher = InsertBatcher("feedback", window=0.01, max_batch=2)
+    results = asyncio.run(_insert_all(batcher, [{"message": str(i)} for i in range(5)]))
+
+    assert [len(rows) for rows in sent.requests] == [2, 2, 1]
+    assert [r["message"] for r in results] == ["0", "1", "2", "3", "4"]
+
+
+def test_failed_request_fails_every_caller_without_resending(sent):
+    error = RuntimeError("503 after commit")
+    sent.respond = lambda rows: error
+    batcher = InsertBatcher("feedback", window=0.01)
+
+    results = asyncio.run(_insert_all(batcher, [{"message": str(i)} for i in range(3)]))
+
+    assert len(sent.requests) == 1
+    assert all(r is error for r in results)
+
+
+def test_short_response_fails_every_caller_without_resending(sent):
+    sent.respond = lambda rows: [dict(rows[0], id=0)]
+    batcher = InsertBatcher("feedback", window=0.01)
+
+    results = asyncio.run(_insert_all(batcher, [{"message": str(i)} for i in range(3)]))
+
+    assert len(sent.requests) == 1
+    assert all(isinstance(r, RuntimeError) and "expected 3 rows back" in str(r) for r in results)
@@ -0,0 +1,122 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.db import supabase_client
+from app.db.supabase_client import run_query, supabase
+from app.utils import retry
+from app.utils.retry import is_transient, is_unsent, with_backoff
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeQuery:
+    """Stand-in for a PostgREST builder whose execute() fails a few times before succeeding"""
+
+    def __init__(self, errors, http_method="POST", path="/feedback", prefer="return=representation"):
+        self.errors = list(errors)
+        self.http_method = http_method
+        self.path = path
+        self.headers = {"prefer": prefer}
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    async def instant(_delay):
+        pass
+    monkeypatch.setattr(retry.asyncio, "sleep", instant)
+
+
+def test_is_transient():
+    assert is_transient(StatusError(429))
+    assert is_transient(StatusError(503))
+    assert is_transient(httpx.ReadTimeout("slow"))
+    assert not is_transient(StatusError(400))
+    assert not is_transient(ValueError("bad"))
+
+
+def test_is_unsent_only_for_requests_that_never_arrived():
+    assert is_unsent(httpx.ConnectError("refused"))
+    assert is_unsent(httpx.ConnectTimeout("slow connect"))
+    assert is_unsent(StatusError(429))
+    assert not is_unsent(httpx.ReadTimeout("response lost"))
+    assert not is_unsent(StatusError(502))
+
+
+def test_with_backoff_retries_transient_then_succeeds():
+    attempts = []
+
+    async def op():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise StatusError(503)
+        return "done"
+
+    assert asyncio.run(with_backoff(op)) == "done"
+    assert len(attempts) == 3
+
+
+def test_with_backoff_raises_permanent_errors_immediately():
+    attempts = []
+
+    async def op():
+        attempts.append(1)
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        asyncio.run(with_backoff(op))
+    assert len(attempts) == 1
+
+
+def test_with_backoff_gives_up_after_max_retries():
+    attempts = []
+
+    async def op():
+        attempts.append(1)
+        raise StatusError(500)
+
+    with pytest.raises(StatusError):
+        asyncio.run(with_backoff(op, max_retries=2))
+    assert len(attempts) == 3
+
+
+def test_plain_insert_detection():
+    assert supabase_client._is_plain_insert(supabase.table("models").insert({"a": 1}))
+    assert not supabase_client._is_plain_insert(supabase.table("models").upsert({"a": 1}))
+    assert not supabase_client._is_plain_insert(supabase.table("models").select("*"))
+    assert not supabase_client._is_plain_insert(supabase.rpc("model_summary", {"uid": "u"}))
+
+
+def test_run_query_does_not_retry_insert_after_server_error():
+    query = FakeQuery([StatusError(503)])
+    with pytest.raises(StatusError):
+        asyncio.run(run_query(query))
+    assert query.calls == 1
+
+
+def test_run_query_retries_insert_that_never_connected():
+    query = FakeQuery([httpx.ConnectError("refused")])
+    assert asyncio.run(run_query(query)) == "ok"
+    assert query.calls == 2
+
+
+def test_run_query_retries_reads_and_explicit_idempotent_writes():
+    read = FakeQuery([StatusError(503)], http_method="GET")
+    assert asyncio.run(run_query(read)) == "ok"
+    assert read.calls == 2
+
+    keyed_insert = FakeQuery([httpx.ReadTimeout("lost")])
+    assert asyncio.run(run_query(keyed_insert, idempotent=True)) == "ok"
+    assert keyed_insert.calls == 2
@@ -0,0 +1,71 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from app.utils.safe_label_encoding import INTEGER_LUT_MAX_SPAN, SafeLabelEncoder
+
+STRATEGIES = ["use_encoded_value", "use_mode", "error"]
+
+rng = np.random.default_rng(0)
+
+# (train labels, test labels); test labels include values never seen in training
+CASES = {
+    # Narrow integer span: dense lookup table
+    "int_lut": (rng.integers(0, 5, 200), rng.integers(-2, 8, 100)),
+    "int_lut_offset": (rng.integers(1000, 1010, 200), rng.integers(995, 1015, 100)),
+    # Span too wide for the table: searchsorted
+    "int_wide": (rng.choice([0, 7, INTEGER_LUT_MAX_SPAN * 4], 200), rng.choice([0, 7, 3, INTEGER_LUT_MAX_SPAN * 4], 100)),
+    "float": (rng.choice([0.5, 1.5, 2.5], 200), np.append(rng.choice([0.5, 1.5, 9.0], 99), np.nan)),
+    "str": (rng.choice(["a", "b", "c"], 200), rng.choice(["a", "b", "z"], 100)),
+    "object_with_none": (
+        np.array(rng.choice(["a", "b"], 200), dtype=object),
+        np.array(["a", None, "b", "q"] * 25, dtype=object),
+    ),
+}
+
+
+def _run(encode):
+    """Result of encode() or the ValueError message it raised, for comparison"""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            encoded, unseen_mask, unseen_labels = encode()
+        return encoded.tolist(), unseen_mask.tolist(), [str(label) for label in unseen_labels]
+    except ValueError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize("case", CASES)
+def test_vectorized_paths_match_elementwise(case, strategy):
+    train, test = CASES[case]
+    encoder = SafeLabelEncoder(handle_unknown=strategy).fit(train)
+    test = np.asarray(test)
+
+    assert _run(lambda: encoder._transform_vectorized(test)) == _run(lambda: encoder._transform_elementwise(test))
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_seen_labels_match_label_encoder(case):
+    train, _ = CASES[case]
+    encoder = SafeLabelEncoder().fit(train)
+
+    encoded, stats = encoder.transform(train)
+
+    assert encoded.tolist() == encoder.encoder.transform(train).tolist()
+    assert stats["unseen_count"] == 0
+
+
+def test_mode_class_is_most_common_with_ties_on_smallest():
+    assert SafeLabelEncoder().fit([3, 1, 1, 3, 2]).mode_class_ == 1
+    assert SafeLabelEncoder().fit(["b", "c", "c"]).mode_class_ == "c"
+
+
+def test_inverse_transform_round_trips_and_marks_unknown():
+    encoder = SafeLabelEncoder().fit(["a", "b", "c"])
+    encoded, _ = encoder.transform(["c", "a", "b"])
+
+    assert encoder.inverse_transform(encoded).tolist() == ["c", "a", "b"]
+    assert encoder.inverse_transform([0, -1, 7]).tolist() == ["a", "<UNKNOWN_-1>", "<INVALID_7>"]
+    assert encoder.inverse_transform(np.array([], dtype=int)).tolist() == []
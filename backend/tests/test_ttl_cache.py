@@ -0,0 +1,56 @@
+import pytest
+
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+
+    clock[0] += 9.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+
+    clock[0] += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_oldest_entry_evicted_at_maxsize(clock):
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)  # re-setting moves "a" to the newest position
+    cache.set("c", 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
+
+
+def test_pop_and_clear(clock):
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes.users import get_supabase_admin
+from app.core.security import verify_supabase_token
+from app.utils import retry
+from main import app
+
+
+class FakeDelete:
+    """users DELETE whose execute() plays back a list of outcomes (exceptions or returned rows)"""
+
+    http_method = "DELETE"
+    path = "/users"
+    headers = {"prefer": "return=representation"}
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def eq(self, *_):
+        return self
+
+    def execute(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(data=outcome)
+
+
+class FakeSupabase:
+    def __init__(self, delete):
+        self.delete_query = delete
+        self.deleted_auth_users = []
+        self.auth = SimpleNamespace(admin=SimpleNamespace(delete_user=self.deleted_auth_users.append))
+
+    def table(self, name):
+        assert name == "users"
+        return SimpleNamespace(delete=lambda: self.delete_query)
+
+
+@pytest.fixture
+def call_delete(monkeypatch):
+    async def instant(_delay):
+        pass
+    monkeypatch.setattr(retry.asyncio, "sleep", instant)
+
+    def call(supabase):
+        app.dependency_overrides[verify_supabase_token] = lambda: {"sub": "user-1"}
+        app.dependency_overrides[get_supabase_admin] = lambda: supabase
+        try:
+            return TestClient(app).delete("/api/users/delete-account")
+        finally:
+            app.dependency_overrides.clear()
+    return call
+
+
+def test_lost_response_is_not_retried_into_a_404(call_delete):
+    # First attempt commits but the response is lost; a retry would find no row and return []
+    supabase = FakeSupabase(FakeDelete([httpx.ReadTimeout("response lost"), []]))
+
+    response = call_delete(supabase)
+
+    assert supabase.delete_query.calls == 1
+    assert response.status_code == 500
+
+
+def test_unsent_delete_is_retried(call_delete):
+    supabase = FakeSupabase(FakeDelete([httpx.ConnectError("refused"), [{"id": "user-1"}]]))
+
+    response = call_delete(supabase)
+
+    assert supabase.delete_query.calls == 2
+    assert response.status_code == 200
+    assert supabase.deleted_auth_users == ["user-1"]
+
+
+def test_missing_user_is_404(call_delete):
+    supabase = FakeSupabase(FakeDelete([[]]))
+
+    response = call_delete(supabase)
+
+    assert response.status_code == 404
+    assert supabase.deleted_auth_users == []
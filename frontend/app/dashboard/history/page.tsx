@@ -151,8 +151,11 @@ const loadModels = useCallback(async () => {
     )
 
     setModels(response.data.models)
-    setTotalModels(response.data.total)
-    setSummary(response.data.summary)
+    setTotalModels(response.data.total ?? 0)
+    // Summary is only sent with the first page; keep the last one otherwise
+    if (response.data.summary) {
+      setSummary(response.data.summary)
+    }
     
     if (!hasInitialLoad) {
       setHasInitialLoad(true)
@@ -70,10 +70,11 @@ export interface ModelListResponse {
   status: string
   data: {
     models: Model[]
-    total: number
+    total: number | null // null for cursor requests
     page: number
     page_size: number
-    summary: ModelSummary
+    next_cursor: string | null
+    summary: ModelSummary | null
   }
 }
 